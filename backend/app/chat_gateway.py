@@ -0,0 +1,122 @@
+"""Gateway for LLM chat calls that keeps them off the event loop."""
+
+import asyncio
+import os
+from abc import ABC, abstractmethod
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Optional
+
+from app import config
+from app.metrics import time_operation
+
+
+class ChatOverloaded(Exception):
+    """Too many chat calls are already waiting for a slot."""
+
+
+class ChatTimeout(Exception):
+    """A chat call did not finish within its deadline."""
+
+
+class ChatProvider(ABC):
+    """A blocking text-generation backend."""
+
+    @abstractmethod
+    def generate(self, message: str) -> str:
+        ...
+
+
+class GeminiProvider(ChatProvider):
+    """Google Gemini through ``google.generativeai``.
+
+    The SDK is imported and the model built on first use and then reused
+    for every call.
+    """
+
+    def __init__(self, model_name: Optional[str] = None, api_key: Optional[str] = None):
+        self.model_name = model_name or config.CHAT_MODEL
+        self.api_key = api_key
+        self._model = None
+        self._lock = threading.Lock()
+
+    def _get_model(self):
+        if self._model is None:
+            with self._lock:
+                if self._model is None:
+                    from google.generativeai import GenerativeModel, configure
+
+                    configure(api_key=self.api_key or os.getenv("GEMINI_API_KEY"))
+                    self._model = GenerativeModel(self.model_name)
+        return self._model
+
+    def generate(self, message: str) -> str:
+        return self._get_model().generate_content(message).text
+
+
+class ChatGateway:
+    """Runs provider calls on a bounded thread pool.
+
+    At most ``max_concurrency`` calls run at once and at most ``max_queue``
+    more wait for a slot; beyond that callers get ``ChatOverloaded``
+    immediately. Each call has one deadline covering queueing and
+    generation. A slot is only freed when the provider call actually
+    returns, so timed-out calls still count against the limit while their
+    thread is busy.
+    """
+
+    def __init__(self, provider: ChatProvider, max_concurrency: Optional[int] = None,
+                 max_queue: Optional[int] = None, timeout: Optional[float] = None):
+        self.provider = provider
+        self.max_concurrency = max_concurrency or config.CHAT_MAX_CONCURRENCY
+        self.max_queue = max_queue if max_queue is not None else config.CHAT_MAX_QUEUE
+        self.timeout = timeout or config.CHAT_TIMEOUT
+        self._executor = ThreadPoolExecutor(max_workers=self.max_concurrency, thread_name_prefix="chat")
+        self._slots = asyncio.Semaphore(self.max_concurrency)
+        self._waiting = 0
+        self._counters = {"completed": 0, "failed": 0, "timed_out": 0, "rejected": 0}
+
+    async def chat(self, message: str) -> str:
+        deadline = time.monotonic() + self.timeout
+        if not self._slots.locked():
+            await self._slots.acquire()
+        else:
+            if self._waiting >= self.max_queue:
+                self._counters["rejected"] += 1
+                raise ChatOverloaded("Chat is busy, please try again shortly")
+            self._waiting += 1
+            try:
+                await asyncio.wait_for(self._slots.acquire(), self.timeout)
+            except asyncio.TimeoutError:
+                self._counters["timed_out"] += 1
+                raise ChatTimeout("Timed out waiting for a chat slot") from None
+            finally:
+                self._waiting -= 1
+
+        future = asyncio.get_running_loop().run_in_executor(self._executor, self._generate, message)
+        future.add_done_callback(lambda _: self._slots.release())
+        try:
+            reply = await asyncio.wait_for(asyncio.shield(future), max(0.0, deadline - time.monotonic()))
+        except asyncio.TimeoutError:
+            self._counters["timed_out"] += 1
+            raise ChatTimeout("The chat provider did not answer in time") from None
+        except Exception:
+            self._counters["failed"] += 1
+            raise
+        self._counters["completed"] += 1
+        return reply
+
+    def _generate(self, message: str) -> str:
+        with time_operation("chat_provider"):
+            return self.provider.generate(message)
+
+    def stats(self) -> Dict:
+        stats = dict(self._counters)
+        stats["waiting"] = self._waiting
+        stats["max_concurrency"] = self.max_concurrency
+        stats["max_queue"] = self.max_queue
+        return stats
+
+    def close(self):
+        self._executor.shutdown(wait=False, cancel_futures=True)
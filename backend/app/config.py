@@ -0,0 +1,93 @@
+"""Runtime configuration read from environment variables."""
+
+import os
+
+# Leaderboard durability: "snapshot" rewrites leaderboard.json on every
+# submission, "journal" appends to leaderboard.journal and compacts it into
+# the snapshot in the background. Per-player aggregates are saved to
+# leaderboard_aggregates.json at each compaction (in snapshot mode every
+# COMPACT_THRESHOLD games).
+LEADERBOARD_DURABILITY = os.getenv("ORTHOPLAY_LEADERBOARD_DURABILITY", "snapshot")
+LEADERBOARD_COMPACT_INTERVAL = float(os.getenv("ORTHOPLAY_LEADERBOARD_COMPACT_INTERVAL", "30"))
+LEADERBOARD_COMPACT_THRESHOLD = int(os.getenv("ORTHOPLAY_LEADERBOARD_COMPACT_THRESHOLD", "500"))
+LEADERBOARD_FSYNC = os.getenv("ORTHOPLAY_LEADERBOARD_FSYNC", "0") == "1"
+
+# Seconds between checks for leaderboard writes of other worker processes
+# (reads also check), so their scores reach this worker's listeners.
+LEADERBOARD_SYNC_INTERVAL = float(os.getenv("ORTHOPLAY_LEADERBOARD_SYNC_INTERVAL", "1"))
+
+# Leaderboard archive (JSON backend): every game is also appended to
+# time-ordered NDJSON segments under data/archive, so history is kept beyond
+# the in-memory top entries. The active segment is sealed after this many
+# games or seconds, and small sealed segments are merged in the background
+# into segments of up to ARCHIVE_MERGE_RECORDS games.
+LEADERBOARD_ARCHIVE = os.getenv("ORTHOPLAY_LEADERBOARD_ARCHIVE", "1") == "1"
+LEADERBOARD_HOT_ENTRIES = int(os.getenv("ORTHOPLAY_LEADERBOARD_HOT_ENTRIES", "1000"))
+# Games of the longest time window kept in memory for the daily/weekly/
+# monthly views; beyond this only the newest are kept.
+LEADERBOARD_RECENT_ENTRIES = int(os.getenv("ORTHOPLAY_LEADERBOARD_RECENT_ENTRIES", "100000"))
+ARCHIVE_SEGMENT_RECORDS = int(os.getenv("ORTHOPLAY_ARCHIVE_SEGMENT_RECORDS", "10000"))
+ARCHIVE_SEAL_INTERVAL = float(os.getenv("ORTHOPLAY_ARCHIVE_SEAL_INTERVAL", "3600"))
+ARCHIVE_MERGE_RECORDS = int(os.getenv("ORTHOPLAY_ARCHIVE_MERGE_RECORDS", "100000"))
+ARCHIVE_MERGE_INTERVAL = float(os.getenv("ORTHOPLAY_ARCHIVE_MERGE_INTERVAL", "300"))
+
+# Leaderboard storage backend: "json" (leaderboard.json, the default) or
+# "sqlite" (a WAL-mode database that several workers can share).
+LEADERBOARD_BACKEND = os.getenv("ORTHOPLAY_LEADERBOARD_BACKEND", "json")
+LEADERBOARD_DB_PATH = os.getenv("ORTHOPLAY_LEADERBOARD_DB_PATH", "")
+
+# Game sessions: seconds of inactivity before an open session is dropped,
+# seconds after a session is finished, maximum lifetime, and a capacity
+# bound beyond which the least recently used sessions are evicted.
+SESSION_IDLE_TTL = float(os.getenv("ORTHOPLAY_SESSION_IDLE_TTL", "1800"))
+SESSION_COMPLETED_TTL = float(os.getenv("ORTHOPLAY_SESSION_COMPLETED_TTL", "600"))
+SESSION_ABSOLUTE_TTL = float(os.getenv("ORTHOPLAY_SESSION_ABSOLUTE_TTL", "7200"))
+SESSION_MAX = int(os.getenv("ORTHOPLAY_SESSION_MAX", "50000"))
+SESSION_SWEEP_INTERVAL = float(os.getenv("ORTHOPLAY_SESSION_SWEEP_INTERVAL", "60"))
+
+# Game session backend: "memory" (per process, the default) or "sqlite" (a
+# database file shared by every worker, so any worker can serve any step).
+SESSION_BACKEND = os.getenv("ORTHOPLAY_SESSION_BACKEND", "memory")
+SESSION_DB_PATH = os.getenv("ORTHOPLAY_SESSION_DB_PATH", "")
+
+# Seconds an /app/stats snapshot may be served before it is recomputed even
+# without a local leaderboard write (picks up writes from other workers).
+APP_STATS_MAX_AGE = float(os.getenv("ORTHOPLAY_APP_STATS_MAX_AGE", "30"))
+
+# Chat gateway: provider calls in flight at once, callers allowed to wait
+# for a slot, and the deadline (seconds) for a call including queueing.
+CHAT_MODEL = os.getenv("ORTHOPLAY_CHAT_MODEL", "gemini-2.0-flash")
+CHAT_MAX_CONCURRENCY = int(os.getenv("ORTHOPLAY_CHAT_MAX_CONCURRENCY", "4"))
+CHAT_MAX_QUEUE = int(os.getenv("ORTHOPLAY_CHAT_MAX_QUEUE", "32"))
+CHAT_TIMEOUT = float(os.getenv("ORTHOPLAY_CHAT_TIMEOUT", "20"))
+
+# Contributors cache: seconds a fetched list is fresh, initial and maximum
+# backoff after a failed GitHub fetch, and the fetch timeout.
+CONTRIBUTORS_TTL = float(os.getenv("ORTHOPLAY_CONTRIBUTORS_TTL", "3600"))
+CONTRIBUTORS_ERROR_TTL = float(os.getenv("ORTHOPLAY_CONTRIBUTORS_ERROR_TTL", "60"))
+CONTRIBUTORS_MAX_BACKOFF = float(os.getenv("ORTHOPLAY_CONTRIBUTORS_MAX_BACKOFF", "1800"))
+CONTRIBUTORS_FETCH_TIMEOUT = float(os.getenv("ORTHOPLAY_CONTRIBUTORS_FETCH_TIMEOUT", "10"))
+
+# Read response cache: total bytes of cached bodies, and how long responses
+# that also depend on the clock (rolling windows, /app/stats) are reused.
+RESPONSE_CACHE_MAX_BYTES = int(os.getenv("ORTHOPLAY_RESPONSE_CACHE_MAX_BYTES", str(8 * 1024 * 1024)))
+RESPONSE_CACHE_MAX_AGE = float(os.getenv("ORTHOPLAY_RESPONSE_CACHE_MAX_AGE", "30"))
+
+# Word dataset: "mmap" compiles words_with_hint.json into a memory-mapped
+# store next to it (rebuilt whenever the JSON is newer), "json" loads the
+# JSON into memory.
+WORD_STORE = os.getenv("ORTHOPLAY_WORD_STORE", "mmap")
+
+# Per-route request counters and latency histograms on /metrics; set to 0
+# to leave out the request middleware (storage timers and gauges remain).
+METRICS_ENABLED = os.getenv("ORTHOPLAY_METRICS", "1") == "1"
+
+# Per-request profiling: requests carrying this token (X-Orthoplay-Profile
+# header or ?profile= query flag) and this fraction of all requests run
+# under cProfile; profiles are written to the directory (default
+# backend/data/profiles) and the oldest are removed beyond the size cap.
+# With no token and a zero rate the profiling middleware is not installed.
+PROFILE_TOKEN = os.getenv("ORTHOPLAY_PROFILE_TOKEN", "")
+PROFILE_SAMPLE_RATE = float(os.getenv("ORTHOPLAY_PROFILE_SAMPLE_RATE", "0"))
+PROFILE_DIR = os.getenv("ORTHOPLAY_PROFILE_DIR", "")
+PROFILE_MAX_BYTES = int(os.getenv("ORTHOPLAY_PROFILE_MAX_BYTES", str(64 * 1024 * 1024)))
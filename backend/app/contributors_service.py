@@ -0,0 +1,148 @@
+"""Cached GitHub contributor list for the project page."""
+
+import json
+import os
+import tempfile
+import threading
+import time
+from typing import Callable, List, Optional
+
+from app import config
+
+GITHUB_REPO_API = "https://api.github.com/repos/whyvineet/orthoplay/contributors"
+
+
+class ContributorsUnavailable(Exception):
+    """No contributor list is cached and upstream could not provide one."""
+
+
+def fetch_github_contributors() -> List:
+    """Fetch the contributor list from the GitHub API."""
+    import requests
+
+    response = requests.get(GITHUB_REPO_API, timeout=config.CONTRIBUTORS_FETCH_TIMEOUT)
+    if response.status_code != 200:
+        raise Exception(f"GitHub API failed with status {response.status_code}")
+    return response.json()
+
+
+class ContributorsCache:
+    """In-memory contributor list with stale-while-revalidate refreshes.
+
+    Once anything is cached, ``get`` returns it immediately; when it is
+    older than ``ttl`` a single background thread refreshes it. Only a cold
+    cache makes callers wait, and concurrent cold callers share one fetch.
+    Failed fetches back off exponentially from ``error_ttl`` up to
+    ``max_backoff`` seconds, and during a backoff a cold cache fails fast
+    instead of calling upstream again. ``cache_path`` is only a snapshot
+    used to warm the cache on startup.
+    """
+
+    def __init__(self, fetcher: Optional[Callable[[], List]] = None, cache_path: Optional[str] = None,
+                 ttl: Optional[float] = None, error_ttl: Optional[float] = None,
+                 max_backoff: Optional[float] = None):
+        self.fetcher = fetcher or fetch_github_contributors
+        self.cache_path = cache_path or os.path.join(os.path.dirname(__file__), "..", "contributors.json")
+        self.ttl = ttl if ttl is not None else config.CONTRIBUTORS_TTL
+        self.error_ttl = error_ttl if error_ttl is not None else config.CONTRIBUTORS_ERROR_TTL
+        self.max_backoff = max_backoff if max_backoff is not None else config.CONTRIBUTORS_MAX_BACKOFF
+
+        self._data: Optional[List] = None
+        self._fetched_at = 0.0
+        self._failures = 0
+        self._retry_at = 0.0
+        self._last_error: Optional[str] = None
+        self._refreshing = False
+        self._lock = threading.Lock()
+        self._fetch_lock = threading.Lock()
+        self._counters = {"hits": 0, "stale_hits": 0, "fetches": 0, "fetch_errors": 0}
+        self._load_snapshot()
+
+    def _load_snapshot(self):
+        """Warm the cache from the file written by a previous run."""
+        try:
+            with open(self.cache_path, "r") as f:
+                cached_data = json.load(f)
+            self._data = cached_data["data"]
+            self._fetched_at = cached_data.get("fetched_at", 0)
+        except FileNotFoundError:
+            pass
+        except Exception as e:
+            print(f"Error loading contributors snapshot: {e}")
+
+    def _save_snapshot(self):
+        try:
+            directory = os.path.dirname(os.path.abspath(self.cache_path))
+            fd, temp_file = tempfile.mkstemp(dir=directory, prefix="contributors.", suffix=".tmp")
+            try:
+                os.chmod(temp_file, 0o644)
+                with os.fdopen(fd, "w") as f:
+                    json.dump({"fetched_at": self._fetched_at, "data": self._data}, f, indent=2)
+                os.replace(temp_file, self.cache_path)
+            except Exception:
+                os.remove(temp_file)
+                raise
+        except Exception as e:
+            print(f"Error saving contributors snapshot: {e}")
+
+    def _fetch(self):
+        """Call upstream once and record the outcome; never raises."""
+        self._counters["fetches"] += 1
+        try:
+            data = self.fetcher()
+        except Exception as e:
+            self._counters["fetch_errors"] += 1
+            self._failures += 1
+            backoff = min(self.max_backoff, self.error_ttl * 2 ** (self._failures - 1))
+            self._retry_at = time.monotonic() + backoff
+            self._last_error = str(e)
+            print(f"Error fetching contributors: {e}")
+            return
+        self._data = data
+        self._fetched_at = time.time()
+        self._failures = 0
+        self._retry_at = 0.0
+        self._last_error = None
+        self._save_snapshot()
+
+    def _refresh_in_background(self):
+        try:
+            with self._fetch_lock:
+                self._fetch()
+        finally:
+            with self._lock:
+                self._refreshing = False
+
+    def get(self) -> List:
+        """The contributor list, refreshing it if it is stale."""
+        data = self._data
+        if data is None:
+            return self._get_cold()
+
+        if time.time() - self._fetched_at < self.ttl:
+            self._counters["hits"] += 1
+            return data
+
+        self._counters["stale_hits"] += 1
+        with self._lock:
+            start = not self._refreshing and time.monotonic() >= self._retry_at
+            if start:
+                self._refreshing = True
+        if start:
+            threading.Thread(target=self._refresh_in_background, name="contributors-refresh", daemon=True).start()
+        return data
+
+    def _get_cold(self) -> List:
+        with self._fetch_lock:
+            if self._data is None and time.monotonic() >= self._retry_at:
+                self._fetch()
+            if self._data is None:
+                raise ContributorsUnavailable(self._last_error or "Contributors are not available")
+            return self._data
+
+    def stats(self):
+        stats = dict(self._counters)
+        stats["age"] = round(time.time() - self._fetched_at, 1) if self._data is not None else None
+        stats["consecutive_failures"] = self._failures
+        stats["refreshing"] = self._refreshing
+        return stats
@@ -0,0 +1,66 @@
+"""Wordle-style spelling feedback, for single guesses and in bulk."""
+
+from typing import Iterable, List, Tuple
+
+ABSENT, PRESENT, CORRECT = 0, 1, 2
+
+# Indexed by feedback code
+FEEDBACK_SYMBOLS = ("⬛", "🟨", "🟩")
+
+
+def feedback_codes(guess: str, answer: str) -> bytes:
+    """Feedback codes for one guess: CORRECT, PRESENT or ABSENT per letter.
+
+    Uses a count table of the answer's unmatched letters, so each guess is
+    evaluated in two linear passes. A guess of the wrong length is all
+    ABSENT.
+    """
+    guess = guess.lower().strip()
+    answer = answer.lower()
+    size = len(answer)
+    if guess == answer:
+        return bytes((CORRECT,)) * size
+    if len(guess) != size:
+        return bytes(size)
+
+    codes = bytearray(size)
+    remaining = {}
+    i = 0
+    for guessed, letter in zip(guess, answer):
+        if guessed == letter:
+            codes[i] = CORRECT
+        else:
+            remaining[letter] = remaining.get(letter, 0) + 1
+        i += 1
+
+    i = 0
+    for guessed in guess:
+        if codes[i] == ABSENT:
+            left = remaining.get(guessed)
+            if left:
+                codes[i] = PRESENT
+                remaining[guessed] = left - 1
+        i += 1
+
+    return bytes(codes)
+
+
+def batch_feedback(pairs: Iterable[Tuple[str, str]]) -> List[bytes]:
+    """Feedback codes for many ``(guess, answer)`` pairs.
+
+    Recorded play logs repeat pairs heavily, so results are memoised for
+    the duration of the batch.
+    """
+    memo = {}
+    results = []
+    for pair in pairs:
+        codes = memo.get(pair)
+        if codes is None:
+            codes = memo[pair] = feedback_codes(*pair)
+        results.append(codes)
+    return results
+
+
+def render_feedback(codes: bytes) -> List[str]:
+    """Turn feedback codes into the emoji squares the API returns."""
+    return [FEEDBACK_SYMBOLS[code] for code in codes]
@@ -0,0 +1,80 @@
+"""Cross-process file lock with a shared revision counter."""
+
+import os
+import threading
+
+try:
+    import fcntl
+except ImportError:  # Not POSIX: only threads of this process are excluded
+    fcntl = None
+
+if hasattr(os, "pread"):
+    _pread, _pwrite = os.pread, os.pwrite
+else:
+    def _pread(fd: int, size: int, offset: int) -> bytes:
+        os.lseek(fd, offset, os.SEEK_SET)
+        return os.read(fd, size)
+
+    def _pwrite(fd: int, data: bytes, offset: int) -> int:
+        os.lseek(fd, offset, os.SEEK_SET)
+        return os.write(fd, data)
+
+# Width of the zero-padded revision stored at the start of the lock file
+REVISION_WIDTH = 20
+
+
+class FileLock:
+    """Exclusive ``flock`` on a lock file, reentrant within a process.
+
+    The lock file also holds a revision counter. Writers ``bump`` it, while
+    holding the lock, before they change the data it guards; other
+    processes compare ``revision()`` (a single ``pread``) with the revision
+    they last loaded to tell cheaply whether anything changed.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._fd = os.open(path, os.O_RDWR | os.O_CREAT, 0o644)
+        self._thread_lock = threading.RLock()
+        self._depth = 0
+
+    def acquire(self, blocking: bool = True) -> bool:
+        if not self._thread_lock.acquire(blocking):
+            return False
+        if self._depth == 0 and fcntl is not None:
+            try:
+                fcntl.flock(self._fd, fcntl.LOCK_EX if blocking else fcntl.LOCK_EX | fcntl.LOCK_NB)
+            except BlockingIOError:
+                self._thread_lock.release()
+                return False
+            except BaseException:
+                self._thread_lock.release()
+                raise
+        self._depth += 1
+        return True
+
+    def release(self):
+        self._depth -= 1
+        if self._depth == 0 and fcntl is not None:
+            fcntl.flock(self._fd, fcntl.LOCK_UN)
+        self._thread_lock.release()
+
+    def __enter__(self):
+        self.acquire()
+        return self
+
+    def __exit__(self, *exc):
+        self.release()
+
+    def revision(self) -> int:
+        data = _pread(self._fd, REVISION_WIDTH, 0)
+        return int(data) if data.strip() else 0
+
+    def bump(self) -> int:
+        """Increase the revision; call with the lock held. Returns the new revision."""
+        revision = self.revision() + 1
+        _pwrite(self._fd, b"%0*d" % (REVISION_WIDTH, revision), 0)
+        return revision
+
+    def close(self):
+        os.close(self._fd)
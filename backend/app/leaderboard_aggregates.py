@@ -0,0 +1,132 @@
+"""Running per-user and global leaderboard statistics."""
+
+from typing import Dict, Iterable
+
+# Thresholds used by the community satisfaction figure
+HIGH_SCORE = 80
+LOW_ATTEMPTS = 5
+
+
+class UserAggregate:
+    """Counters for one player's recorded games."""
+
+    __slots__ = ("games", "score_sum", "best_score", "attempts_sum", "time_sum")
+
+    def __init__(self, games: int = 0, score_sum: int = 0, best_score: int = 0,
+                 attempts_sum: int = 0, time_sum: float = 0.0):
+        self.games = games
+        self.score_sum = score_sum
+        self.best_score = best_score
+        self.attempts_sum = attempts_sum
+        self.time_sum = time_sum
+
+    def to_list(self) -> list:
+        return [self.games, self.score_sum, self.best_score, self.attempts_sum, self.time_sum]
+
+
+def user_stats_dict(username: str, games: int, best_score: int, score_sum: float,
+                    attempts_sum: float, time_sum: float) -> Dict:
+    """The ``get_user_stats`` response shape from raw counters."""
+    if not games:
+        return {
+            "username": username,
+            "total_games": 0,
+            "best_score": 0,
+            "average_score": 0.0,
+            "total_words_completed": 0,
+            "average_attempts": 0.0,
+            "average_completion_time": 0.0
+        }
+    return {
+        "username": username,
+        "total_games": games,
+        "best_score": best_score,
+        "average_score": round(score_sum / games, 1),
+        "total_words_completed": games,
+        "average_attempts": round(attempts_sum / games, 1),
+        "average_completion_time": round(time_sum / games, 1)
+    }
+
+
+def completion_stats_dict(total_games: int, high_score_games: int, low_attempt_games: int) -> Dict:
+    """The ``get_completion_stats`` response shape from raw counters."""
+    if not total_games:
+        return {"satisfaction_rate": 95}
+
+    # Simple satisfaction calculation
+    satisfaction_rate = min(95, max(85,
+        (high_score_games / total_games * 50) +
+        (low_attempt_games / total_games * 45) + 5
+    ))
+
+    return {
+        "satisfaction_rate": round(satisfaction_rate),
+        "total_entries": total_games,
+        "high_score_rate": round(high_score_games / total_games * 100, 1)
+    }
+
+
+class LeaderboardAggregates:
+    """Counters updated on every recorded game.
+
+    They cover every game ever submitted, including entries that later fall
+    out of the retained leaderboard, so they are persisted alongside the
+    leaderboard rather than recomputed from it.
+    """
+
+    def __init__(self):
+        self.users: Dict[str, UserAggregate] = {}
+        self.total_games = 0
+        self.high_score_games = 0
+        self.low_attempt_games = 0
+
+    def add(self, entry: Dict):
+        user = self.users.get(entry["username"])
+        if user is None:
+            user = self.users[entry["username"]] = UserAggregate()
+        user.games += 1
+        user.score_sum += entry["score"]
+        user.best_score = max(user.best_score, entry["score"])
+        user.attempts_sum += entry["attempts"]
+        user.time_sum += entry["completion_time"]
+
+        self.total_games += 1
+        if entry["score"] >= HIGH_SCORE:
+            self.high_score_games += 1
+        if entry["attempts"] <= LOW_ATTEMPTS:
+            self.low_attempt_games += 1
+
+    @classmethod
+    def rebuild(cls, entries: Iterable[Dict]) -> "LeaderboardAggregates":
+        aggregates = cls()
+        for entry in entries:
+            aggregates.add(entry)
+        return aggregates
+
+    def user_stats(self, username: str) -> Dict:
+        user = self.users.get(username.lower())
+        if user is None:
+            return user_stats_dict(username, 0, 0, 0, 0, 0)
+        return user_stats_dict(username, user.games, user.best_score, user.score_sum,
+                               user.attempts_sum, user.time_sum)
+
+    def completion_stats(self) -> Dict:
+        return completion_stats_dict(self.total_games, self.high_score_games, self.low_attempt_games)
+
+    def to_dict(self) -> Dict:
+        return {
+            "total_games": self.total_games,
+            "high_score_games": self.high_score_games,
+            "low_attempt_games": self.low_attempt_games,
+            # games, score_sum, best_score, attempts_sum, time_sum
+            "users": {username: user.to_list() for username, user in self.users.items()},
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict) -> "LeaderboardAggregates":
+        aggregates = cls()
+        aggregates.total_games = data["total_games"]
+        aggregates.high_score_games = data["high_score_games"]
+        aggregates.low_attempt_games = data["low_attempt_games"]
+        aggregates.users = {username: UserAggregate(*values) for username, values in data["users"].items()}
+        return aggregates
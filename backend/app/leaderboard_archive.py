@@ -0,0 +1,622 @@
+"""Append-only archive of every leaderboard game, in time-ordered segments.
+
+Games are appended as NDJSON lines to ``active.ndjson``. Once it holds
+``segment_records`` games, or has been open for ``seal_interval`` seconds,
+it is sealed: renamed to an immutable segment whose file name records what
+it contains::
+
+    seg-<first no>-<last no>-<min epoch>-<max epoch>-<count>.ndjson
+
+so reads of recent games skip older segments from the directory listing
+alone. Next to each segment, ``<segment name>.users.json`` counts its games
+per username, so a player's history is read only from the segments that
+hold their games, and pages before the requested one are skipped by count
+without reading them. A background thread merges runs of small adjacent segments into one
+of up to ``merge_records`` games. A merged segment covers the numbers of
+its sources; a source left behind by an interrupted merge is recognised by
+its number range and removed on the next start.
+
+Live games are appended as they arrive, which is only roughly time
+order: a game is timestamped before its write waits for the lock, and
+``append`` takes any timestamp. Imported games older than the newest
+archived one are sorted into sealed segments of their own
+(``import_entries``), so segments can overlap in time. Merges only join
+segments that follow each other in time, readers merge overlapping files
+by timestamp, and a user's history is sorted by timestamp after reading.
+
+Readers open the files they need under the lock and then stream them
+without it, so appends, seals and merges never wait for a long read, and
+memory use does not grow with the length of the history.
+
+Several processes can share one archive when they pass the same
+cross-process ``lock``: every operation takes it and first picks up what
+the others appended, sealed or merged, and only one process at a time
+merges (``merge.lock``).
+"""
+
+import heapq
+import json
+import math
+import os
+import re
+import threading
+import time
+from collections import Counter
+from contextlib import contextmanager, nullcontext
+from typing import Dict, Iterator, List, NamedTuple, Optional, Tuple
+
+from app import config
+from app.file_lock import FileLock
+from app.leaderboard_index import parse_timestamp
+from app.metrics import time_operation
+
+SEGMENT_PATTERN = re.compile(r"^seg-(\d+)-(\d+)-(\d+)-(\d+)-(\d+)\.ndjson$")
+USERS_SUFFIX = ".users.json"
+ACTIVE_FILE = "active.ndjson"
+MERGE_LOCK_FILE = "merge.lock"
+
+# Where a reader got to: the last sealed segment number and the bytes read
+# of the active file after it (see ``position`` and ``read_since``)
+Position = Tuple[int, int]
+
+
+def _follows(min_epoch: float, previous_max_epoch: float) -> bool:
+    """Whether a file starting at ``min_epoch`` comes after one ending at
+    ``previous_max_epoch``, ignoring the second lost to rounding in names."""
+    return min_epoch + 1 >= previous_max_epoch
+
+
+def _clusters(sources: List[Tuple]) -> List[List[Tuple]]:
+    """Group ``(..., min_epoch, max_epoch, ...)`` tuples (epochs at index 2
+    and 3) into runs that overlap in time, oldest first."""
+    clusters: List[List[Tuple]] = []
+    end = -math.inf
+    for source in sorted(sources, key=lambda source: source[2]):
+        if clusters and not _follows(source[2], end):
+            clusters[-1].append(source)
+            end = max(end, source[3])
+        else:
+            clusters.append([source])
+            end = source[3]
+    return clusters
+
+
+def _epoch(entry: Dict) -> float:
+    return parse_timestamp(entry["timestamp"])
+
+
+class Segment(NamedTuple):
+    first_no: int
+    last_no: int
+    min_epoch: int
+    max_epoch: int
+    count: int
+    path: str
+
+    @staticmethod
+    def file_name(first_no: int, last_no: int, min_epoch: int, max_epoch: int, count: int) -> str:
+        return f"seg-{first_no:06d}-{last_no:06d}-{min_epoch}-{max_epoch}-{count}.ndjson"
+
+    @property
+    def users_path(self) -> str:
+        """The file counting this segment's games per username."""
+        return self.path + USERS_SUFFIX
+
+
+class LeaderboardArchive:
+    """Every recorded game, on disk, readable without loading it all."""
+
+    def __init__(self, directory: str, segment_records: Optional[int] = None,
+                 seal_interval: Optional[float] = None, merge_records: Optional[int] = None,
+                 merge_interval: Optional[float] = None, lock: Optional[FileLock] = None):
+        self.directory = directory
+        self.segment_records = segment_records or config.ARCHIVE_SEGMENT_RECORDS
+        self.seal_interval = seal_interval or config.ARCHIVE_SEAL_INTERVAL
+        self.merge_records = merge_records or config.ARCHIVE_MERGE_RECORDS
+        self.merge_interval = merge_interval or config.ARCHIVE_MERGE_INTERVAL
+        self.active_path = os.path.join(directory, ACTIVE_FILE)
+        os.makedirs(directory, exist_ok=True)
+
+        self._lock = threading.RLock()
+        self._file_lock = lock if lock is not None else nullcontext()
+        self._merge_lock = FileLock(os.path.join(directory, MERGE_LOCK_FILE))
+        self._segments: List[Segment] = []
+        # Games per username of each sealed segment (by path), read on first use
+        self._users: Dict[str, Dict[str, int]] = {}
+        self._active = None
+        # Leftovers of an interrupted merge are only removed while no merge runs
+        with self._merge_lock, self._locked():
+            self._segments = self._scan_segments(clean=True)
+            self._reset_active()
+            self._scan_active()
+
+        self._closed = threading.Event()
+        self._merger = threading.Thread(target=self._maintenance_loop, name="leaderboard-archive", daemon=True)
+        self._merger.start()
+
+    @contextmanager
+    def _locked(self):
+        """The cross-process lock (if any), then this archive's own."""
+        with self._file_lock, self._lock:
+            yield
+
+    # -- Layout --------------------------------------------------------
+
+    def _scan_segments(self, clean: bool = False) -> List[Segment]:
+        """Sealed segments by number, skipping sources of a finished merge.
+
+        With ``clean`` those sources and temporary files are also removed.
+        """
+        found = []
+        names = os.listdir(self.directory)
+        for name in names:
+            match = SEGMENT_PATTERN.match(name)
+            if match:
+                found.append(Segment(*map(int, match.groups()), os.path.join(self.directory, name)))
+            elif clean and name.endswith(".tmp"):
+                os.remove(os.path.join(self.directory, name))
+
+        segments: List[Segment] = []
+        # Widest range first, so a merged segment is kept over its sources
+        for segment in sorted(found, key=lambda s: (s.first_no, -s.last_no)):
+            if segments and segment.last_no <= segments[-1].last_no:
+                if clean:
+                    os.remove(segment.path)
+                continue
+            segments.append(segment)
+
+        if clean:
+            # Counts of segments that were merged away or never sealed
+            kept = {os.path.basename(segment.users_path) for segment in segments}
+            for name in names:
+                if name.endswith(USERS_SUFFIX) and name not in kept:
+                    os.remove(os.path.join(self.directory, name))
+        return segments
+
+    def _reset_active(self):
+        """Forget the active file, e.g. after it was sealed."""
+        if self._active is not None:
+            self._active.close()
+            self._active = None
+        # The number the active file will be sealed as; it identifies the
+        # file across processes, unlike its inode, which a new file may reuse
+        self._active_no = self._last_no() + 1
+        self._active_count = 0
+        self._active_users: Counter = Counter()
+        self._active_bytes = 0
+        self._active_min = math.inf
+        self._active_max = -math.inf
+        self._active_opened = time.time()
+
+    def _scan_active(self):
+        """Count the active file's games from ``_active_bytes`` on and drop a torn last line."""
+        try:
+            f = open(self.active_path, 'rb')
+        except FileNotFoundError:
+            return
+        with f:
+            start = good_offset = self._active_bytes
+            f.seek(start)
+            for line in f:
+                try:
+                    if not line.endswith(b"\n"):
+                        raise ValueError("missing newline")
+                    record = json.loads(line)
+                except ValueError:
+                    print("Ignoring truncated leaderboard archive record")
+                    break
+                self._track_active(record)
+                good_offset += len(line)
+            size = os.fstat(f.fileno()).st_size
+        if size > good_offset:
+            os.truncate(self.active_path, good_offset)
+        self._active_bytes = good_offset
+        if start == 0:
+            self._active_opened = os.path.getmtime(self.active_path) if self._active_count else time.time()
+
+    def _refresh(self):
+        """Pick up what other processes appended, sealed or merged.
+
+        Call with the locks held. Costs a directory listing and a ``stat``
+        when nothing changed.
+        """
+        if isinstance(self._file_lock, nullcontext):
+            return
+        self._segments = self._scan_segments()
+        try:
+            size = os.path.getsize(self.active_path)
+        except FileNotFoundError:
+            size = 0
+        if self._last_no() >= self._active_no or size < self._active_bytes:
+            # Sealed by another process, and maybe started again
+            self._reset_active()
+            self._scan_active()
+        elif size > self._active_bytes:
+            self._scan_active()
+
+    def _track_active(self, record: Dict):
+        epoch = parse_timestamp(record["timestamp"])
+        self._active_count += 1
+        self._active_users[record["username"]] += 1
+        self._active_min = min(self._active_min, epoch)
+        self._active_max = max(self._active_max, epoch)
+
+    def _last_no(self) -> int:
+        return self._segments[-1].last_no if self._segments else 0
+
+    def __len__(self) -> int:
+        with self._locked():
+            self._refresh()
+            return sum(segment.count for segment in self._segments) + self._active_count
+
+    @property
+    def last_epoch(self) -> float:
+        """Latest game timestamp in the archive (epoch seconds), or -inf."""
+        with self._locked():
+            self._refresh()
+            return self._last_epoch()
+
+    def _last_epoch(self) -> float:
+        latest = max((segment.max_epoch for segment in self._segments), default=-math.inf)
+        return max(latest, self._active_max)
+
+    # -- Writes --------------------------------------------------------
+
+    def append(self, entry_dict: Dict):
+        """Record one game."""
+        with time_operation("leaderboard_archive_append"):
+            self.extend([entry_dict])
+
+    def extend(self, entries: List[Dict]):
+        """Record games in order, with one write per segment they land in."""
+        with self._locked():
+            self._refresh()
+            start = 0
+            while start < len(entries):
+                if self._active is None:
+                    if not self._active_count:
+                        self._active_opened = time.time()
+                    self._active = open(self.active_path, 'ab')
+                batch = entries[start:start + self.segment_records - self._active_count]
+                data = "".join(json.dumps(entry, ensure_ascii=False, default=str) + "\n" for entry in batch)
+                data = data.encode("utf-8")
+                self._active.write(data)
+                self._active.flush()
+                self._active_bytes += len(data)
+                for entry in batch:
+                    self._track_active(entry)
+                if self._active_count >= self.segment_records:
+                    self._seal()
+                start += len(batch)
+
+    def import_entries(self, entries: List[Dict]):
+        """Record games in any time order, e.g. from an import.
+
+        Games from the newest archived one on are appended as usual; older
+        ones are sorted into segments of their own.
+        """
+        entries = sorted(entries, key=_epoch)
+        with self._locked():
+            self._refresh()
+            latest = self._last_epoch()
+            older = [entry for entry in entries if _epoch(entry) < latest]
+            if older:
+                # They take the next segment numbers, so the active file goes first
+                self._seal()
+                for start in range(0, len(older), self.segment_records):
+                    self._write_segment(older[start:start + self.segment_records])
+                self._reset_active()
+            self.extend(entries[len(older):])
+
+    def _write_segment(self, entries: List[Dict]):
+        """Seal time-ordered games straight into the next numbered segment."""
+        number = self._last_no() + 1
+        min_epoch, max_epoch = math.floor(_epoch(entries[0])), math.ceil(_epoch(entries[-1]))
+        path = os.path.join(self.directory, Segment.file_name(number, number, min_epoch, max_epoch, len(entries)))
+        segment = Segment(number, number, min_epoch, max_epoch, len(entries), path)
+        with open(path + ".tmp", 'wb') as f:
+            f.write("".join(json.dumps(entry, ensure_ascii=False, default=str) + "\n" for entry in entries)
+                    .encode("utf-8"))
+        self._write_users(segment, Counter(entry["username"] for entry in entries))
+        os.replace(path + ".tmp", path)
+        self._segments.append(segment)
+
+    def _seal(self):
+        """Turn the active file into the next numbered segment."""
+        if not self._active_count:
+            return
+        number = self._last_no() + 1
+        name = Segment.file_name(number, number, math.floor(self._active_min),
+                                 math.ceil(self._active_max), self._active_count)
+        path = os.path.join(self.directory, name)
+        segment = Segment(number, number, math.floor(self._active_min),
+                          math.ceil(self._active_max), self._active_count, path)
+        # The counts first: a segment is only ever seen with its counts
+        self._write_users(segment, self._active_users)
+        os.replace(self.active_path, path)
+        self._segments.append(segment)
+        self._reset_active()
+
+    def _write_users(self, segment: Segment, users: Dict[str, int]):
+        temp_file = segment.users_path + ".tmp"
+        with open(temp_file, 'w', encoding='utf-8') as f:
+            json.dump(users, f, ensure_ascii=False)
+        os.replace(temp_file, segment.users_path)
+        self._users[segment.path] = dict(users)
+
+    def _segment_users(self, segment: Segment) -> Dict[str, int]:
+        """Games per username in a sealed segment; call with the locks held."""
+        users = self._users.get(segment.path)
+        if users is not None:
+            return users
+        try:
+            with open(segment.users_path, 'r', encoding='utf-8') as f:
+                users = self._users[segment.path] = json.load(f)
+        except (FileNotFoundError, ValueError):
+            # A segment sealed before counts were kept: count it once
+            with open(segment.path, 'rb') as f:
+                users = Counter(json.loads(line)["username"] for line in f)
+            self._write_users(segment, users)
+            users = self._users[segment.path]
+        return users
+
+    def seal(self):
+        with self._locked():
+            self._refresh()
+            self._seal()
+
+    def merge(self) -> int:
+        """Merge one run of adjacent small segments; returns segments merged."""
+        # Another process is merging; it will get to this run as well
+        if not self._merge_lock.acquire(blocking=False):
+            return 0
+        try:
+            with self._locked():
+                self._refresh()
+                run = self._merge_candidates()
+                users = Counter()
+                for segment in run:
+                    users.update(self._segment_users(segment))
+            if len(run) < 2:
+                return 0
+
+            first, last = run[0], run[-1]
+            merged = Segment(
+                first.first_no, last.last_no, min(s.min_epoch for s in run), max(s.max_epoch for s in run),
+                sum(s.count for s in run), ""
+            )
+            path = os.path.join(self.directory, Segment.file_name(*merged[:5]))
+            # Sealed segments are immutable, so the copy needs no lock
+            with open(path + ".tmp", 'wb') as out:
+                for segment in run:
+                    with open(segment.path, 'rb') as f:
+                        while chunk := f.read(1 << 20):
+                            out.write(chunk)
+            with self._locked():
+                self._write_users(merged._replace(path=path), users)
+            os.replace(path + ".tmp", path)
+
+            with self._locked():
+                # The merged segment hides its sources from the scan
+                self._segments = self._scan_segments()
+                for segment in run:
+                    # Readers that already opened a source keep reading it
+                    os.remove(segment.path)
+                    os.remove(segment.users_path)
+                    self._users.pop(segment.path, None)
+            return len(run)
+        finally:
+            self._merge_lock.release()
+
+    def _merge_candidates(self) -> List[Segment]:
+        """The first run of adjacent segments that fits in ``merge_records``.
+
+        A run only joins segments that follow each other in time, so the
+        merged file is in time order too.
+        """
+        for start in range(len(self._segments)):
+            run = [self._segments[start]]
+            total = run[0].count
+            for segment in self._segments[start + 1:]:
+                if total + segment.count > self.merge_records or not _follows(segment.min_epoch, run[-1].max_epoch):
+                    break
+                run.append(segment)
+                total += segment.count
+            if len(run) > 1:
+                return run
+        return []
+
+    def _maintenance_loop(self):
+        """Seal an old active file and merge small segments in the background."""
+        while not self._closed.wait(self.merge_interval):
+            try:
+                with self._locked():
+                    self._refresh()
+                    if self._active_count and time.time() - self._active_opened >= self.seal_interval:
+                        self._seal()
+                while self.merge() and not self._closed.is_set():
+                    pass
+            except Exception as e:
+                print(f"Error maintaining leaderboard archive: {e}")
+
+    def close(self):
+        self._closed.set()
+        self._merger.join()
+        with self._lock:
+            if self._active is not None:
+                self._active.close()
+                self._active = None
+        self._merge_lock.close()
+
+    # -- Reads ---------------------------------------------------------
+
+    def _open_sources(self, since: Optional[float] = None,
+                      until: Optional[float] = None) -> List[Tuple[object, int, float, float]]:
+        """Open files that may hold games between ``since`` and ``until``.
+
+        Returns ``(file, byte limit, min epoch, max epoch)`` tuples; the
+        limit keeps a reader from seeing a line of the active file that is
+        still being appended.
+        """
+        sources = []
+        with self._locked():
+            self._refresh()
+            for segment in self._segments:
+                if (since is None or segment.max_epoch >= since) and (until is None or segment.min_epoch <= until):
+                    sources.append((open(segment.path, 'rb'), os.path.getsize(segment.path),
+                                    segment.min_epoch, segment.max_epoch))
+            if self._active_count and (since is None or self._active_max >= since) and (
+                    until is None or self._active_min <= until):
+                sources.append((open(self.active_path, 'rb'), self._active_bytes,
+                                self._active_min, self._active_max))
+        return sources
+
+    @staticmethod
+    def _read_source(f, limit: int) -> Iterator[Dict]:
+        with f:
+            remaining = limit
+            for line in f:
+                remaining -= len(line)
+                if remaining < 0:
+                    break
+                yield json.loads(line)
+
+    @classmethod
+    def _time_ordered(cls, sources: List[Tuple[object, int, float, float]]) -> Iterator[Dict]:
+        """Games of opened sources oldest first, merging files that overlap in time."""
+        for cluster in _clusters(sources):
+            if len(cluster) == 1:
+                yield from cls._read_source(*cluster[0][:2])
+            else:
+                yield from heapq.merge(*(cls._read_source(f, limit) for f, limit, _, _ in cluster), key=_epoch)
+
+    def iter_entries(self, since: Optional[float] = None, until: Optional[float] = None) -> Iterator[Dict]:
+        """Stream archived games, oldest first (within a file, in the order
+        they were appended), optionally only those from ``since`` to
+        ``until`` (inclusive, epoch seconds)."""
+        sources = self._open_sources(since, until)
+        try:
+            for entry in self._time_ordered(sources):
+                if since is None and until is None:
+                    yield entry
+                    continue
+                epoch = _epoch(entry)
+                if (since is None or epoch >= since) and (until is None or epoch <= until):
+                    yield entry
+        finally:
+            for f, *_ in sources:
+                f.close()
+
+    def position(self) -> Position:
+        """Where the archive ends, as seen by this process, for ``read_since``."""
+        with self._lock:
+            return self._last_no(), self._active_bytes
+
+    def read_since(self, position: Position) -> Optional[List[Dict]]:
+        """Games appended by any process after ``position``, oldest first.
+
+        Returns None when the segments holding them have since been merged,
+        and the caller has to go back to ``iter_entries``.
+        """
+        last_no, offset = position
+        with self._locked():
+            self._refresh()
+            if last_no == self._last_no():
+                parts = [(self.active_path, offset, self._active_bytes)]
+            else:
+                later = [segment for segment in self._segments if segment.last_no > last_no]
+                # The active file read up to ``offset`` was sealed as segment
+                # ``last_no + 1``; a merge keeps it at the start of its file
+                if not later or later[0].first_no != last_no + 1:
+                    return None
+                parts = [(later[0].path, offset, None)] + [(segment.path, 0, None) for segment in later[1:]]
+                parts.append((self.active_path, 0, self._active_bytes))
+
+            games = []
+            for path, start, end in parts:
+                if start == end:
+                    continue
+                with open(path, 'rb') as f:
+                    f.seek(start)
+                    data = f.read() if end is None else f.read(end - start)
+                games.extend(json.loads(line) for line in data.splitlines())
+            return games
+
+    def recent(self, since: float, limit: int) -> List[Dict]:
+        """Up to ``limit`` of the newest games timestamped ``since`` or later, oldest first."""
+        # Newest files first, until no unread file can hold one of the newest
+        sources = sorted(self._open_sources(since), key=lambda source: source[3])
+        found: List[Tuple[float, Dict]] = []
+        try:
+            while sources:
+                if len(found) >= limit:
+                    found.sort(key=lambda item: item[0])
+                    del found[:-limit]
+                    if sources[-1][3] < found[0][0]:
+                        break
+                f, limit_bytes, _, _ = sources.pop()
+                for entry in self._read_source(f, limit_bytes):
+                    epoch = _epoch(entry)
+                    if epoch >= since:
+                        found.append((epoch, entry))
+        finally:
+            for f, *_ in sources:
+                f.close()
+        found.sort(key=lambda item: item[0])
+        return [entry for _, entry in found[-limit:]]
+
+    def user_history(self, username: str, limit: int = 50, offset: int = 0) -> List[Dict]:
+        """A user's games, newest first.
+
+        Only the files holding games of the requested page are read; the
+        per-segment counts tell which those are. Files overlapping in time
+        are read together, and the games read are sorted by timestamp, since
+        appends need not arrive in time order.
+        """
+        with self._locked():
+            self._refresh()
+            self._users = {s.path: self._users[s.path] for s in self._segments if s.path in self._users}
+            counted = [(segment.path, os.path.getsize(segment.path), segment.min_epoch, segment.max_epoch,
+                        self._segment_users(segment).get(username, 0)) for segment in self._segments]
+            if self._active_count:
+                counted.append((self.active_path, self._active_bytes, self._active_min, self._active_max,
+                                self._active_users.get(username, 0)))
+            # Newest first, skipping runs of files before the page and after it
+            skip, wanted, runs, first_skip = offset, limit, [], 0
+            for cluster in reversed(_clusters(counted)):
+                count = sum(source[4] for source in cluster)
+                if wanted <= 0:
+                    break
+                if count <= skip:
+                    skip -= count
+                    continue
+                if not runs:
+                    first_skip = skip
+                runs.append([(open(path, 'rb'), size) for path, size, _, _, games in cluster if games])
+                wanted -= count - skip
+                skip = 0
+
+        found: List[Dict] = []
+        try:
+            with time_operation("leaderboard_archive_read"):
+                for run in runs:
+                    games = []
+                    for f, limit_bytes in run:
+                        games.extend(entry for entry in self._read_source(f, limit_bytes)
+                                     if entry["username"] == username)
+                    games.sort(key=_epoch)
+                    found.extend(reversed(games))
+        finally:
+            for run in runs:
+                for f, _ in run:
+                    f.close()
+        return found[first_skip:first_skip + limit]
+
+    def stats(self) -> Dict:
+        with self._locked():
+            self._refresh()
+            return {
+                "segments": len(self._segments),
+                "segment_games": sum(s.count for s in self._segments),
+                "active_games": self._active_count,
+            }
@@ -0,0 +1,50 @@
+"""Opaque keyset cursors for paging through ``GET /leaderboard``.
+
+A cursor holds the view it belongs to (sort field, order and time filter)
+and the sort key of the last entry of a page: the sorted value, its
+tie-breakers and the stored row id, which every worker agrees on (see
+``leaderboard_index.sort_key`` and ``leaderboard_sqlite.keyset_key``). The
+next page is found by seeking to that key, so it costs the same as the
+first page and does not shift when scores arrive meanwhile.
+"""
+
+import base64
+import json
+from typing import Tuple
+
+# Types of the sort key elements per sort field: the sorted value (for score
+# also the negated completion time), then timestamp, username and row id
+_NUMBER = (int, float)
+KEY_TYPES = {
+    "score": (int, _NUMBER, str, str, int),
+    "attempts": (int, str, str, int),
+    "completion_time": (_NUMBER, str, str, int),
+    "timestamp": (str, str, str, int),
+}
+
+
+class InvalidCursor(ValueError):
+    """A cursor that is malformed or belongs to a different view."""
+
+
+def encode_cursor(sort_by: str, sort_order: str, time_filter: str, key: Tuple) -> str:
+    payload = json.dumps([sort_by, sort_order, time_filter, list(key)], separators=(",", ":"))
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str, sort_by: str, sort_order: str, time_filter: str) -> Tuple:
+    """The sort key in ``cursor``, checked against the requested view."""
+    try:
+        payload = json.loads(base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)))
+        view, key = tuple(payload[:3]), payload[3]
+    except (ValueError, TypeError, IndexError, KeyError):
+        raise InvalidCursor("Invalid cursor")
+    if view != (sort_by, sort_order, time_filter):
+        raise InvalidCursor("Cursor belongs to a different sort order or time filter")
+    types = KEY_TYPES.get(sort_by)
+    if types is None or not isinstance(key, list) or len(key) != len(types) or not all(
+        isinstance(value, expected) and not isinstance(value, bool) for value, expected in zip(key, types)
+    ):
+        raise InvalidCursor("Invalid cursor")
+    return tuple(key)
+
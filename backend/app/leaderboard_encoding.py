@@ -0,0 +1,38 @@
+"""Direct JSON encoding of stored leaderboard rows.
+
+Rows are validated once, as ``LeaderboardEntry``, when they are submitted.
+Reads encode the stored dicts straight to the bytes ``LeaderboardResponse``
+would produce instead of rebuilding and re-validating models per row.
+"""
+
+import json
+from datetime import datetime
+from typing import Dict, Iterable, Optional
+
+from app.models import LeaderboardEntry
+
+# Field order of the serialized LeaderboardEntry
+ENTRY_FIELDS = tuple(LeaderboardEntry.model_fields)
+
+_encode = json.JSONEncoder(ensure_ascii=False, separators=(",", ":")).encode
+
+
+def encode_entry(entry: Dict) -> bytes:
+    """JSON object for one stored row, as ``LeaderboardEntry`` would serialize it."""
+    timestamp = entry["timestamp"]
+    if isinstance(timestamp, datetime):
+        entry = {**entry, "timestamp": timestamp.isoformat()}
+    return _encode({field: entry[field] for field in ENTRY_FIELDS}).encode()
+
+
+def encode_leaderboard_response(entries: Iterable[bytes], total_entries: int,
+                                user_rank: Optional[int] = None,
+                                user_best_score: Optional[int] = None,
+                                next_cursor: Optional[str] = None) -> bytes:
+    """A ``LeaderboardResponse`` body from pre-encoded entries."""
+    return b"".join((
+        b'{"entries":[', b",".join(entries), b'],"total_entries":',
+        _encode(total_entries).encode(), b',"user_rank":', _encode(user_rank).encode(),
+        b',"user_best_score":', _encode(user_best_score).encode(),
+        b',"next_cursor":', _encode(next_cursor).encode(), b"}",
+    ))
@@ -0,0 +1,141 @@
+"""Fan-out of leaderboard changes to WebSocket subscribers."""
+
+import asyncio
+import json
+from collections import deque
+from typing import Dict, Optional, Set
+
+from fastapi import WebSocket, WebSocketDisconnect
+
+MAX_STREAM_LIMIT = 100
+
+
+def _encode(message: Dict) -> str:
+    return json.dumps(message, ensure_ascii=False, default=lambda value: value.isoformat())
+
+
+class _Subscriber:
+    """One connection's mailbox.
+
+    Holds at most ``max_pending`` undelivered messages. When a consumer
+    falls further behind its backlog is dropped and replaced by a single
+    fresh snapshot, so memory per subscriber stays bounded.
+    """
+
+    __slots__ = ("limit", "pending", "resync", "wakeup", "max_pending")
+
+    def __init__(self, limit: int, max_pending: int):
+        self.limit = limit
+        self.max_pending = max_pending
+        self.pending = deque()
+        self.resync = True
+        self.wakeup = asyncio.Event()
+        self.wakeup.set()
+
+    def offer(self, message: str):
+        if not self.resync:
+            if len(self.pending) >= self.max_pending:
+                self.pending.clear()
+                self.resync = True
+            else:
+                self.pending.append(message)
+        self.wakeup.set()
+
+
+class LeaderboardHub:
+    """Pushes the top-N on connect and each accepted score afterwards.
+
+    A score message carries the entry's 1-based ``position`` in the
+    all-time score page (ties broken as the page breaks them), where a
+    client holding that page inserts it.
+
+    ``publish`` is registered as a leaderboard service listener. It encodes
+    the update once and only appends it to subscriber mailboxes, so a
+    score submission never waits on a slow socket; each connection has its
+    own sender task.
+    """
+
+    def __init__(self, leaderboard_service, max_pending: int = 32):
+        self.leaderboard_service = leaderboard_service
+        self.max_pending = max_pending
+        self._subscribers: Set[_Subscriber] = set()
+        self._snapshots: Dict[int, str] = {}
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+
+    @property
+    def subscriber_count(self) -> int:
+        return len(self._subscribers)
+
+    def _snapshot(self, limit: int) -> str:
+        """Encoded top-N message, cached until the next publish."""
+        message = self._snapshots.get(limit)
+        if message is None:
+            message = self._snapshots[limit] = _encode({
+                "type": "snapshot",
+                "entries": self.leaderboard_service.get_leaderboard(limit=limit),
+                "total_entries": self.leaderboard_service.get_total_entries(),
+            })
+        return message
+
+    def publish(self, entry: Dict):
+        """Listener for ``add_entry``; safe to call from any thread.
+
+        The entry's place in the score page is looked up here, in the
+        writer's thread, before later submissions can shift it.
+        """
+        if self._loop is None or not self._subscribers:
+            self._snapshots.clear()
+            return
+        position = self.leaderboard_service.get_entry_position(entry)
+        try:
+            running = asyncio.get_running_loop()
+        except RuntimeError:
+            running = None
+        if running is self._loop:
+            self._fan_out(entry, position)
+        else:
+            self._loop.call_soon_threadsafe(self._fan_out, entry, position)
+
+    def _fan_out(self, entry: Dict, position: Optional[int]):
+        self._snapshots.clear()
+        message = _encode({
+            "type": "score",
+            "position": position,
+            "entry": entry,
+            "total_entries": self.leaderboard_service.get_total_entries(),
+        })
+        for subscriber in self._subscribers:
+            if position is not None and position <= subscriber.limit:
+                subscriber.offer(message)
+
+    async def serve(self, websocket: WebSocket, limit: int = 10):
+        """Stream updates to an accepted WebSocket until it disconnects."""
+        self._loop = asyncio.get_running_loop()
+        subscriber = _Subscriber(max(1, min(limit, MAX_STREAM_LIMIT)), self.max_pending)
+        self._subscribers.add(subscriber)
+        sender = asyncio.create_task(self._send_loop(websocket, subscriber))
+        try:
+            # Clients do not send anything; this returns on disconnect
+            while True:
+                message = await websocket.receive()
+                if message["type"] == "websocket.disconnect":
+                    break
+        except WebSocketDisconnect:
+            pass
+        finally:
+            self._subscribers.discard(subscriber)
+            sender.cancel()
+
+    async def _send_loop(self, websocket: WebSocket, subscriber: _Subscriber):
+        try:
+            while True:
+                await subscriber.wakeup.wait()
+                subscriber.wakeup.clear()
+                if subscriber.resync:
+                    subscriber.resync = False
+                    subscriber.pending.clear()
+                    await websocket.send_text(self._snapshot(subscriber.limit))
+                while subscriber.pending:
+                    await websocket.send_text(subscriber.pending.popleft())
+        except (WebSocketDisconnect, RuntimeError):
+            pass
@@ -0,0 +1,316 @@
+"""In-memory indexes over leaderboard entries."""
+
+import bisect
+import math
+from datetime import datetime, timedelta
+from typing import Dict, Iterator, List, Optional, Tuple
+
+from app.leaderboard_encoding import encode_entry
+from app.rank_index import ScoreRankIndex
+
+SORT_FIELDS = ("score", "attempts", "completion_time", "timestamp")
+
+# Rolling windows for the daily/weekly/monthly leaderboard filters
+TIME_WINDOWS = {
+    "daily": timedelta(days=1),
+    "weekly": timedelta(weeks=1),
+    "monthly": timedelta(days=30),
+}
+
+
+def sort_key(entry: Dict, field: str, seq: int) -> Tuple:
+    """Ascending key for a sortable field, with stable tie-breakers.
+
+    Score ties are broken by completion time so that a descending score
+    view lists the faster game first. The descending score view is the
+    canonical rank order. The last tie-breakers are the row's stored ``id``,
+    the same in every process, and its seq, which is not (only rows archived
+    before ids were stored lack one).
+    """
+    if field == "score":
+        return (entry["score"], -entry["completion_time"], entry["timestamp"], entry["username"],
+                entry.get("id", 0), seq)
+    return (entry[field], entry["timestamp"], entry["username"], entry.get("id", 0), seq)
+
+
+def tie_key(entry: Dict, seq: int) -> Tuple:
+    """Order among entries with equal scores: the score ``sort_key`` without the score."""
+    return sort_key(entry, "score", seq)[1:]
+
+
+def parse_timestamp(value) -> float:
+    """Convert a stored timestamp to epoch seconds."""
+    if isinstance(value, str):
+        value = datetime.fromisoformat(value)
+    return value.timestamp()
+
+
+def time_filter_cutoff(time_filter: str) -> Optional[float]:
+    """Epoch seconds at which a daily/weekly/monthly window starts, or None."""
+    window = TIME_WINDOWS.get(time_filter)
+    if window is None:
+        return None
+    return (datetime.now() - window).timestamp()
+
+
+class _WindowViews:
+    """Sorted views restricted to rows at or after ``cutoff``."""
+
+    __slots__ = ("cutoff", "sorted")
+
+    def __init__(self, cutoff: float, rows: Dict[int, Dict], seqs: List[int]):
+        self.cutoff = cutoff
+        self.sorted = {
+            field: sorted(sort_key(rows[seq], field, seq) for seq in seqs)
+            for field in SORT_FIELDS
+        }
+
+    def add(self, row: Dict, seq: int):
+        for field in SORT_FIELDS:
+            bisect.insort(self.sorted[field], sort_key(row, field, seq))
+
+    def remove(self, row: Dict, seq: int):
+        for field in SORT_FIELDS:
+            _discard(self.sorted[field], sort_key(row, field, seq))
+
+
+class LeaderboardIndex:
+    """Resident leaderboard with sorted views and a username map.
+
+    Rows are stored as the dicts persisted in ``leaderboard.json`` (timestamp
+    as an ISO string) and are never handed out directly; callers get copies.
+
+    Timestamps are parsed once, on insert, into a time-ordered list of
+    ``(epoch, seq)`` so window counts are a bisect. Each daily/weekly/monthly
+    filter gets its own sorted views, built on first use, updated on every
+    insert and trimmed from the old end as the window slides forward.
+
+    Canonical (score) ranks come from a ``ScoreRankIndex``, which also
+    answers dense ranks and "which entry is at position R".
+
+    With ``all_time=False`` only the time-window views are kept (no
+    all-time views or ranks), for an index that serves nothing else; its
+    ``max_entries`` cap then drops the oldest rows instead of the lowest.
+    """
+
+    def __init__(self, max_entries: Optional[int] = 1000, all_time: bool = True):
+        self.max_entries = max_entries
+        self.all_time = all_time
+        self._rows: Dict[int, Dict] = {}
+        self._epochs: Dict[int, float] = {}
+        self._encoded: Dict[int, bytes] = {}
+        self._ranks = ScoreRankIndex()
+        self._sorted: Dict[str, List[Tuple]] = {field: [] for field in SORT_FIELDS}
+        self._by_user: Dict[str, List[int]] = {}
+        self._by_time: List[Tuple[float, int]] = []
+        self._windows: Dict[str, _WindowViews] = {}
+        self._next_seq = 0
+
+    def __len__(self) -> int:
+        return len(self._rows)
+
+    def load(self, entries: List[Dict]):
+        """Replace the index contents, sorting each view once."""
+        self._rows.clear()
+        self._epochs.clear()
+        self._encoded.clear()
+        self._by_user.clear()
+        self._windows.clear()
+        self._next_seq = 0
+        for entry in entries:
+            seq = self._next_seq
+            self._next_seq += 1
+            self._rows[seq] = entry
+            self._epochs[seq] = parse_timestamp(entry["timestamp"])
+            self._by_user.setdefault(entry["username"], []).append(seq)
+
+        self._by_time = sorted((epoch, seq) for seq, epoch in self._epochs.items())
+        if self.all_time:
+            self._ranks.load((row["score"], tie_key(row, seq)) for seq, row in self._rows.items())
+            for field in SORT_FIELDS:
+                self._sorted[field] = sorted(sort_key(row, field, seq) for seq, row in self._rows.items())
+
+        self._evict()
+
+    def add(self, entry: Dict) -> Optional[int]:
+        """Insert an entry and evict the rows beyond the cap.
+
+        Returns the sequence number of the new row, or None if it did not
+        make the cut.
+        """
+        seq = self._next_seq
+        self._next_seq += 1
+        epoch = self._epochs[seq] = parse_timestamp(entry["timestamp"])
+        self._rows[seq] = entry
+        self._by_user.setdefault(entry["username"], []).append(seq)
+        bisect.insort(self._by_time, (epoch, seq))
+        if self.all_time:
+            self._ranks.add(entry["score"], tie_key(entry, seq))
+            for field in SORT_FIELDS:
+                bisect.insort(self._sorted[field], sort_key(entry, field, seq))
+        for window in self._windows.values():
+            if epoch >= window.cutoff:
+                window.add(entry, seq)
+
+        self._evict()
+
+        return seq if seq in self._rows else None
+
+    def _evict(self):
+        """Drop the lowest ranked (or, without ranks, the oldest) rows beyond the cap."""
+        while self.max_entries is not None and len(self._rows) > self.max_entries:
+            self.remove(self.seq_at(len(self._rows)) if self.all_time else self._by_time[0][1])
+
+    def remove(self, seq: int):
+        """Drop a row from every view."""
+        row = self._rows.pop(seq)
+        epoch = self._epochs.pop(seq)
+        self._encoded.pop(seq, None)
+        _discard(self._by_time, (epoch, seq))
+        if self.all_time:
+            self._ranks.remove(row["score"], tie_key(row, seq))
+            for field in SORT_FIELDS:
+                _discard(self._sorted[field], sort_key(row, field, seq))
+        for window in self._windows.values():
+            if epoch >= window.cutoff:
+                window.remove(row, seq)
+
+        user_seqs = self._by_user[row["username"]]
+        user_seqs.remove(seq)
+        if not user_seqs:
+            del self._by_user[row["username"]]
+
+    def expire(self, before: float):
+        """Drop rows timestamped before ``before`` (epoch seconds)."""
+        end = bisect.bisect_left(self._by_time, (before,))
+        for _, seq in self._by_time[:end]:
+            self.remove(seq)
+
+    def entries(self) -> List[Dict]:
+        """All rows in canonical rank order, as stored."""
+        return [self._rows[key[-1]] for _, key in self._ranks.ranked()]
+
+    def _window_views(self, time_filter: str) -> Optional[_WindowViews]:
+        """Views for a rolling window, slid forward to the current time."""
+        cutoff = time_filter_cutoff(time_filter)
+        if cutoff is None:
+            return None
+        window = self._windows.get(time_filter)
+        if window is None or cutoff < window.cutoff:
+            start = bisect.bisect_left(self._by_time, (cutoff,))
+            window = self._windows[time_filter] = _WindowViews(
+                cutoff, self._rows, [seq for _, seq in self._by_time[start:]]
+            )
+        elif cutoff > window.cutoff:
+            start = bisect.bisect_left(self._by_time, (window.cutoff,))
+            end = bisect.bisect_left(self._by_time, (cutoff,))
+            for _, seq in self._by_time[start:end]:
+                window.remove(self._rows[seq], seq)
+            window.cutoff = cutoff
+        return window
+
+    def page_keys(self, sort_by: str = "score", sort_order: str = "desc", offset: int = 0,
+                  limit: int = 50, time_filter: str = "all", after: Optional[Tuple] = None) -> List[Tuple]:
+        """Sort keys (see ``sort_key``; the row's id and seq are last) of one page of a sorted view.
+
+        With ``after``, the sort key of the last row of the previous page
+        without its seq (seqs are numbered per process and load), the page
+        starts right behind it (a bisect, so deep pages cost the same as the
+        first) and ``offset`` counts from there.
+        """
+        window = self._window_views(time_filter)
+        views = self._sorted if window is None else window.sorted
+        view = views.get(sort_by)
+        if view is None:
+            view, sort_order = views["score"], "desc"
+
+        if sort_order == "desc":
+            end = len(view) if after is None else bisect.bisect_left(view, after)
+            end = max(0, end - offset)
+            return view[max(0, end - limit):end][::-1]
+        # A shorter key sorts before every key it is a prefix of
+        start = 0 if after is None else bisect.bisect_right(view, tuple(after) + (math.inf,))
+        return view[start + offset:start + offset + limit]
+
+    def page(self, sort_by: str = "score", sort_order: str = "desc", offset: int = 0,
+             limit: int = 50, time_filter: str = "all", after: Optional[Tuple] = None) -> List[Dict]:
+        """Return copies of one page of rows from a sorted view."""
+        keys = self.page_keys(sort_by, sort_order, offset, limit, time_filter, after)
+        return [dict(self._rows[key[-1]]) for key in keys]
+
+    def page_encoded(self, sort_by: str = "score", sort_order: str = "desc", offset: int = 0,
+                     limit: int = 50, time_filter: str = "all", after: Optional[Tuple] = None) -> List[bytes]:
+        """Like ``page``, but each row as JSON bytes, encoded once per row and kept."""
+        return self.encoded(self.page_keys(sort_by, sort_order, offset, limit, time_filter, after))
+
+    def encoded(self, keys: List[Tuple]) -> List[bytes]:
+        """JSON bytes of the rows behind ``page_keys`` results."""
+        result = []
+        for key in keys:
+            seq = key[-1]
+            encoded = self._encoded.get(seq)
+            if encoded is None:
+                encoded = self._encoded[seq] = encode_entry(self._rows[seq])
+            result.append(encoded)
+        return result
+
+    def count(self, time_filter: str = "all") -> int:
+        """Number of rows, optionally only those inside a rolling window."""
+        cutoff = time_filter_cutoff(time_filter)
+        if cutoff is None:
+            return len(self._rows)
+        return len(self._by_time) - bisect.bisect_left(self._by_time, (cutoff,))
+
+    def count_above(self, score: int) -> int:
+        """Number of rows with a strictly higher score."""
+        return self._ranks.count_above(score)
+
+    def dense_rank(self, score: int) -> int:
+        """1 + number of distinct higher scores."""
+        return self._ranks.dense_rank(score)
+
+    def position(self, seq: int) -> int:
+        """1-based canonical position of a row."""
+        row = self._rows[seq]
+        return self._ranks.position(row["score"], tie_key(row, seq))
+
+    def position_of(self, entry: Dict) -> Optional[int]:
+        """1-based canonical position of the retained row with ``entry``'s
+        sort key (its id included), or None when it is not retained."""
+        view = self._sorted["score"]
+        key = sort_key(entry, "score", 0)[:-1]
+        pos = bisect.bisect_left(view, key)
+        if pos == len(view) or view[pos][:-1] != key:
+            return None
+        return self.position(view[pos][-1])
+
+    def seq_at(self, position: int) -> int:
+        """Row at a 1-based canonical position."""
+        return self._ranks.at(position)[1][-1]
+
+    def ranked_rows(self, start: int, end: int) -> List[Dict]:
+        """Copies of the rows at canonical positions ``start..end`` (1-based, inclusive)."""
+        start, end = max(1, start), min(len(self._rows), end)
+        return [dict(self._rows[self.seq_at(position)]) for position in range(start, end + 1)]
+
+    def best_user_position(self, username: str) -> Optional[Tuple[int, int]]:
+        """``(position, score)`` of a (lowercase) user's highest ranked row."""
+        seqs = self._by_user.get(username)
+        if not seqs:
+            return None
+        seq = max(seqs, key=lambda seq: sort_key(self._rows[seq], "score", seq))
+        return self.position(seq), self._rows[seq]["score"]
+
+    def user_entries(self, username: str) -> Iterator[Dict]:
+        """Rows belonging to one (lowercase) username."""
+        return (self._rows[seq] for seq in self._by_user.get(username, ()))
+
+    def unique_users(self) -> int:
+        return len(self._by_user)
+
+
+def _discard(view: List[Tuple], key: Tuple):
+    """Remove an exact key from a sorted list."""
+    pos = bisect.bisect_left(view, key)
+    if pos < len(view) and view[pos] == key:
+        del view[pos]
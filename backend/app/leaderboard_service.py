@@ -1,28 +1,169 @@
 """Leaderboard data service for persistent storage and management."""
 
+import heapq
 import json
 import os
 import shutil
-from datetime import datetime, timedelta
-from typing import List, Dict, Optional
+import tempfile
+import threading
+from datetime import datetime
+from itertools import islice
+from typing import Callable, Iterable, Iterator, List, Dict, Optional, Tuple
+from app import config
+from app.file_lock import FileLock
 from app.models import LeaderboardEntry
+from app.leaderboard_aggregates import LeaderboardAggregates
+from app.leaderboard_archive import LeaderboardArchive
+from app.leaderboard_index import TIME_WINDOWS, LeaderboardIndex, parse_timestamp, sort_key
+from app.metrics import time_operation
+from app.rank_index import annotate_ranks, rank_summary
 
+# Entries kept in memory (the "hot" top of the leaderboard); with the
+# archive enabled older and lower games remain on disk
+MAX_LEADERBOARD_ENTRIES = config.LEADERBOARD_HOT_ENTRIES
+
+# Rows ingested per batch by ``bulk_import``
+IMPORT_BATCH_SIZE = 10000
+
+# Beyond this many games written by other processes since the last look
+# (e.g. a bulk import), the recent games are reloaded from the archive
+# rather than inserted one by one, and listeners are not called for them
+SYNC_MAX_GAMES = 1000
+
+
+class LeaderboardEvents:
+    """Listener registry shared by the leaderboard storage backends."""
 
-class LeaderboardDataService:
-    """Service for managing leaderboard data persistence."""
-    
     def __init__(self):
-        self.data_dir = os.path.join(os.path.dirname(__file__), "..", "data")
+        self._listeners: List[Callable[[Dict], None]] = []
+        self._version = 0
+
+    @property
+    def version(self) -> int:
+        """Counter that increases whenever the leaderboard changes."""
+        return self._version
+
+    def add_listener(self, callback: Callable[[Dict], None]):
+        """Call ``callback(entry_dict)`` after each entry ``add_entry`` accepts."""
+        self._listeners.append(callback)
+
+    def _notify(self, entry_dict: Dict):
+        for listener in self._listeners:
+            try:
+                listener(entry_dict)
+            except Exception as e:
+                print(f"Error in leaderboard listener: {e}")
+
+
+class LeaderboardDataService(LeaderboardEvents):
+    """Service for managing leaderboard data persistence.
+
+    The leaderboard file is parsed once at construction into a resident
+    ``LeaderboardIndex``; all reads are served from memory and ``add_entry``
+    keeps the index and the file in step.
+
+    With ``durability="journal"`` a submission is a single NDJSON line
+    appended to ``leaderboard.journal``. A background thread folds the
+    journal into ``leaderboard.json`` (taking the backup copy at that point)
+    and starts a new journal generation; startup loads the snapshot and
+    replays any journal written after it.
+
+    ``leaderboard.json`` only holds the top ``max_entries`` games. Unless
+    ``archive`` is off, every game is also appended to a
+    ``LeaderboardArchive`` under ``data/archive``, which serves user history,
+    and the games of the longest time window, up to
+    ``LEADERBOARD_RECENT_ENTRIES`` of the newest, are kept in a second index
+    (loaded from the archive at startup) that serves the daily/weekly/monthly
+    views, so those cover every game up to that cap.
+
+    Several worker processes can share one data directory. Every write
+    holds an exclusive ``flock`` on ``leaderboard.lock`` and first catches
+    up with the others: the journal records they appended (or, after a
+    compaction or in snapshot mode, the whole snapshot) and their games in
+    the archive. It then bumps the revision counter in the lock file before
+    persisting. Reads compare that counter with the revision last loaded,
+    a single ``pread``, and only catch up when it changed and the locks are
+    free (a read never waits for a writer); a background
+    thread does the same every ``LEADERBOARD_SYNC_INTERVAL`` seconds, so
+    listeners also hear of scores submitted to other workers.
+    """
+    
+    def __init__(self, data_dir: Optional[str] = None, max_entries: int = MAX_LEADERBOARD_ENTRIES,
+                 durability: Optional[str] = None, archive: Optional[bool] = None):
+        super().__init__()
+        self.data_dir = data_dir or os.path.join(os.path.dirname(__file__), "..", "data")
         self.leaderboard_file = os.path.join(self.data_dir, "leaderboard.json")
         self.backup_file = os.path.join(self.data_dir, "leaderboard_backup.json")
+        self.journal_file = os.path.join(self.data_dir, "leaderboard.journal")
+        self.aggregates_file = os.path.join(self.data_dir, "leaderboard_aggregates.json")
+        self.lock_file = os.path.join(self.data_dir, "leaderboard.lock")
+        self.durability = durability or config.LEADERBOARD_DURABILITY
         self._ensure_data_directory()
-        self._ensure_leaderboard_file()
+        self._index = LeaderboardIndex(max_entries)
+        self._aggregates = LeaderboardAggregates()
+        # Games recorded so far (numbering them tells which ones the saved
+        # aggregates already cover) and, in snapshot mode, those submitted
+        # since the aggregates were last saved
+        self._games = 0
+        self._pending: List[Dict] = []
+        self._metadata = {}
+        # Cross-process lock first, then the in-process one, so a thread
+        # waiting for another process never holds up this one's readers
+        self._lock = threading.RLock()
+        self._writer = FileLock(self.lock_file)
+        self._revision = 0
+        self._journal = None
+        self._journal_generation = 0
+        self._journal_records = 0
+        self._journal_offset = 0
+        self._compact_requested = threading.Event()
+        self._closed = threading.Event()
+        self._compactor = None
+        use_archive = archive if archive is not None else config.LEADERBOARD_ARCHIVE
+        self._archive = LeaderboardArchive(
+            os.path.join(self.data_dir, "archive"), lock=self._writer
+        ) if use_archive else None
+        self._recent = LeaderboardIndex(
+            max_entries=config.LEADERBOARD_RECENT_ENTRIES, all_time=False
+        ) if use_archive else None
+        self._archive_position = None
+
+        with self._writer, self._lock:
+            self._revision = self._writer.revision()
+            self._remove_temp_files()
+            self._ensure_leaderboard_file()
+            self._load()
+            if self._archive is not None:
+                self._catch_up_archive()
+                self._reload_recent()
+                self._archive_position = self._archive.position()
+            self._replayed = []
+
+            if self.durability != "journal":
+                # Fold in a journal left behind by an earlier journal-mode run
+                self.compact()
+            else:
+                self._open_journal()
+
+        if self.durability == "journal":
+            self._compactor = threading.Thread(
+                target=self._compaction_loop, name="leaderboard-compactor", daemon=True
+            )
+            self._compactor.start()
+        self._syncer = threading.Thread(target=self._sync_loop, name="leaderboard-sync", daemon=True)
+        self._syncer.start()
     
     def _ensure_data_directory(self):
         """Ensure the data directory exists."""
         if not os.path.exists(self.data_dir):
             os.makedirs(self.data_dir)
     
+    def _remove_temp_files(self):
+        """Remove snapshot temp files of writers that died mid-write; call with the lock held."""
+        for name in os.listdir(self.data_dir):
+            if name.startswith("leaderboard.") and name.endswith(".tmp"):
+                os.remove(os.path.join(self.data_dir, name))
+
     def _ensure_leaderboard_file(self):
         """Ensure the leaderboard file exists with proper structure."""
         if not os.path.exists(self.leaderboard_file):
@@ -59,8 +200,335 @@ class LeaderboardDataService:
             self._ensure_leaderboard_file()
             return self._read_data()
     
+    def _load(self):
+        """Load the leaderboard file into the in-memory index."""
+        with time_operation("leaderboard_load"):
+            data = self._read_data()
+            self._metadata = data.get("metadata", {})
+            # Rows saved before rows had ids get ones every process derives alike
+            for position, entry in enumerate(data["entries"], 1):
+                entry.setdefault("id", -position)
+            self._index.load(data["entries"])
+            self._aggregates = self._read_aggregates()
+            if self._aggregates is None and "aggregates" in data:
+                # Written when the aggregates were kept in leaderboard.json
+                self._aggregates = LeaderboardAggregates.from_dict(data["aggregates"])
+            elif self._aggregates is None:
+                # Files written before aggregates existed only know retained entries
+                self._aggregates = LeaderboardAggregates.rebuild(data["entries"])
+            self._pending = data.get("pending", [])
+            self._games = data.get("games", self._aggregates.total_games) - len(self._pending)
+            for entry in self._pending:
+                self._count_game(entry)
+            self._journal_generation = self._metadata.get("journal_generation", 0) + 1
+            self._journal_records = 0
+            self._replayed: List[Dict] = self._replay_journal()
+
+    def _catch_up_archive(self):
+        """Archive games the archive has not seen yet.
+
+        On first start this seeds it with the retained leaderboard; after a
+        crash it picks up replayed journal records that did not reach it.
+        """
+        last = self._archive.last_epoch
+        # Replayed records may already have left the retained entries
+        candidates = {id(entry): entry for entry in self._index.entries() + self._replayed}
+        missing = [entry for entry in candidates.values() if parse_timestamp(entry["timestamp"]) > last]
+        missing.sort(key=lambda entry: parse_timestamp(entry["timestamp"]))
+        if missing:
+            self._revision = self._writer.bump()
+            self._archive.extend(missing)
+
+    def _reload_recent(self):
+        """Load the newest games of the longest time window from the archive."""
+        self._recent.load(self._archive.recent(self._recent_horizon(), self._recent.max_entries))
+
+    @staticmethod
+    def _recent_horizon() -> float:
+        """Start of the longest time window, in epoch seconds."""
+        return (datetime.now() - max(TIME_WINDOWS.values())).timestamp()
+
+    def _views(self, time_filter: str) -> LeaderboardIndex:
+        """The index serving a time filter."""
+        if self._recent is not None and time_filter in TIME_WINDOWS:
+            return self._recent
+        return self._index
+
+    def _replay_journal(self) -> List[Dict]:
+        """Apply journal records written after the current snapshot; returns them."""
+        self._journal_offset = 0
+        if not os.path.exists(self.journal_file):
+            return []
+
+        with open(self.journal_file, 'rb') as f:
+            header = f.readline()
+            try:
+                generation = json.loads(header)["generation"]
+            except (json.JSONDecodeError, KeyError, TypeError):
+                print("Ignoring leaderboard journal without a valid header")
+                return []
+            # Already folded into the snapshot by a compaction that did not
+            # get to start the next generation
+            if generation < self._journal_generation:
+                return []
+
+            self._journal_offset = len(header)
+            return self._apply_journal_tail(f)
+
+    def _apply_journal_tail(self, f) -> List[Dict]:
+        """Apply the journal records from ``_journal_offset`` on; returns them."""
+        f.seek(self._journal_offset)
+        records = []
+        good_offset = self._journal_offset
+        for line in f:
+            try:
+                if not line.endswith(b"\n"):
+                    raise ValueError("missing newline")
+                record = json.loads(line)
+            except ValueError:
+                # A torn final write; everything before it is intact
+                print("Ignoring truncated leaderboard journal record")
+                break
+            self._apply(record)
+            records.append(record)
+            good_offset += len(line)
+        self._journal_records += len(records)
+        self._journal_offset = good_offset
+
+        # Drop any torn tail so new records start on a clean line
+        if os.fstat(f.fileno()).st_size != good_offset:
+            os.truncate(self.journal_file, good_offset)
+        return records
+
+    def _catch_up_journal(self) -> Optional[List[Dict]]:
+        """Apply records other processes appended to this journal generation.
+
+        Returns None if the journal was compacted meanwhile (or there is
+        none, in snapshot mode), so the snapshot has to be loaded again.
+        """
+        if self._journal is None:
+            return None
+        try:
+            f = open(self.journal_file, 'rb')
+        except FileNotFoundError:
+            return None
+        with f:
+            try:
+                generation = json.loads(f.readline())["generation"]
+            except (json.JSONDecodeError, KeyError, TypeError):
+                return None
+            if generation != self._journal_generation:
+                return None
+            return self._apply_journal_tail(f)
+
+    def _sync_locked(self) -> List[Dict]:
+        """Catch up with writes of other processes; call with both locks held.
+
+        Returns the games they added, as far as they are known, for the
+        listeners.
+        """
+        revision = self._writer.revision()
+        if revision == self._revision:
+            return []
+        with time_operation("leaderboard_sync"):
+            games = self._catch_up_journal()
+            if games is None:
+                self._load()
+                games = []
+                if self._journal is not None:
+                    self._journal.close()
+                    self._open_journal()
+            elif len(games) > SYNC_MAX_GAMES:
+                games = []
+            if self._archive is not None:
+                games = self._archive.read_since(self._archive_position)
+                if games is None or len(games) > SYNC_MAX_GAMES:
+                    # Merged away meanwhile, or too many to insert one by one
+                    self._reload_recent()
+                    games = []
+                else:
+                    for game in games:
+                        self._recent.add(game)
+                    self._recent.expire(self._recent_horizon())
+                self._archive_position = self._archive.position()
+            self._revision = revision
+            self._version += 1
+        return games
+
+    def refresh(self, blocking: bool = False) -> bool:
+        """Load what other processes wrote since the last look; returns whether anything changed.
+
+        Costs one ``pread`` of the lock file when nothing did. Unless
+        ``blocking``, a refresh that would wait for a writer (of this or
+        another process) is skipped and reads serve what is loaded, so
+        requests never wait on the lock; the sync thread catches up. A
+        blocking refresh waits for the cross-process lock before it takes
+        the in-process one, so readers are not held up meanwhile.
+        """
+        if self._writer.revision() == self._revision:
+            return False
+        if not self._writer.acquire(blocking):
+            return False
+        try:
+            if not self._lock.acquire(blocking):
+                return False
+            try:
+                games = self._sync_locked()
+            finally:
+                self._lock.release()
+        finally:
+            self._writer.release()
+        for game in games:
+            self._notify(game)
+        return True
+
+    @property
+    def version(self) -> int:
+        """Counter that increases whenever the leaderboard changes, in any process."""
+        self.refresh()
+        return self._version
+
+    def _sync_loop(self):
+        """Background thread picking up other processes' writes for the listeners."""
+        while not self._closed.wait(config.LEADERBOARD_SYNC_INTERVAL):
+            try:
+                self.refresh(blocking=True)
+            except Exception as e:
+                print(f"Error syncing leaderboard: {e}")
+
+    def _apply(self, entry_dict: Dict):
+        """Record an entry in the in-memory index and aggregates."""
+        self._index.add(entry_dict)
+        self._count_game(entry_dict)
+
+    def _count_game(self, entry_dict: Dict):
+        """Number a game and add it to the aggregates unless the saved ones covered it.
+
+        The number is also the game's ``id`` (journal records written before
+        ids were stored get it here, alike in every process).
+        """
+        self._games += 1
+        entry_dict.setdefault("id", self._games)
+        if self._games > self._aggregates.total_games:
+            self._aggregates.add(entry_dict)
+
+    def _snapshot_data(self) -> Dict:
+        """Everything persisted in leaderboard.json.
+
+        The aggregates grow with the number of players, so they are saved
+        separately, at checkpoints; until then the games they miss are kept
+        in ``pending`` (snapshot mode) or the journal.
+        """
+        return {
+            "entries": self._index.entries(),
+            "games": self._games,
+            "pending": self._pending,
+            "metadata": self._metadata
+        }
+
+    def _read_aggregates(self) -> Optional[LeaderboardAggregates]:
+        """Aggregates saved at the last checkpoint, or None."""
+        try:
+            with open(self.aggregates_file, 'r', encoding='utf-8') as f:
+                return LeaderboardAggregates.from_dict(json.load(f))
+        except FileNotFoundError:
+            return None
+        except (json.JSONDecodeError, KeyError, TypeError, ValueError) as e:
+            print(f"Error reading leaderboard aggregates: {e}")
+            return None
+
+    def _write_aggregates(self):
+        """Save the aggregates; call with the write lock held."""
+        with time_operation("leaderboard_aggregates_write"):
+            fd, temp_file = tempfile.mkstemp(dir=self.data_dir, prefix="leaderboard.", suffix=".tmp")
+            try:
+                os.chmod(temp_file, 0o644)
+                with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                    json.dump(self._aggregates.to_dict(), f, ensure_ascii=False)
+                os.replace(temp_file, self.aggregates_file)
+            except Exception:
+                os.remove(temp_file)
+                raise
+
+    def _open_journal(self):
+        """Open the journal for appending, starting a generation if needed."""
+        if self._journal_records == 0:
+            header = json.dumps({"generation": self._journal_generation}) + "\n"
+            with open(self.journal_file, 'w', encoding='utf-8') as f:
+                f.write(header)
+            self._journal_offset = len(header.encode("utf-8"))
+        self._journal = open(self.journal_file, 'a', encoding='utf-8')
+
+    def _append_journal(self, entry_dict: Dict):
+        """Append one submission to the journal."""
+        with time_operation("leaderboard_journal_append"):
+            line = json.dumps(entry_dict, ensure_ascii=False, default=str) + "\n"
+            self._journal.write(line)
+            self._journal.flush()
+            if config.LEADERBOARD_FSYNC:
+                os.fsync(self._journal.fileno())
+        self._journal_records += 1
+        self._journal_offset += len(line.encode("utf-8"))
+        if self._journal_records >= config.LEADERBOARD_COMPACT_THRESHOLD:
+            self._compact_requested.set()
+
+    def compact(self):
+        """Fold the journal into the snapshot and start a new generation."""
+        with self._writer, self._lock:
+            games = self._sync_locked()
+            if self._journal_records or self._pending:
+                self._checkpoint()
+        for game in games:
+            self._notify(game)
+
+    def _checkpoint(self):
+        """Write the snapshot and start a new journal generation; call with both locks held."""
+        self._revision = self._writer.bump()
+        self._metadata["journal_generation"] = self._journal_generation
+        with time_operation("leaderboard_compact"):
+            # Aggregates first: games they cover are skipped when a snapshot
+            # written before them is replayed
+            self._write_aggregates()
+            self._pending = []
+            self._write_data(self._snapshot_data())
+
+        self._journal_generation += 1
+        self._journal_records = 0
+        if self._journal is not None:
+            self._journal.close()
+            self._open_journal()
+        elif os.path.exists(self.journal_file):
+            os.remove(self.journal_file)
+
+    def _compaction_loop(self):
+        """Background thread compacting on an interval or when the journal is long."""
+        while not self._closed.is_set():
+            self._compact_requested.wait(config.LEADERBOARD_COMPACT_INTERVAL)
+            self._compact_requested.clear()
+            try:
+                self.compact()
+            except Exception as e:
+                print(f"Error compacting leaderboard journal: {e}")
+
+    def close(self):
+        """Stop background work and flush the journal into the snapshot."""
+        if self._closed.is_set():
+            return
+        self._closed.set()
+        self._syncer.join()
+        if self._compactor is not None:
+            self._compact_requested.set()
+            self._compactor.join()
+            self._compactor = None
+            self.compact()
+            self._journal.close()
+        if self._archive is not None:
+            self._archive.close()
+        self._writer.close()
+
     def _write_data(self, data: Dict):
-        """Write leaderboard data to file with backup."""
+        """Write leaderboard data to file with backup; call with the write lock held."""
+        temp_file = None
         try:
             # Create backup before writing
             if os.path.exists(self.leaderboard_file):
@@ -69,105 +537,161 @@ class LeaderboardDataService:
             # Update metadata
             data["metadata"]["last_updated"] = datetime.now().isoformat()
             
-            # Write to temporary file first, then rename (atomic operation)
-            temp_file = self.leaderboard_file + ".tmp"
-            with open(temp_file, 'w', encoding='utf-8') as f:
-                json.dump(data, f, indent=2, ensure_ascii=False, default=str)
-            
-            # Atomic rename
-            os.replace(temp_file, self.leaderboard_file)
+            # Write to a temporary file of our own first, then rename (atomic operation)
+            with time_operation("leaderboard_snapshot_write"):
+                fd, temp_file = tempfile.mkstemp(dir=self.data_dir, prefix="leaderboard.", suffix=".tmp")
+                os.chmod(temp_file, 0o644)
+                with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                    json.dump(data, f, ensure_ascii=False, default=str)
+
+                # Atomic rename
+                os.replace(temp_file, self.leaderboard_file)
             
         except Exception as e:
             print(f"Error writing leaderboard data: {e}")
             # Clean up temp file if it exists
-            if os.path.exists(temp_file):
+            if temp_file is not None and os.path.exists(temp_file):
                 os.remove(temp_file)
             raise
     
     def add_entry(self, entry: LeaderboardEntry) -> bool:
         """Add a new leaderboard entry."""
         try:
-            data = self._read_data()
-            
             # Convert entry to dict
             entry_dict = entry.dict()
             entry_dict["timestamp"] = entry.timestamp.isoformat()
-            
-            data["entries"].append(entry_dict)
-            
-            # Sort by score (descending) and then by completion time (ascending)
-            data["entries"].sort(key=lambda x: (-x["score"], x["completion_time"]))
-            
-            # Keep only top 1000 entries to prevent file from growing too large
-            data["entries"] = data["entries"][:1000]
-            
-            self._write_data(data)
+
+            with self._writer, self._lock:
+                games = self._sync_locked()
+                self._revision = self._writer.bump()
+                entry_dict["id"] = self._games + 1
+                if self.durability == "journal":
+                    self._append_journal(entry_dict)
+                    self._apply(entry_dict)
+                    self._version += 1
+                else:
+                    # The index keeps entries sorted by score (descending) and
+                    # then by completion time (ascending), and only the top
+                    # entries are kept to prevent the file from growing too large
+                    self._apply(entry_dict)
+                    self._pending.append(entry_dict)
+
+                    try:
+                        if len(self._pending) >= config.LEADERBOARD_COMPACT_THRESHOLD:
+                            self._checkpoint()
+                        else:
+                            self._write_data(self._snapshot_data())
+                    except Exception:
+                        # Keep memory consistent with what is on disk
+                        self._load()
+                        raise
+                    finally:
+                        self._version += 1
+
+                if self._archive is not None:
+                    self._recent.add(entry_dict)
+                    self._recent.expire(self._recent_horizon())
+                    try:
+                        self._archive.append(entry_dict)
+                    except Exception as e:
+                        print(f"Error archiving leaderboard entry: {e}")
+                    self._archive_position = self._archive.position()
+
+            for game in games:
+                self._notify(game)
+            self._notify(entry_dict)
             return True
             
         except Exception as e:
             print(f"Error adding leaderboard entry: {e}")
             return False
     
-    def _filter_entries_by_time(self, entries: List[Dict], time_filter: str) -> List[Dict]:
-        """Filter entries by time period."""
-        if time_filter == "all":
-            return entries
+    def bulk_import(self, entries: Iterable[Dict], batch_size: int = IMPORT_BATCH_SIZE) -> int:
+        """Ingest validated rows (as stored) in batches; returns the number ingested.
 
-        now = datetime.now()
-        cutoff_date = None
+        Each batch is committed under its own short hold of the locks, so
+        requests and other workers are served between batches: its rows go
+        to the aggregates and the archive (rows older than the archived
+        games are filed by timestamp, see ``LeaderboardArchive.import_entries``),
+        only those that make the top ``max_entries`` join the index, which is
+        sorted once per batch, and one checkpoint saves it. If a batch fails
+        the batches before it stay imported. Listeners are not called for
+        imported rows.
+        """
+        count = 0
+        entries = iter(entries)
+        while batch := list(islice(entries, batch_size)):
+            with self._writer, self._lock:
+                self._sync_locked()
+                self._revision = self._writer.bump()
+                try:
+                    for entry in batch:
+                        entry["id"] = self._games + 1
+                        self._count_game(entry)
+                    if self._archive is not None:
+                        self._archive.import_entries(batch)
+                        # The recent games are reloaded once, after the last batch
+                        self._archive_position = self._archive.position()
+                    self._index.load(heapq.nlargest(
+                        self._index.max_entries, self._index.entries() + batch,
+                        key=lambda entry: sort_key(entry, "score", 0)
+                    ))
+                    self._checkpoint()
+                except Exception:
+                    # Keep memory consistent with what is on disk
+                    self._load()
+                    raise
+                finally:
+                    self._version += 1
+            count += len(batch)
 
-        if time_filter == "daily":
-            cutoff_date = now - timedelta(days=1)
-        elif time_filter == "weekly":
-            cutoff_date = now - timedelta(weeks=1)
-        elif time_filter == "monthly":
-            cutoff_date = now - timedelta(days=30)
+        if count and self._archive is not None:
+            with self._writer, self._lock:
+                self._sync_locked()
+                self._reload_recent()
+                self._archive_position = self._archive.position()
+                self._version += 1
+        return count
 
-        if cutoff_date is None:
-            return entries
+    def iter_entries(self, since: Optional[float] = None, until: Optional[float] = None,
+                     username: Optional[str] = None) -> Iterator[Dict]:
+        """Stream recorded games, optionally from ``since`` to ``until`` (epoch seconds) and for one user.
 
-        filtered_entries = []
-        for entry in entries:
-            entry_date = entry["timestamp"]
-            if isinstance(entry_date, str):
-                entry_date = datetime.fromisoformat(entry_date)
-
-            if entry_date >= cutoff_date:
-                filtered_entries.append(entry)
-
-        return filtered_entries
-
-    def _sort_entries(self, entries: List[Dict], sort_by: str, sort_order: str) -> List[Dict]:
-        """Sort entries by specified criteria."""
-        reverse = sort_order == "desc"
-
-        if sort_by == "score":
-            return sorted(entries, key=lambda x: x["score"], reverse=reverse)
-        elif sort_by == "attempts":
-            return sorted(entries, key=lambda x: x["attempts"], reverse=reverse)
-        elif sort_by == "completion_time":
-            return sorted(entries, key=lambda x: x["completion_time"], reverse=reverse)
-        elif sort_by == "timestamp":
-            return sorted(entries, key=lambda x: x["timestamp"], reverse=reverse)
+        Reads the archive (oldest first) when it is enabled, otherwise the
+        retained entries in rank order.
+        """
+        username = username.lower() if username else None
+        self.refresh()
+        if self._archive is not None:
+            source = self._archive.iter_entries(since=since, until=until)
         else:
-            # Default to score descending
-            return sorted(entries, key=lambda x: x["score"], reverse=True)
+            with self._lock:
+                source = self._index.entries()
+        for entry in source:
+            if username is not None and entry["username"] != username:
+                continue
+            if self._archive is None and (since is not None or until is not None):
+                epoch = parse_timestamp(entry["timestamp"])
+                if (since is not None and epoch < since) or (until is not None and epoch > until):
+                    continue
+            yield entry
 
     def get_leaderboard(self, limit: int = 50, offset: int = 0, time_filter: str = "all",
-                       sort_by: str = "score", sort_order: str = "desc") -> List[Dict]:
+                       sort_by: str = "score", sort_order: str = "desc",
+                       after: Optional[Tuple] = None) -> List[Dict]:
         """Get leaderboard entries with pagination, filtering, and sorting."""
         try:
-            data = self._read_data()
-            entries = data["entries"]
-
-            # Apply time filter
-            entries = self._filter_entries_by_time(entries, time_filter)
-
-            # Apply sorting
-            entries = self._sort_entries(entries, sort_by, sort_order)
-
-            # Apply pagination
-            entries = entries[offset:offset + limit]
+            self.refresh()
+            # Windowed views slide forward on read, so they need the lock too
+            with self._lock, time_operation("leaderboard_page"):
+                entries = self._views(time_filter).page(
+                    sort_by=sort_by,
+                    sort_order=sort_order,
+                    offset=offset,
+                    limit=limit,
+                    time_filter=time_filter,
+                    after=after
+                )
 
             # Convert timestamp strings back to datetime objects for response
             for entry in entries:
@@ -180,50 +704,52 @@ class LeaderboardDataService:
             print(f"Error getting leaderboard: {e}")
             return []
     
+    def get_leaderboard_encoded(self, limit: int = 50, offset: int = 0, time_filter: str = "all",
+                                sort_by: str = "score", sort_order: str = "desc",
+                                after: Optional[Tuple] = None) -> List[bytes]:
+        """Same page as ``get_leaderboard``, with each entry already encoded as JSON."""
+        return self.get_leaderboard_page(limit, offset, time_filter, sort_by, sort_order, after)[0]
+
+    def get_leaderboard_page(self, limit: int = 50, offset: int = 0, time_filter: str = "all",
+                             sort_by: str = "score", sort_order: str = "desc",
+                             after: Optional[Tuple] = None) -> Tuple[List[bytes], Optional[Tuple]]:
+        """Encoded entries of a page and the sort key to continue after, or None on the last page.
+
+        ``after`` is such a key from the previous page (see ``leaderboard_cursor``);
+        it leaves out the process-local seq.
+        """
+        try:
+            self.refresh()
+            with self._lock, time_operation("leaderboard_page"):
+                views = self._views(time_filter)
+                keys = views.page_keys(
+                    sort_by=sort_by,
+                    sort_order=sort_order,
+                    offset=offset,
+                    limit=limit,
+                    time_filter=time_filter,
+                    after=after
+                )
+                return views.encoded(keys), (keys[-1][:-1] if len(keys) == limit else None)
+
+        except Exception as e:
+            print(f"Error getting leaderboard: {e}")
+            return [], None
+
     def get_user_stats(self, username: str) -> Dict:
-        """Get statistics for a specific user."""
+        """Get statistics for a specific user, across every recorded game."""
         try:
-            data = self._read_data()
-            user_entries = [entry for entry in data["entries"] if entry["username"] == username.lower()]
-            
-            if not user_entries:
-                return {
-                    "username": username,
-                    "total_games": 0,
-                    "best_score": 0,
-                    "average_score": 0.0,
-                    "total_words_completed": 0,
-                    "average_attempts": 0.0,
-                    "average_completion_time": 0.0
-                }
-            
-            total_games = len(user_entries)
-            best_score = max(entry["score"] for entry in user_entries)
-            average_score = sum(entry["score"] for entry in user_entries) / total_games
-            average_attempts = sum(entry["attempts"] for entry in user_entries) / total_games
-            average_completion_time = sum(entry["completion_time"] for entry in user_entries) / total_games
-            
-            return {
-                "username": username,
-                "total_games": total_games,
-                "best_score": best_score,
-                "average_score": round(average_score, 1),
-                "total_words_completed": total_games,
-                "average_attempts": round(average_attempts, 1),
-                "average_completion_time": round(average_completion_time, 1)
-            }
-            
+            self.refresh()
+            return self._aggregates.user_stats(username)
         except Exception as e:
             print(f"Error getting user stats: {e}")
             return {}
 
-
     def get_unique_users_count(self) -> int:
         """Get count of unique users who have played."""
         try:
-            data = self._read_data()
-            unique_users = set(entry["username"] for entry in data["entries"])
-            return len(unique_users)
+            self.refresh()
+            return len(self._aggregates.users)
         except Exception as e:
             print(f"Error getting unique users count: {e}")
             return 0
@@ -231,8 +757,8 @@ class LeaderboardDataService:
     def get_total_games(self) -> int:
         """Get total number of games played."""
         try:
-            data = self._read_data()
-            return len(data["entries"])
+            self.refresh()
+            return self._aggregates.total_games
         except Exception as e:
             print(f"Error getting total games: {e}")
             return 0
@@ -240,55 +766,94 @@ class LeaderboardDataService:
     def get_completion_stats(self) -> Dict:
         """Get completion statistics for community satisfaction."""
         try:
-            data = self._read_data()
-            if not data["entries"]:
-                return {"satisfaction_rate": 95}
-
-            # Calculate satisfaction based on average score and completion rate
-            total_entries = len(data["entries"])
-            high_score_entries = len([e for e in data["entries"] if e["score"] >= 80])
-            low_attempts_entries = len([e for e in data["entries"] if e["attempts"] <= 5])
-
-            # Simple satisfaction calculation
-            satisfaction_rate = min(95, max(85,
-                (high_score_entries / total_entries * 50) +
-                (low_attempts_entries / total_entries * 45) + 5
-            ))
-
-            return {
-                "satisfaction_rate": round(satisfaction_rate),
-                "total_entries": total_entries,
-                "high_score_rate": round(high_score_entries / total_entries * 100, 1)
-            }
+            self.refresh()
+            return self._aggregates.completion_stats()
         except Exception as e:
             print(f"Error getting completion stats: {e}")
             return {"satisfaction_rate": 95}
 
-    
     def get_user_rank(self, username: str, score: int) -> Optional[int]:
         """Get the rank of a user based on their score."""
         try:
-            data = self._read_data()
-            
+            self.refresh()
             # Count entries with higher scores
-            higher_scores = sum(1 for entry in data["entries"] if entry["score"] > score)
-            
-            return higher_scores + 1
+            return self._index.count_above(score) + 1
             
         except Exception as e:
             print(f"Error getting user rank: {e}")
             return None
     
-    def get_total_entries(self, time_filter: str = "all") -> int:
-        """Get total number of leaderboard entries with optional time filter."""
+    def get_entry_position(self, entry_dict: Dict) -> Optional[int]:
+        """1-based place of a recorded entry in the all-time score page, or
+        None once it has dropped out of the retained entries."""
         try:
-            data = self._read_data()
-            entries = data["entries"]
+            with self._lock:
+                return self._index.position_of(entry_dict)
+        except Exception as e:
+            print(f"Error getting entry position: {e}")
+            return None
+
+    def get_user_rank_details(self, username: str) -> Optional[Dict]:
+        """Ranks and percentile of a user's best retained entry, or None."""
+        try:
+            self.refresh()
+            with self._lock:
+                best = self._index.best_user_position(username.lower())
+                if best is None:
+                    return None
+                position, score = best
+                return rank_summary(
+                    username.lower(), score, position, self._index.count_above(score) + 1,
+                    self._index.dense_rank(score), len(self._index)
+                )
+        except Exception as e:
+            print(f"Error getting user rank: {e}")
+            return None
 
-            # Apply time filter
-            entries = self._filter_entries_by_time(entries, time_filter)
+    def get_rank_neighborhood(self, rank: int, radius: int = 5) -> List[Dict]:
+        """Entries ranked within ``radius`` places of ``rank``, with their ranks."""
+        try:
+            self.refresh()
+            start = max(1, rank - radius)
+            with self._lock:
+                entries = self._index.ranked_rows(start, rank + radius)
+                if not entries:
+                    return []
+                score = entries[0]["score"]
+                return annotate_ranks(entries, start, self._index.count_above(score) + 1,
+                                      self._index.dense_rank(score))
+        except Exception as e:
+            print(f"Error getting rank neighborhood: {e}")
+            return []
 
-            return len(entries)
+    def get_total_entries(self, time_filter: str = "all") -> int:
+        """Get total number of leaderboard entries with optional time filter."""
+        try:
+            self.refresh()
+            with self._lock:
+                return self._views(time_filter).count(time_filter=time_filter)
         except Exception as e:
             print(f"Error getting total entries: {e}")
             return 0
+
+    def get_user_history(self, username: str, limit: int = 50, offset: int = 0) -> List[Dict]:
+        """A user's games, newest first; from the archive when it is enabled."""
+        try:
+            self.refresh()
+            if self._archive is not None:
+                return self._archive.user_history(username.lower(), limit, offset)
+            with self._lock:
+                games = sorted(self._index.user_entries(username.lower()),
+                               key=lambda entry: parse_timestamp(entry["timestamp"]), reverse=True)
+                return [dict(entry) for entry in games[offset:offset + limit]]
+        except Exception as e:
+            print(f"Error getting user history: {e}")
+            return []
+
+
+def create_leaderboard_service():
+    """Build the leaderboard service selected by ``ORTHOPLAY_LEADERBOARD_BACKEND``."""
+    if config.LEADERBOARD_BACKEND == "sqlite":
+        from app.leaderboard_sqlite import SqliteLeaderboardService
+        return SqliteLeaderboardService()
+    return LeaderboardDataService()
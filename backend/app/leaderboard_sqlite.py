@@ -0,0 +1,565 @@
+"""SQLite storage backend for the leaderboard."""
+
+import argparse
+import json
+import os
+import sqlite3
+import threading
+from datetime import datetime
+from itertools import islice
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+from app import config
+from app.leaderboard_encoding import encode_entry
+from app.leaderboard_index import time_filter_cutoff
+from app.leaderboard_service import IMPORT_BATCH_SIZE, MAX_LEADERBOARD_ENTRIES, LeaderboardEvents
+from app.metrics import time_operation
+from app.rank_index import annotate_ranks, rank_summary
+from app.leaderboard_aggregates import HIGH_SCORE, LOW_ATTEMPTS, completion_stats_dict, user_stats_dict
+from app.models import LeaderboardEntry
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS entries (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    username TEXT NOT NULL,
+    word TEXT NOT NULL,
+    score INTEGER NOT NULL,
+    attempts INTEGER NOT NULL,
+    hints_used INTEGER NOT NULL,
+    completion_time REAL NOT NULL,
+    timestamp TEXT NOT NULL,
+    word_length INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_entries_rank ON entries (score DESC, completion_time);
+CREATE INDEX IF NOT EXISTS idx_entries_timestamp ON entries (timestamp);
+CREATE INDEX IF NOT EXISTS idx_entries_username ON entries (username);
+CREATE INDEX IF NOT EXISTS idx_entries_attempts ON entries (attempts, timestamp, username);
+CREATE INDEX IF NOT EXISTS idx_entries_completion_time ON entries (completion_time, timestamp, username);
+CREATE TABLE IF NOT EXISTS meta (
+    key TEXT PRIMARY KEY,
+    value TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS user_stats (
+    username TEXT PRIMARY KEY,
+    games INTEGER NOT NULL,
+    score_sum INTEGER NOT NULL,
+    best_score INTEGER NOT NULL,
+    attempts_sum INTEGER NOT NULL,
+    time_sum REAL NOT NULL
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS global_stats (
+    name TEXT PRIMARY KEY,
+    value INTEGER NOT NULL
+) WITHOUT ROWID;
+"""
+
+COLUMNS = ("username", "word", "score", "attempts", "hints_used", "completion_time", "timestamp", "word_length")
+
+# Canonical rank order: the descending score view, as in leaderboard_index.sort_key
+RANK_ORDER = "score DESC, completion_time ASC, timestamp DESC, username DESC, id DESC"
+
+# ORDER BY clauses matching the tie-breaking of LeaderboardIndex views
+ORDER_BY = {
+    ("score", "desc"): RANK_ORDER,
+    ("score", "asc"): "score ASC, completion_time DESC, timestamp ASC, username ASC, id ASC",
+}
+for _field in ("attempts", "completion_time", "timestamp"):
+    ORDER_BY[(_field, "desc")] = f"{_field} DESC, timestamp DESC, username DESC, id DESC"
+    ORDER_BY[(_field, "asc")] = f"{_field} ASC, timestamp ASC, username ASC, id ASC"
+
+
+def keyset_key(row: sqlite3.Row, sort_by: str) -> Tuple:
+    """Ascending sort key of a row in the ``ORDER_BY`` views, shaped like
+    ``leaderboard_index.sort_key`` with the row id in place of the seq."""
+    if sort_by == "score":
+        return (row["score"], -row["completion_time"], row["timestamp"], row["username"], row["id"])
+    return (row[sort_by], row["timestamp"], row["username"], row["id"])
+
+
+def keyset_clause(sort_by: str, sort_order: str, key: Tuple) -> Tuple[str, List]:
+    """WHERE clause (and parameters) selecting the rows after ``key`` in a view.
+
+    A row-value comparison lets SQLite seek the index matching the view.
+    The score view sorts completion_time the other way, so it is spelled
+    out, with a bound on score alone for the index seek.
+    """
+    op = "<" if sort_order == "desc" else ">"
+    if sort_by == "score":
+        score, neg_time, timestamp, username, row_id = key
+        time_op = ">" if sort_order == "desc" else "<"
+        return (
+            f"score {op}= ? AND (score {op} ? OR (score = ? AND (completion_time {time_op} ? OR "
+            f"(completion_time = ? AND (timestamp, username, id) {op} (?, ?, ?)))))",
+            [score, score, score, -neg_time, -neg_time, timestamp, username, row_id]
+        )
+    return f"({sort_by}, timestamp, username, id) {op} (?, ?, ?, ?)", list(key)
+
+# Rows fetched per query by ``iter_entries``
+EXPORT_BATCH_SIZE = 1000
+
+
+def default_db_path() -> str:
+    return config.LEADERBOARD_DB_PATH or os.path.join(os.path.dirname(__file__), "..", "data", "leaderboard.db")
+
+
+class SqliteLeaderboardService(LeaderboardEvents):
+    """Leaderboard service backed by a WAL-mode SQLite database.
+
+    Exposes the same methods as ``LeaderboardDataService``. Every worker
+    process opens its own connections to the shared database file, so any
+    worker can serve any request. On first use an empty database is seeded
+    from ``leaderboard.json``.
+
+    Per-user and global counters in ``user_stats``/``global_stats`` are
+    updated in the same transaction as each insert, so they cover pruned
+    entries too; they are rebuilt from ``entries`` if missing.
+    """
+
+    def __init__(self, db_path: Optional[str] = None, max_entries: Optional[int] = None,
+                 json_file: Optional[str] = None):
+        super().__init__()
+        self.db_path = db_path or default_db_path()
+        self.max_entries = max_entries or MAX_LEADERBOARD_ENTRIES
+        self.json_file = json_file or os.path.join(os.path.dirname(self.db_path), "leaderboard.json")
+        self._local = threading.local()
+
+        conn = self._conn()
+        conn.executescript(SCHEMA)
+        self._migrate_once()
+
+    def _conn(self) -> sqlite3.Connection:
+        """Per-thread connection; sqlite3 connections must not be shared."""
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.db_path, timeout=30, isolation_level=None)
+            conn.row_factory = sqlite3.Row
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    def close(self):
+        conn = getattr(self._local, "conn", None)
+        if conn is not None:
+            conn.close()
+            self._local.conn = None
+
+    def _migrate_once(self):
+        """Import leaderboard.json the first time the database is created."""
+        conn = self._conn()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            done = conn.execute("SELECT value FROM meta WHERE key = 'migrated_from_json'").fetchone()
+            if done is None:
+                count = 0
+                if os.path.exists(self.json_file):
+                    count = self._import_json(conn, self.json_file)
+                conn.execute(
+                    "INSERT INTO meta (key, value) VALUES ('migrated_from_json', ?)",
+                    (json.dumps({"entries": count, "at": datetime.now().isoformat()}),)
+                )
+            if conn.execute("SELECT value FROM meta WHERE key = 'aggregates'").fetchone() is None:
+                self._rebuild_aggregates(conn)
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+
+    def _rebuild_aggregates(self, conn: sqlite3.Connection):
+        """Recompute the counters from the retained entries."""
+        conn.execute("DELETE FROM user_stats")
+        conn.execute("DELETE FROM global_stats")
+        conn.execute(
+            "INSERT INTO user_stats "
+            "SELECT username, COUNT(*), SUM(score), MAX(score), SUM(attempts), SUM(completion_time) "
+            "FROM entries GROUP BY username"
+        )
+        conn.execute(
+            "INSERT INTO global_stats (name, value) "
+            "SELECT 'total_games', COUNT(*) FROM entries UNION ALL "
+            "SELECT 'high_score_games', COUNT(*) FROM entries WHERE score >= ? UNION ALL "
+            "SELECT 'low_attempt_games', COUNT(*) FROM entries WHERE attempts <= ?",
+            (HIGH_SCORE, LOW_ATTEMPTS)
+        )
+        conn.execute("INSERT OR REPLACE INTO meta (key, value) VALUES ('aggregates', '1')")
+
+    def _record_aggregates(self, conn: sqlite3.Connection, entry_dict: Dict):
+        conn.execute(
+            "INSERT INTO user_stats (username, games, score_sum, best_score, attempts_sum, time_sum) "
+            "VALUES (:username, 1, :score, :score, :attempts, :completion_time) "
+            "ON CONFLICT(username) DO UPDATE SET games = games + 1, score_sum = score_sum + excluded.score_sum, "
+            "best_score = MAX(best_score, excluded.best_score), attempts_sum = attempts_sum + excluded.attempts_sum, "
+            "time_sum = time_sum + excluded.time_sum",
+            entry_dict
+        )
+        conn.executemany(
+            "INSERT INTO global_stats (name, value) VALUES (?, 1) "
+            "ON CONFLICT(name) DO UPDATE SET value = value + 1",
+            [(name,) for name, counted in (
+                ("total_games", True),
+                ("high_score_games", entry_dict["score"] >= HIGH_SCORE),
+                ("low_attempt_games", entry_dict["attempts"] <= LOW_ATTEMPTS),
+            ) if counted]
+        )
+
+    def _global_stats(self) -> Dict[str, int]:
+        stats = {"total_games": 0, "high_score_games": 0, "low_attempt_games": 0}
+        stats.update(self._conn().execute("SELECT name, value FROM global_stats").fetchall())
+        return stats
+
+    def _import_json(self, conn: sqlite3.Connection, path: str) -> int:
+        with open(path, 'r', encoding='utf-8') as f:
+            entries = json.load(f).get("entries", [])
+        conn.executemany(
+            f"INSERT INTO entries ({', '.join(COLUMNS)}) VALUES ({', '.join('?' * len(COLUMNS))})",
+            ([entry[column] for column in COLUMNS] for entry in entries)
+        )
+        self._prune(conn)
+        return len(entries)
+
+    def _prune(self, conn: sqlite3.Connection):
+        """Keep only the top ``max_entries`` rows, like the JSON file."""
+        conn.execute(
+            "DELETE FROM entries WHERE id IN ("
+            f"SELECT id FROM entries ORDER BY {RANK_ORDER} LIMIT -1 OFFSET ?)",
+            (self.max_entries,)
+        )
+
+    @staticmethod
+    def _row_to_entry(row: sqlite3.Row) -> Dict:
+        entry = {column: row[column] for column in COLUMNS}
+        entry["timestamp"] = datetime.fromisoformat(entry["timestamp"])
+        return entry
+
+    @staticmethod
+    def _time_cutoff(time_filter: str) -> Optional[str]:
+        """Window start as an ISO string comparable with stored timestamps."""
+        cutoff = time_filter_cutoff(time_filter)
+        return None if cutoff is None else datetime.fromtimestamp(cutoff).isoformat()
+
+    def add_entry(self, entry: LeaderboardEntry) -> bool:
+        """Add a new leaderboard entry."""
+        conn = self._conn()
+        try:
+            entry_dict = entry.dict()
+            entry_dict["timestamp"] = entry.timestamp.isoformat()
+
+            with time_operation("leaderboard_write"):
+                conn.execute("BEGIN IMMEDIATE")
+                entry_dict["id"] = conn.execute(
+                    f"INSERT INTO entries ({', '.join(COLUMNS)}) VALUES ({', '.join('?' * len(COLUMNS))})",
+                    [entry_dict[column] for column in COLUMNS]
+                ).lastrowid
+                self._record_aggregates(conn, entry_dict)
+                self._prune(conn)
+                conn.execute(
+                    "INSERT INTO meta (key, value) VALUES ('version', 1) "
+                    "ON CONFLICT(key) DO UPDATE SET value = CAST(value AS INTEGER) + 1"
+                )
+                conn.execute("COMMIT")
+            self._notify(entry_dict)
+            return True
+
+        except Exception as e:
+            if conn.in_transaction:
+                conn.execute("ROLLBACK")
+            print(f"Error adding leaderboard entry: {e}")
+            return False
+
+    def bulk_import(self, entries: Iterable[Dict], batch_size: int = IMPORT_BATCH_SIZE) -> int:
+        """Ingest validated rows (as stored) in one transaction; returns the number ingested.
+
+        The secondary indexes on ``entries`` are dropped first and rebuilt
+        once at the end, the counters are updated with one grouped statement
+        over the new rows, and pruning runs once, instead of maintaining all
+        of them per row. Readers keep seeing the previous data until commit.
+        Listeners are not called for imported rows.
+        """
+        conn = self._conn()
+        count = 0
+        entries = iter(entries)
+        try:
+            conn.execute("BEGIN IMMEDIATE")
+            indexes = conn.execute(
+                "SELECT name, sql FROM sqlite_master WHERE type = 'index' AND tbl_name = 'entries' "
+                "AND sql IS NOT NULL"
+            ).fetchall()
+            for name, _ in indexes:
+                conn.execute(f"DROP INDEX {name}")
+            first_new = conn.execute("SELECT COALESCE(MAX(id), 0) FROM entries").fetchone()[0]
+
+            while batch := list(islice(entries, batch_size)):
+                conn.executemany(
+                    f"INSERT INTO entries ({', '.join(COLUMNS)}) VALUES ({', '.join('?' * len(COLUMNS))})",
+                    ([entry[column] for column in COLUMNS] for entry in batch)
+                )
+                count += len(batch)
+
+            conn.execute(
+                "INSERT INTO user_stats (username, games, score_sum, best_score, attempts_sum, time_sum) "
+                "SELECT username, COUNT(*), SUM(score), MAX(score), SUM(attempts), SUM(completion_time) "
+                "FROM entries WHERE id > ? GROUP BY username "
+                "ON CONFLICT(username) DO UPDATE SET games = games + excluded.games, "
+                "score_sum = score_sum + excluded.score_sum, best_score = MAX(best_score, excluded.best_score), "
+                "attempts_sum = attempts_sum + excluded.attempts_sum, time_sum = time_sum + excluded.time_sum",
+                (first_new,)
+            )
+            conn.execute(
+                "INSERT INTO global_stats (name, value) "
+                "SELECT 'total_games', COUNT(*) FROM entries WHERE id > ?1 UNION ALL "
+                "SELECT 'high_score_games', COUNT(*) FROM entries WHERE id > ?1 AND score >= ?2 UNION ALL "
+                "SELECT 'low_attempt_games', COUNT(*) FROM entries WHERE id > ?1 AND attempts <= ?3 "
+                "ON CONFLICT(name) DO UPDATE SET value = value + excluded.value",
+                (first_new, HIGH_SCORE, LOW_ATTEMPTS)
+            )
+            self._prune(conn)
+            for _, sql in indexes:
+                conn.execute(sql)
+            conn.execute(
+                "INSERT INTO meta (key, value) VALUES ('version', 1) "
+                "ON CONFLICT(key) DO UPDATE SET value = CAST(value AS INTEGER) + 1"
+            )
+            conn.execute("COMMIT")
+            return count
+
+        except Exception:
+            if conn.in_transaction:
+                conn.execute("ROLLBACK")
+            raise
+
+    def iter_entries(self, since: Optional[float] = None, until: Optional[float] = None,
+                     username: Optional[str] = None) -> Iterator[Dict]:
+        """Stream retained games in insertion order, optionally from ``since`` to
+        ``until`` (epoch seconds) and for one user.
+
+        Rows are fetched in batches keyed on ``id``, each on the calling
+        thread's connection, so the generator may be resumed from any thread.
+        """
+        where, params = ["id > ?"], []
+        if since is not None:
+            where.append("timestamp >= ?")
+            params.append(datetime.fromtimestamp(since).isoformat())
+        if until is not None:
+            where.append("timestamp <= ?")
+            params.append(datetime.fromtimestamp(until).isoformat())
+        if username:
+            where.append("username = ?")
+            params.append(username.lower())
+        last_id = 0
+        while True:
+            rows = self._conn().execute(
+                f"SELECT * FROM entries WHERE {' AND '.join(where)} ORDER BY id LIMIT ?",
+                [last_id] + params + [EXPORT_BATCH_SIZE]
+            ).fetchall()
+            for row in rows:
+                yield {column: row[column] for column in COLUMNS}
+            if len(rows) < EXPORT_BATCH_SIZE:
+                return
+            last_id = rows[-1]["id"]
+
+    @property
+    def version(self) -> int:
+        """Counter that increases with every entry, shared by all processes."""
+        row = self._conn().execute("SELECT CAST(value AS INTEGER) FROM meta WHERE key = 'version'").fetchone()
+        return row[0] if row else 0
+
+    def get_leaderboard(self, limit: int = 50, offset: int = 0, time_filter: str = "all",
+                        sort_by: str = "score", sort_order: str = "desc",
+                        after: Optional[Tuple] = None) -> List[Dict]:
+        """Get leaderboard entries with pagination, filtering, and sorting."""
+        try:
+            rows = self._page_rows(limit, offset, time_filter, sort_by, sort_order, after)
+            return [self._row_to_entry(row) for row in rows]
+
+        except Exception as e:
+            print(f"Error getting leaderboard: {e}")
+            return []
+
+    def get_leaderboard_encoded(self, limit: int = 50, offset: int = 0, time_filter: str = "all",
+                                sort_by: str = "score", sort_order: str = "desc",
+                                after: Optional[Tuple] = None) -> List[bytes]:
+        """Same page as ``get_leaderboard``, with each entry already encoded as JSON."""
+        return self.get_leaderboard_page(limit, offset, time_filter, sort_by, sort_order, after)[0]
+
+    def get_leaderboard_page(self, limit: int = 50, offset: int = 0, time_filter: str = "all",
+                             sort_by: str = "score", sort_order: str = "desc",
+                             after: Optional[Tuple] = None) -> Tuple[List[bytes], Optional[Tuple]]:
+        """Encoded entries of a page and the sort key to continue after, or None on the last page."""
+        try:
+            rows = self._page_rows(limit, offset, time_filter, sort_by, sort_order, after)
+            last = keyset_key(rows[-1], sort_by) if len(rows) == limit else None
+            return [encode_entry(row) for row in rows], last
+
+        except Exception as e:
+            print(f"Error getting leaderboard: {e}")
+            return [], None
+
+    def _page_rows(self, limit: int, offset: int, time_filter: str, sort_by: str,
+                   sort_order: str, after: Optional[Tuple] = None) -> List[sqlite3.Row]:
+        if (sort_by, sort_order) not in ORDER_BY:
+            sort_by, sort_order = "score", "desc"
+        cutoff = self._time_cutoff(time_filter)
+        where, params = [], []
+        if cutoff is not None:
+            where.append("timestamp >= ?")
+            params.append(cutoff)
+        if after is not None:
+            clause, clause_params = keyset_clause(sort_by, sort_order, after)
+            where.append(clause)
+            params.extend(clause_params)
+        where = f"WHERE {' AND '.join(where)}" if where else ""
+        with time_operation("leaderboard_page"):
+            return self._conn().execute(
+                f"SELECT * FROM entries {where} ORDER BY {ORDER_BY[(sort_by, sort_order)]} LIMIT ? OFFSET ?",
+                params + [limit, offset]
+            ).fetchall()
+
+    def get_user_stats(self, username: str) -> Dict:
+        """Get statistics for a specific user, across every recorded game."""
+        try:
+            row = self._conn().execute(
+                "SELECT games, best_score, score_sum, attempts_sum, time_sum FROM user_stats WHERE username = ?",
+                (username.lower(),)
+            ).fetchone()
+            return user_stats_dict(username, *(row or (0, 0, 0, 0, 0)))
+
+        except Exception as e:
+            print(f"Error getting user stats: {e}")
+            return {}
+
+    def get_unique_users_count(self) -> int:
+        """Get count of unique users who have played."""
+        try:
+            return self._conn().execute("SELECT COUNT(*) FROM user_stats").fetchone()[0]
+        except Exception as e:
+            print(f"Error getting unique users count: {e}")
+            return 0
+
+    def get_total_games(self) -> int:
+        """Get total number of games played."""
+        try:
+            return self._global_stats()["total_games"]
+        except Exception as e:
+            print(f"Error getting total games: {e}")
+            return 0
+
+    def get_completion_stats(self) -> Dict:
+        """Get completion statistics for community satisfaction."""
+        try:
+            stats = self._global_stats()
+            return completion_stats_dict(stats["total_games"], stats["high_score_games"], stats["low_attempt_games"])
+        except Exception as e:
+            print(f"Error getting completion stats: {e}")
+            return {"satisfaction_rate": 95}
+
+    def get_user_rank(self, username: str, score: int) -> Optional[int]:
+        """Get the rank of a user based on their score."""
+        try:
+            higher_scores = self._conn().execute(
+                "SELECT COUNT(*) FROM entries WHERE score > ?", (score,)
+            ).fetchone()[0]
+            return higher_scores + 1
+        except Exception as e:
+            print(f"Error getting user rank: {e}")
+            return None
+
+    def _rank_of(self, conn: sqlite3.Connection, row: sqlite3.Row) -> Dict[str, int]:
+        """Ordinal, competition and dense rank of a stored row."""
+        above, dense = conn.execute(
+            "SELECT COUNT(*), COUNT(DISTINCT score) FROM entries WHERE score > ?", (row["score"],)
+        ).fetchone()
+        # Rows ranked ahead are those after it in the ascending score view
+        clause, params = keyset_clause("score", "asc", keyset_key(row, "score"))
+        ahead = conn.execute(f"SELECT COUNT(*) FROM entries WHERE {clause}", params).fetchone()[0]
+        return {"position": ahead + 1, "competition_rank": above + 1, "dense_rank": dense + 1}
+
+    def get_entry_position(self, entry_dict: Dict) -> Optional[int]:
+        """1-based place of a recorded entry in the all-time score page, or
+        None once it has been pruned."""
+        try:
+            conn = self._conn()
+            row = conn.execute("SELECT * FROM entries WHERE id = ?", (entry_dict["id"],)).fetchone()
+            return None if row is None else self._rank_of(conn, row)["position"]
+        except Exception as e:
+            print(f"Error getting entry position: {e}")
+            return None
+
+    def get_user_rank_details(self, username: str) -> Optional[Dict]:
+        """Ranks and percentile of a user's best retained entry, or None."""
+        try:
+            conn = self._conn()
+            row = conn.execute(
+                f"SELECT * FROM entries WHERE username = ? ORDER BY {RANK_ORDER} LIMIT 1", (username.lower(),)
+            ).fetchone()
+            if row is None:
+                return None
+            ranks = self._rank_of(conn, row)
+            total = conn.execute("SELECT COUNT(*) FROM entries").fetchone()[0]
+            return rank_summary(
+                username.lower(), row["score"], ranks["position"], ranks["competition_rank"],
+                ranks["dense_rank"], total
+            )
+        except Exception as e:
+            print(f"Error getting user rank: {e}")
+            return None
+
+    def get_rank_neighborhood(self, rank: int, radius: int = 5) -> List[Dict]:
+        """Entries ranked within ``radius`` places of ``rank``, with their ranks."""
+        try:
+            conn = self._conn()
+            start = max(1, rank - radius)
+            rows = conn.execute(
+                f"SELECT * FROM entries ORDER BY {RANK_ORDER} LIMIT ? OFFSET ?",
+                (rank + radius - start + 1, start - 1)
+            ).fetchall()
+            if not rows:
+                return []
+            ranks = self._rank_of(conn, rows[0])
+            entries = [{column: row[column] for column in COLUMNS} for row in rows]
+            return annotate_ranks(entries, start, ranks["competition_rank"], ranks["dense_rank"])
+        except Exception as e:
+            print(f"Error getting rank neighborhood: {e}")
+            return []
+
+    def get_total_entries(self, time_filter: str = "all") -> int:
+        """Get total number of leaderboard entries with optional time filter."""
+        try:
+            cutoff = self._time_cutoff(time_filter)
+            if cutoff is None:
+                return self._conn().execute("SELECT COUNT(*) FROM entries").fetchone()[0]
+            return self._conn().execute(
+                "SELECT COUNT(*) FROM entries WHERE timestamp >= ?", (cutoff,)
+            ).fetchone()[0]
+        except Exception as e:
+            print(f"Error getting total entries: {e}")
+            return 0
+
+    def get_user_history(self, username: str, limit: int = 50, offset: int = 0) -> List[Dict]:
+        """A user's retained games, newest first."""
+        try:
+            rows = self._conn().execute(
+                "SELECT * FROM entries WHERE username = ? ORDER BY timestamp DESC, id DESC LIMIT ? OFFSET ?",
+                (username.lower(), limit, offset)
+            ).fetchall()
+            return [{column: row[column] for column in COLUMNS} for row in rows]
+        except Exception as e:
+            print(f"Error getting user history: {e}")
+            return []
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Leaderboard SQLite backend tools")
+    subcommands = parser.add_subparsers(dest="command", required=True)
+    migrate = subcommands.add_parser("migrate", help="create the database and import leaderboard.json")
+    migrate.add_argument("--db", default=None, help="database path (default: data/leaderboard.db)")
+    migrate.add_argument("--json", default=None, help="source leaderboard.json")
+    args = parser.parse_args()
+
+    if args.command == "migrate":
+        service = SqliteLeaderboardService(db_path=args.db, json_file=args.json)
+        status = service._conn().execute("SELECT value FROM meta WHERE key = 'migrated_from_json'").fetchone()
+        print(f"{service.db_path}: {service.get_total_entries()} entries (migration: {status[0]})")
+
+
+if __name__ == "__main__":
+    main()
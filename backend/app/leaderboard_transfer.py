@@ -0,0 +1,153 @@
+"""Streaming NDJSON export and bulk import of leaderboard games.
+
+One game per line, in the ``LeaderboardEntry`` shape. Export streams from
+the leaderboard service's ``iter_entries`` (the archive, or the retained
+rows of the SQLite database) so memory use does not depend on how much is
+exported. Import validates each line as a ``LeaderboardEntry`` and hands
+the valid rows to the service's ``bulk_import``, which ingests them in
+batches and rebuilds its indexes once.
+
+Usage (from the backend directory):
+    python -m app.leaderboard_transfer export [--since ISO] [--until ISO] [--username NAME] [-o FILE]
+    python -m app.leaderboard_transfer import FILE [FILE ...] [--batch-size N]
+
+``--backend json|sqlite`` overrides ``ORTHOPLAY_LEADERBOARD_BACKEND``, so
+exporting from one and importing into the other migrates between them.
+Running API workers pick up an import into the JSON backend (they hold
+their writes until it is done).
+"""
+
+import argparse
+import json
+import sys
+from datetime import datetime
+from typing import Dict, Iterable, Iterator, List
+
+from pydantic import ValidationError
+
+from app.leaderboard_encoding import encode_entry
+from app.leaderboard_service import IMPORT_BATCH_SIZE
+from app.models import LeaderboardEntry
+
+# Export lines are written in chunks of about this many bytes
+EXPORT_CHUNK_BYTES = 64 * 1024
+
+# Rejected lines reported individually by an import
+MAX_REPORTED_ERRORS = 20
+
+
+def ndjson_chunks(entries: Iterable[Dict], chunk_bytes: int = EXPORT_CHUNK_BYTES) -> Iterator[bytes]:
+    """Encode stored rows as NDJSON, a chunk of whole lines at a time."""
+    lines: List[bytes] = []
+    size = 0
+    for entry in entries:
+        line = encode_entry(entry) + b"\n"
+        lines.append(line)
+        size += len(line)
+        if size >= chunk_bytes:
+            yield b"".join(lines)
+            lines, size = [], 0
+    if lines:
+        yield b"".join(lines)
+
+
+class ImportReport:
+    """Counts and the first few errors of one import."""
+
+    def __init__(self):
+        self.imported = 0
+        self.rejected = 0
+        self.errors: List[str] = []
+
+    def reject(self, line_no: int, reason: str):
+        self.rejected += 1
+        if len(self.errors) < MAX_REPORTED_ERRORS:
+            self.errors.append(f"line {line_no}: {reason}")
+
+    def to_dict(self) -> Dict:
+        return {"imported": self.imported, "rejected": self.rejected, "errors": self.errors}
+
+
+def validated_entries(lines: Iterable, report: ImportReport) -> Iterator[Dict]:
+    """Rows (as stored) from NDJSON lines, recording invalid lines in ``report``."""
+    for line_no, line in enumerate(lines, 1):
+        if not line.strip():
+            continue
+        try:
+            entry = LeaderboardEntry(**json.loads(line))
+        except ValidationError as e:
+            error = e.errors()[0]
+            report.reject(line_no, f"{'.'.join(map(str, error['loc']))}: {error['msg']}")
+            continue
+        except (ValueError, TypeError) as e:
+            report.reject(line_no, str(e))
+            continue
+        entry_dict = entry.model_dump()
+        entry_dict["timestamp"] = entry.timestamp.isoformat()
+        yield entry_dict
+
+
+def import_ndjson(service, lines: Iterable, batch_size: int = IMPORT_BATCH_SIZE) -> ImportReport:
+    """Validate NDJSON lines and bulk import the valid ones into ``service``."""
+    report = ImportReport()
+    report.imported = service.bulk_import(validated_entries(lines, report), batch_size=batch_size)
+    return report
+
+
+def _epoch(value: str) -> float:
+    return datetime.fromisoformat(value).timestamp()
+
+
+def _open_service(backend: str):
+    if backend == "json":
+        from app.leaderboard_service import LeaderboardDataService
+        return LeaderboardDataService()
+    if backend == "sqlite":
+        from app.leaderboard_sqlite import SqliteLeaderboardService
+        return SqliteLeaderboardService()
+    from app.leaderboard_service import create_leaderboard_service
+    return create_leaderboard_service()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Export and import leaderboard games as NDJSON")
+    parser.add_argument("--backend", choices=("json", "sqlite"), default=None,
+                        help="storage backend (default: ORTHOPLAY_LEADERBOARD_BACKEND)")
+    subcommands = parser.add_subparsers(dest="command", required=True)
+    export = subcommands.add_parser("export", help="write games as NDJSON")
+    export.add_argument("--since", type=_epoch, default=None, help="only games at or after this ISO time")
+    export.add_argument("--until", type=_epoch, default=None, help="only games at or before this ISO time")
+    export.add_argument("--username", default=None, help="only this player's games")
+    export.add_argument("-o", "--output", default="-", help="output file (default: stdout)")
+    load = subcommands.add_parser("import", help="validate and ingest NDJSON games")
+    load.add_argument("files", nargs="+", help="NDJSON files ('-' for stdin)")
+    load.add_argument("--batch-size", type=int, default=IMPORT_BATCH_SIZE)
+    args = parser.parse_args()
+
+    service = _open_service(args.backend)
+    try:
+        if args.command == "export":
+            out = sys.stdout.buffer if args.output == "-" else open(args.output, 'wb')
+            try:
+                for chunk in ndjson_chunks(service.iter_entries(args.since, args.until, args.username)):
+                    out.write(chunk)
+            finally:
+                if out is not sys.stdout.buffer:
+                    out.close()
+        else:
+            for path in args.files:
+                f = sys.stdin if path == "-" else open(path, 'r', encoding='utf-8')
+                try:
+                    report = import_ndjson(service, f, batch_size=args.batch_size)
+                finally:
+                    if f is not sys.stdin:
+                        f.close()
+                print(f"{path}: imported {report.imported}, rejected {report.rejected}", file=sys.stderr)
+                for error in report.errors:
+                    print(f"  {error}", file=sys.stderr)
+    finally:
+        service.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -1,10 +1,33 @@
 """FastAPI application main entry point."""
 
+import time
+
+_import_started = time.perf_counter()
+
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
-from app.routes import router
+from app import config, routes
+from app.metrics import MetricsMiddleware
+from app.profiling import ProfilingMiddleware, profiling_enabled
+from app.startup import StartupReport
+
+startup_report = StartupReport()
+startup_report.record("imports", time.perf_counter() - _import_started)
 
-app = FastAPI(title="Orthoplay API", version="1.0.0")
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Build the services, and run background maintenance while serving."""
+    routes.init_services(startup_report)
+    routes.game_service.game_sessions.start_sweeper()
+    print(startup_report.summary())
+    yield
+    routes.close_services()
+
+
+app = FastAPI(title="Orthoplay API", version="1.0.0", lifespan=lifespan)
 
 # CORS middleware
 app.add_middleware(
@@ -15,5 +38,10 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+if config.METRICS_ENABLED:
+    app.add_middleware(MetricsMiddleware)
+if profiling_enabled():
+    app.add_middleware(ProfilingMiddleware)
+
 # Include routes
-app.include_router(router)
+app.include_router(routes.router)
@@ -0,0 +1,236 @@
+"""Process metrics in the Prometheus text exposition format.
+
+A small dependency-free registry: counters and histograms are updated in
+place (one lock acquisition and a bisect per observation), and gauges are
+callbacks evaluated only when ``/metrics`` is scraped, so instrumentation is
+cheap enough to leave on.
+"""
+
+import bisect
+import threading
+import time
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+# Seconds; covers in-memory reads through slow LLM calls
+DEFAULT_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+
+def _escape(value: str) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _labels(names: Sequence[str], values: Sequence[str], extra: str = "") -> str:
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _number(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class Counter:
+    """Monotonic count per label set."""
+
+    def __init__(self, name: str, help: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.help = help
+        self.labelnames = tuple(labelnames)
+        self._values: Dict[Tuple[str, ...], float] = {}
+        self._lock = threading.Lock()
+
+    def inc(self, *labels: str, amount: float = 1):
+        with self._lock:
+            self._values[labels] = self._values.get(labels, 0) + amount
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} counter"]
+        with self._lock:
+            items = sorted(self._values.items())
+        for labels, value in items:
+            lines.append(f"{self.name}{_labels(self.labelnames, labels)} {_number(value)}")
+        return lines
+
+
+class Histogram:
+    """Bucketed observations, with sum and count, per label set."""
+
+    def __init__(self, name: str, help: str, labelnames: Sequence[str] = (),
+                 buckets: Sequence[float] = DEFAULT_BUCKETS):
+        self.name = name
+        self.help = help
+        self.labelnames = tuple(labelnames)
+        self.buckets = tuple(sorted(buckets))
+        # labels -> [per-bucket counts..., +Inf count], sum
+        self._series: Dict[Tuple[str, ...], Tuple[List[int], List[float]]] = {}
+        self._lock = threading.Lock()
+
+    def observe(self, value: float, *labels: str):
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._series.get(labels)
+            if series is None:
+                series = self._series[labels] = ([0] * (len(self.buckets) + 1), [0.0])
+            series[0][index] += 1
+            series[1][0] += value
+
+    def time(self, *labels: str) -> "_Timer":
+        """Context manager observing the duration of the enclosed block."""
+        return _Timer(self, labels)
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} histogram"]
+        with self._lock:
+            items = sorted((labels, (list(counts), total[0])) for labels, (counts, total) in self._series.items())
+        for labels, (counts, total) in items:
+            cumulative = 0
+            for bound, count in zip(self.buckets + (float("inf"),), counts):
+                cumulative += count
+                le = f'le="{_number(bound)}"'
+                lines.append(f"{self.name}_bucket{_labels(self.labelnames, labels, le)} {cumulative}")
+            lines.append(f"{self.name}_sum{_labels(self.labelnames, labels)} {_number(total)}")
+            lines.append(f"{self.name}_count{_labels(self.labelnames, labels)} {cumulative}")
+        return lines
+
+
+class _Timer:
+    # A plain class rather than @contextmanager: roughly half the overhead
+    __slots__ = ("histogram", "labels", "start")
+
+    def __init__(self, histogram: Histogram, labels: Tuple[str, ...]):
+        self.histogram = histogram
+        self.labels = labels
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.histogram.observe(time.perf_counter() - self.start, *self.labels)
+
+
+class Gauge:
+    """Value read from a callback at scrape time."""
+
+    def __init__(self, name: str, help: str, callback: Callable[[], float]):
+        self.name = name
+        self.help = help
+        self.callback = callback
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} gauge"]
+        try:
+            lines.append(f"{self.name} {_number(self.callback())}")
+        except Exception as e:
+            print(f"Error reading gauge {self.name}: {e}")
+        return lines
+
+
+class Registry:
+    """Metrics rendered together on ``/metrics``."""
+
+    def __init__(self):
+        self._metrics: Dict[str, object] = {}
+        self._lock = threading.Lock()
+
+    def register(self, metric):
+        with self._lock:
+            self._metrics[metric.name] = metric
+        return metric
+
+    def gauge(self, name: str, help: str, callback: Callable[[], float]) -> Gauge:
+        """Register (or replace) a callback gauge."""
+        return self.register(Gauge(name, help, callback))
+
+    def render(self) -> str:
+        with self._lock:
+            metrics = list(self._metrics.values())
+        lines = []
+        for metric in metrics:
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+
+REGISTRY = Registry()
+
+HTTP_REQUESTS = REGISTRY.register(Counter(
+    "orthoplay_http_requests_total", "HTTP requests by route template and status.",
+    ("method", "route", "status"),
+))
+HTTP_LATENCY = REGISTRY.register(Histogram(
+    "orthoplay_http_request_duration_seconds", "HTTP request latency by route template.",
+    ("method", "route"),
+))
+OPERATION_LATENCY = REGISTRY.register(Histogram(
+    "orthoplay_operation_duration_seconds",
+    "Latency of storage, dataset, serialization and model-call operations.",
+    ("operation",),
+))
+
+
+def time_operation(operation: str):
+    """Context manager recording the enclosed block under ``operation``."""
+    return OPERATION_LATENCY.time(operation)
+
+
+class MetricsMiddleware:
+    """ASGI middleware counting and timing HTTP requests per route template.
+
+    The route template (e.g. ``/game/stats/{word_id}``) is read from the
+    scope after routing, so label cardinality stays bounded; requests that
+    match no route are labelled ``unmatched``.
+    """
+
+    def __init__(self, app, exclude: Sequence[str] = ("/metrics",)):
+        self.app = app
+        self.exclude = frozenset(exclude)
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or scope["path"] in self.exclude:
+            await self.app(scope, receive, send)
+            return
+
+        status = 500
+        start = time.perf_counter()
+
+        async def send_wrapper(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            route = scope.get("route")
+            template = getattr(route, "path", None) or "unmatched"
+            HTTP_LATENCY.observe(time.perf_counter() - start, scope["method"], template)
+            HTTP_REQUESTS.inc(scope["method"], template, str(status))
+
+
+def register_service_gauges(game_service=None, leaderboard_service=None, response_cache=None,
+                            chat_gateway=None, app_stats=None, registry: Optional[Registry] = None):
+    """Gauges over the live services, evaluated at scrape time."""
+    registry = registry or REGISTRY
+    if game_service is not None:
+        registry.gauge("orthoplay_live_sessions", "Game sessions currently held.",
+                       lambda: len(game_service.game_sessions))
+    if leaderboard_service is not None:
+        registry.gauge("orthoplay_leaderboard_entries", "Entries on the retained leaderboard.",
+                       leaderboard_service.get_total_entries)
+        registry.gauge("orthoplay_leaderboard_version", "Leaderboard change counter.",
+                       lambda: leaderboard_service.version)
+    if response_cache is not None:
+        registry.gauge("orthoplay_response_cache_bytes", "Bytes held by the response cache.",
+                       lambda: response_cache.stats()["bytes"])
+    if chat_gateway is not None:
+        registry.gauge("orthoplay_chat_waiting", "Chat calls waiting for a slot.",
+                       lambda: chat_gateway.stats()["waiting"])
+    if app_stats is not None:
+        registry.gauge("orthoplay_app_stats_recomputes", "Times the /app/stats snapshot was computed.",
+                       lambda: app_stats.counters()["recomputes"])
+        registry.gauge("orthoplay_app_stats_hits", "Snapshot reads that reused the /app/stats payload.",
+                       lambda: app_stats.counters()["hits"])
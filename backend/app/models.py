@@ -6,8 +6,11 @@ from datetime import datetime
 
 
 class GameStartRequest(BaseModel):
-    difficulty: Optional[str] = "medium"
+    # None (the default) draws from every difficulty
+    difficulty: Optional[str] = None
     mode: Optional[str] = "playing"
+    word_length: Optional[int] = Field(None, ge=3)
+    username: Optional[str] = Field(None, max_length=20)
 
 
 class GameStartResponse(BaseModel):
@@ -98,6 +101,7 @@ class LeaderboardResponse(BaseModel):
     total_entries: int
     user_rank: Optional[int] = None
     user_best_score: Optional[int] = None
+    next_cursor: Optional[str] = None
 
 
 class UserStatsResponse(BaseModel):
@@ -108,3 +112,30 @@ class UserStatsResponse(BaseModel):
     total_words_completed: int
     average_attempts: float
     average_completion_time: float
+
+
+class RankedLeaderboardEntry(LeaderboardEntry):
+    rank: int
+    competition_rank: int
+    dense_rank: int
+
+
+class RankNeighborhoodResponse(BaseModel):
+    rank: int
+    total_entries: int
+    entries: List[RankedLeaderboardEntry]
+
+
+class UserRankResponse(BaseModel):
+    username: str
+    best_score: int
+    rank: int
+    competition_rank: int
+    dense_rank: int
+    total_entries: int
+    percentile: float
+
+
+class UserHistoryResponse(BaseModel):
+    username: str
+    entries: List[LeaderboardEntry]
@@ -0,0 +1,136 @@
+"""Opt-in cProfile capture of individual requests.
+
+A request is profiled when it carries the configured token, in the
+``X-Orthoplay-Profile`` header or the ``profile`` query parameter, or when
+it is picked by the sample rate. Its profile is written as a ``.prof`` file
+(``python -m pstats``, snakeviz or flameprof read it), and the file name is
+returned in the ``X-Orthoplay-Profile-File`` response header.
+
+The middleware is only installed when a token or a sample rate is
+configured, so requests cost nothing extra otherwise.
+"""
+
+import cProfile
+import hmac
+import os
+import random
+import re
+import threading
+import time
+from typing import Optional
+from urllib.parse import parse_qs
+
+from app import config
+
+PROFILE_HEADER = b"x-orthoplay-profile"
+PROFILE_FILE_HEADER = b"x-orthoplay-profile-file"
+PROFILE_QUERY_PARAM = "profile"
+
+
+def default_profile_dir() -> str:
+    return config.PROFILE_DIR or os.path.join(os.path.dirname(__file__), "..", "data", "profiles")
+
+
+def profiling_enabled() -> bool:
+    return bool(config.PROFILE_TOKEN) or config.PROFILE_SAMPLE_RATE > 0
+
+
+class ProfileStore:
+    """Directory of ``.prof`` files, trimmed oldest-first to a total size."""
+
+    def __init__(self, directory: Optional[str] = None, max_bytes: Optional[int] = None):
+        self.directory = directory or default_profile_dir()
+        self.max_bytes = max_bytes if max_bytes is not None else config.PROFILE_MAX_BYTES
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def file_name(method: str, path: str) -> str:
+        slug = re.sub(r"[^A-Za-z0-9]+", "_", path).strip("_")[:60] or "root"
+        stamp = time.strftime("%Y%m%d-%H%M%S")
+        return f"{stamp}-{os.urandom(3).hex()}-{method.lower()}-{slug}.prof"
+
+    def save(self, profiler: cProfile.Profile, name: str):
+        """Write one profile, then rotate."""
+        try:
+            os.makedirs(self.directory, exist_ok=True)
+            path = os.path.join(self.directory, name)
+            profiler.dump_stats(path + ".tmp")
+            os.replace(path + ".tmp", path)
+            self.rotate()
+        except Exception as e:
+            print(f"Error saving request profile: {e}")
+
+    def rotate(self):
+        """Delete the oldest profiles until the directory fits ``max_bytes``."""
+        with self._lock:
+            files = []
+            for entry in os.scandir(self.directory):
+                if entry.name.endswith(".prof"):
+                    stat = entry.stat()
+                    files.append((stat.st_mtime, stat.st_size, entry.path))
+            total = sum(size for _, size, _ in files)
+            for _, size, path in sorted(files):
+                if total <= self.max_bytes:
+                    break
+                os.remove(path)
+                total -= size
+
+
+class ProfilingMiddleware:
+    """ASGI middleware running opted-in requests under cProfile.
+
+    cProfile traces the event-loop thread, so a profile also contains
+    whatever other requests ran on the loop meanwhile, and work handed to
+    threads (sync endpoints, the chat gateway) only shows up as the await.
+    One request is profiled at a time; others that opt in while a profile
+    is running are served unprofiled.
+    """
+
+    def __init__(self, app, token: Optional[str] = None, sample_rate: Optional[float] = None,
+                 store: Optional[ProfileStore] = None):
+        self.app = app
+        self.token = (token if token is not None else config.PROFILE_TOKEN).encode()
+        self.sample_rate = sample_rate if sample_rate is not None else config.PROFILE_SAMPLE_RATE
+        self.store = store or ProfileStore()
+        self._active = threading.Lock()
+
+    def _requested(self, scope) -> bool:
+        if self.token:
+            for name, value in scope["headers"]:
+                if name == PROFILE_HEADER:
+                    return hmac.compare_digest(value, self.token)
+            query = scope.get("query_string", b"")
+            if PROFILE_QUERY_PARAM.encode() in query:
+                values = parse_qs(query.decode("latin-1")).get(PROFILE_QUERY_PARAM, [])
+                return any(hmac.compare_digest(value.encode(), self.token) for value in values)
+        return False
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or not (
+            self._requested(scope) or (self.sample_rate > 0 and random.random() < self.sample_rate)
+        ):
+            await self.app(scope, receive, send)
+            return
+        if not self._active.acquire(blocking=False):
+            await self.app(scope, receive, send)
+            return
+
+        name = ProfileStore.file_name(scope["method"], scope["path"])
+
+        async def send_wrapper(message):
+            if message["type"] == "http.response.start":
+                headers = list(message.get("headers", []))
+                headers.append((PROFILE_FILE_HEADER, name.encode()))
+                message = {**message, "headers": headers}
+            await send(message)
+
+        profiler = cProfile.Profile()
+        try:
+            profiler.enable()
+            try:
+                await self.app(scope, receive, send_wrapper)
+            finally:
+                profiler.disable()
+        finally:
+            self._active.release()
+        self.store.save(profiler, name)
@@ -0,0 +1,220 @@
+"""Order-statistic index over leaderboard scores.
+
+Entries are counted per integer score in two Fenwick (binary indexed)
+trees, one holding the number of entries with each score and one holding
+1 for every score in use. The trees grow with the largest score up to
+``DENSE_SCORE_LIMIT`` slots; the rare scores beyond that are kept in sorted
+lists instead, so memory stays bounded however large a submitted score is.
+Entries sharing a score are kept in a small sorted list of tie-break keys,
+so:
+
+- competition rank (ties share a rank, the next rank is skipped),
+- dense rank (ties share a rank, no ranks are skipped),
+- ordinal position (ties broken by the tie-break keys, highest first), and
+- the entry at a given position
+
+are all answered in O(log n) (plus a bisect inside one score's ties).
+"""
+
+import bisect
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+TieKey = Tuple  # (-completion_time, timestamp, username, seq), see leaderboard_index.tie_key
+
+# Initial score capacity; the trees double whenever a larger score arrives
+INITIAL_SCORE_CAPACITY = 4096
+# Scores at or above this are ranked through sorted lists, not the trees
+DENSE_SCORE_LIMIT = 1 << 16
+
+
+def percentile(position: int, total: int) -> float:
+    """Share of entries (in %) ranked at or below a 1-based position."""
+    return round(100.0 * (total - position + 1) / total, 2) if total else 0.0
+
+
+def annotate_ranks(rows: List[Dict], position: int, competition_rank: int, dense_rank: int) -> List[Dict]:
+    """Add ``rank``, ``competition_rank`` and ``dense_rank`` to consecutive rows.
+
+    ``rows`` are in canonical order and the arguments describe the first one;
+    the ranks of the rest follow from comparing neighbouring scores.
+    """
+    previous = None
+    for row in rows:
+        if previous is not None and row["score"] != previous:
+            competition_rank = position
+            dense_rank += 1
+        row["rank"], row["competition_rank"], row["dense_rank"] = position, competition_rank, dense_rank
+        previous = row["score"]
+        position += 1
+    return rows
+
+
+def rank_summary(username: str, score: int, position: int, competition_rank: int, dense_rank: int,
+                 total: int) -> Dict:
+    """Where a user's best entry stands, as served by the rank endpoint."""
+    return {
+        "username": username,
+        "best_score": score,
+        "rank": position,
+        "competition_rank": competition_rank,
+        "dense_rank": dense_rank,
+        "total_entries": total,
+        "percentile": percentile(position, total),
+    }
+
+
+class FenwickTree:
+    """Prefix sums over ``size`` integer slots with point updates."""
+
+    __slots__ = ("_tree",)
+
+    def __init__(self, size: int, values: Optional[Dict[int, int]] = None):
+        tree = [0] * (size + 1)
+        for index, value in (values or {}).items():
+            tree[index + 1] += value
+        # Linear-time construction: push each node into its parent
+        for i in range(1, size + 1):
+            parent = i + (i & -i)
+            if parent <= size:
+                tree[parent] += tree[i]
+        self._tree = tree
+
+    @property
+    def size(self) -> int:
+        return len(self._tree) - 1
+
+    def add(self, index: int, delta: int):
+        tree = self._tree
+        i = index + 1
+        while i < len(tree):
+            tree[i] += delta
+            i += i & -i
+
+    def prefix(self, end: int) -> int:
+        """Sum of slots ``[0, end)``."""
+        tree = self._tree
+        i = min(end, len(tree) - 1)
+        total = 0
+        while i > 0:
+            total += tree[i]
+            i -= i & -i
+        return total
+
+    def find(self, k: int) -> int:
+        """Smallest slot whose prefix sum (inclusive) reaches ``k`` (1-based)."""
+        tree = self._tree
+        pos = 0
+        step = 1 << (len(tree) - 1).bit_length()
+        while step:
+            nxt = pos + step
+            if nxt < len(tree) and tree[nxt] < k:
+                pos = nxt
+                k -= tree[nxt]
+            step >>= 1
+        return pos
+
+
+class ScoreRankIndex:
+    """Ranks of entries ordered by ``(score, tie_key)`` descending."""
+
+    def __init__(self, capacity: int = INITIAL_SCORE_CAPACITY):
+        self._ties: Dict[int, List[TieKey]] = {}
+        self._counts = FenwickTree(capacity)
+        self._distinct = FenwickTree(capacity)
+        # Scores >= DENSE_SCORE_LIMIT: one item per entry, and one per score
+        self._high: List[int] = []
+        self._high_scores: List[int] = []
+        self._total = 0
+
+    def __len__(self) -> int:
+        return self._total
+
+    def load(self, items: Iterable[Tuple[int, TieKey]]):
+        """Replace the contents with ``(score, tie_key)`` pairs."""
+        ties: Dict[int, List[TieKey]] = {}
+        for score, key in items:
+            ties.setdefault(score, []).append(key)
+        for keys in ties.values():
+            keys.sort()
+        self._ties = ties
+        self._total = sum(len(keys) for keys in ties.values())
+        self._high_scores = sorted(score for score in ties if score >= DENSE_SCORE_LIMIT)
+        self._high = [score for score in self._high_scores for _ in ties[score]]
+        dense_max = max((score for score in ties if score < DENSE_SCORE_LIMIT), default=0)
+        self._rebuild(max(INITIAL_SCORE_CAPACITY, dense_max + 1))
+
+    def _rebuild(self, capacity: int):
+        dense = {score: keys for score, keys in self._ties.items() if score < DENSE_SCORE_LIMIT}
+        self._counts = FenwickTree(capacity, {score: len(keys) for score, keys in dense.items()})
+        self._distinct = FenwickTree(capacity, {score: 1 for score in dense})
+
+    def add(self, score: int, key: TieKey):
+        if score >= DENSE_SCORE_LIMIT:
+            if score not in self._ties:
+                bisect.insort(self._high_scores, score)
+            bisect.insort(self._high, score)
+        elif score >= self._counts.size:
+            self._rebuild(min(DENSE_SCORE_LIMIT, max(score + 1, self._counts.size * 2)))
+        keys = self._ties.get(score)
+        if keys is None:
+            keys = self._ties[score] = []
+            if score < DENSE_SCORE_LIMIT:
+                self._distinct.add(score, 1)
+        bisect.insort(keys, key)
+        if score < DENSE_SCORE_LIMIT:
+            self._counts.add(score, 1)
+        self._total += 1
+
+    def remove(self, score: int, key: TieKey):
+        keys = self._ties[score]
+        del keys[bisect.bisect_left(keys, key)]
+        self._total -= 1
+        if not keys:
+            del self._ties[score]
+        if score >= DENSE_SCORE_LIMIT:
+            del self._high[bisect.bisect_left(self._high, score)]
+            if not keys:
+                del self._high_scores[bisect.bisect_left(self._high_scores, score)]
+            return
+        self._counts.add(score, -1)
+        if not keys:
+            self._distinct.add(score, -1)
+
+    def count_above(self, score: int) -> int:
+        """Number of entries with a strictly higher score."""
+        if score >= DENSE_SCORE_LIMIT:
+            return len(self._high) - bisect.bisect_right(self._high, score)
+        return self._total - self._counts.prefix(score + 1)
+
+    def competition_rank(self, score: int) -> int:
+        """1 + entries with a higher score ("1224" ranking)."""
+        return self.count_above(score) + 1
+
+    def dense_rank(self, score: int) -> int:
+        """1 + distinct higher scores ("1223" ranking)."""
+        if score >= DENSE_SCORE_LIMIT:
+            return len(self._high_scores) - bisect.bisect_right(self._high_scores, score) + 1
+        return len(self._ties) - self._distinct.prefix(score + 1) + 1
+
+    def position(self, score: int, key: TieKey) -> int:
+        """1-based ordinal position of a stored entry, ties broken by ``key``."""
+        keys = self._ties[score]
+        return self.count_above(score) + len(keys) - bisect.bisect_right(keys, key) + 1
+
+    def at(self, position: int) -> Tuple[int, TieKey]:
+        """``(score, tie_key)`` of the entry at a 1-based ordinal position."""
+        total = len(self)
+        if not 1 <= position <= total:
+            raise IndexError(position)
+        if position <= len(self._high):
+            score = self._high[-position]
+        else:
+            # Positions count from the highest score; the tree counts from the lowest
+            score = self._counts.find(total - position + 1)
+        return score, self._ties[score][self.count_above(score) - position]
+
+    def ranked(self) -> Iterator[Tuple[int, TieKey]]:
+        """Every ``(score, tie_key)`` in rank order."""
+        for score in sorted(self._ties, reverse=True):
+            for key in reversed(self._ties[score]):
+                yield score, key
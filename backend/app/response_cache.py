@@ -0,0 +1,111 @@
+"""Cache of serialized read responses, validated by the leaderboard version."""
+
+import hashlib
+import time
+from collections import OrderedDict
+from typing import Callable, Dict, Hashable, Optional, Tuple
+
+from fastapi import Request, Response
+
+from app import config
+
+
+class _CachedBody:
+    __slots__ = ("body", "etag", "version", "expires_at")
+
+    def __init__(self, body: bytes, etag: str, version: int, expires_at: Optional[float]):
+        self.body = body
+        self.etag = etag
+        self.version = version
+        self.expires_at = expires_at
+
+
+def _etag_matches(header: Optional[str], etag: str) -> bool:
+    if not header:
+        return False
+    if header.strip() == "*":
+        return True
+    return any(candidate.strip().removeprefix("W/") == etag for candidate in header.split(","))
+
+
+class ResponseCache:
+    """LRU of JSON response bodies keyed on route and normalized parameters.
+
+    An entry is valid only for the leaderboard ``version`` it was built
+    from, so a score submission invalidates everything at once without
+    touching the cache. Responses that also change with the clock (rolling
+    windows, stats) take a ``max_age``. The total size of cached bodies is
+    bounded by ``max_bytes``. Every response carries an ``ETag``, a hash of
+    the body, and a matching ``If-None-Match`` gets a bodiless 304 from any
+    worker.
+    """
+
+    def __init__(self, max_bytes: Optional[int] = None):
+        self.max_bytes = max_bytes if max_bytes is not None else config.RESPONSE_CACHE_MAX_BYTES
+        self._entries: "OrderedDict[Hashable, _CachedBody]" = OrderedDict()
+        self._bytes = 0
+        self._counters = {"hits": 0, "misses": 0, "evictions": 0, "not_modified": 0}
+
+    @staticmethod
+    def key(route: str, **params) -> Tuple:
+        """Cache key for a route and its query parameters."""
+        return (route,) + tuple(sorted(params.items()))
+
+    def _drop(self, key: Hashable):
+        cached = self._entries.pop(key, None)
+        if cached is not None:
+            self._bytes -= len(cached.body)
+
+    def get(self, key: Hashable, version: int) -> Optional[_CachedBody]:
+        cached = self._entries.get(key)
+        if cached is not None:
+            expired = cached.expires_at is not None and time.monotonic() >= cached.expires_at
+            if cached.version == version and not expired:
+                self._entries.move_to_end(key)
+                self._counters["hits"] += 1
+                return cached
+            self._drop(key)
+        self._counters["misses"] += 1
+        return None
+
+    def put(self, key: Hashable, version: int, body: bytes, max_age: Optional[float] = None) -> _CachedBody:
+        # From the body alone: versions are counted per process, and every
+        # worker serving the same body has to give the same tag
+        etag = f'"{hashlib.blake2b(body, digest_size=16).hexdigest()}"'
+        expires_at = time.monotonic() + max_age if max_age is not None else None
+        cached = _CachedBody(body, etag, version, expires_at)
+        self._drop(key)
+        if len(body) > self.max_bytes:
+            return cached
+
+        self._entries[key] = cached
+        self._bytes += len(body)
+        while self._bytes > self.max_bytes:
+            _, evicted = self._entries.popitem(last=False)
+            self._bytes -= len(evicted.body)
+            self._counters["evictions"] += 1
+        return cached
+
+    def respond(self, request: Request, key: Hashable, version: int, build: Callable[[], bytes],
+                max_age: Optional[float] = None) -> Response:
+        """Serve ``key`` from the cache, calling ``build`` for a fresh body on a miss."""
+        cached = self.get(key, version)
+        if cached is None:
+            cached = self.put(key, version, build(), max_age)
+
+        headers = {"ETag": cached.etag, "Cache-Control": "no-cache"}
+        if _etag_matches(request.headers.get("if-none-match"), cached.etag):
+            self._counters["not_modified"] += 1
+            return Response(status_code=304, headers=headers)
+        return Response(content=cached.body, media_type="application/json", headers=headers)
+
+    def clear(self):
+        self._entries.clear()
+        self._bytes = 0
+
+    def stats(self) -> Dict:
+        stats = dict(self._counters)
+        stats["entries"] = len(self._entries)
+        stats["bytes"] = self._bytes
+        stats["max_bytes"] = self.max_bytes
+        return stats
@@ -3,63 +3,79 @@
 from fastapi import *
 from app.models import *
 from pydantic import BaseModel
-from google.generativeai import GenerativeModel, configure
-
-from app.services import GameService
-from app.leaderboard_service import LeaderboardDataService
+from fastapi.responses import JSONResponse, PlainTextResponse, StreamingResponse
+
+from app.services import GameService, WordService
+from app.session_store import create_session_store
+from app.leaderboard_service import create_leaderboard_service
+from app.leaderboard_hub import LeaderboardHub
+from app.stats_service import AppStatsSnapshot
+from app.chat_gateway import ChatGateway, ChatOverloaded, ChatTimeout, GeminiProvider
+from app.contributors_service import ContributorsCache, ContributorsUnavailable
+from app.response_cache import ResponseCache
+from app.leaderboard_encoding import encode_leaderboard_response
+from app.leaderboard_transfer import ndjson_chunks
+from app.leaderboard_cursor import InvalidCursor, decode_cursor, encode_cursor
+from app.startup import StartupReport
+from app.metrics import REGISTRY, register_service_gauges, time_operation
+from app import config
 from datetime import datetime
-
-router = APIRouter()
-game_service = GameService()
-leaderboard_service = LeaderboardDataService()
-
-import os
 import json
-import time
-import requests
-from fastapi.responses import JSONResponse
-
 
+router = APIRouter()
 
-CONTRIBUTORS_CACHE_PATH = "contributors.json"
-GITHUB_REPO_API = "https://api.github.com/repos/whyvineet/orthoplay/contributors"
-CACHE_DURATION_SECONDS = 3600  # 1 hour -> to sustain the cache for a max of one hour.
-
+# Services read and write data files, so they are built by init_services()
+# during application startup rather than at import time
+game_service: Optional[GameService] = None
+leaderboard_service = None
+leaderboard_hub: Optional[LeaderboardHub] = None
+app_stats: Optional[AppStatsSnapshot] = None
+chat_gateway: Optional[ChatGateway] = None
+contributors_cache: Optional[ContributorsCache] = None
+response_cache: Optional[ResponseCache] = None
+startup_report: Optional[StartupReport] = None
+
+
+def init_services(report: Optional[StartupReport] = None, leaderboard=None):
+    """Build the services the routes use, timing each phase into ``report``.
+
+    ``leaderboard`` replaces the configured leaderboard service, e.g. one
+    seeded with synthetic data by the benchmarks.
+    """
+    global game_service, leaderboard_service, leaderboard_hub, app_stats
+    global chat_gateway, contributors_cache, response_cache, startup_report
+
+    startup_report = report if report is not None else StartupReport()
+    with startup_report.phase("word dataset"):
+        word_service = WordService()
+    with startup_report.phase("session store"):
+        game_service = GameService(session_store=create_session_store(), word_service=word_service)
+    with startup_report.phase("leaderboard load"):
+        leaderboard_service = leaderboard if leaderboard is not None else create_leaderboard_service()
+    with startup_report.phase("other services"):
+        leaderboard_hub = LeaderboardHub(leaderboard_service)
+        leaderboard_service.add_listener(leaderboard_hub.publish)
+        app_stats = AppStatsSnapshot(leaderboard_service, word_service)
+        leaderboard_service.add_listener(app_stats.invalidate)
+        chat_gateway = ChatGateway(GeminiProvider())
+        contributors_cache = ContributorsCache()
+        response_cache = ResponseCache()
+        register_service_gauges(game_service, leaderboard_service, response_cache, chat_gateway, app_stats)
+
+
+def close_services():
+    """Stop background work and flush state built by ``init_services``."""
+    game_service.game_sessions.close()
+    leaderboard_service.close()
+    chat_gateway.close()
 
 
 @router.get("/project/contributors")
 def get_contributors():
-    # Look for the cache file that contains stored data.
-    if os.path.exists(CONTRIBUTORS_CACHE_PATH):
-        with open(CONTRIBUTORS_CACHE_PATH, "r") as f:
-            cached_data = json.load(f)
-        
-        last_fetched = cached_data.get("fetched_at", 0)
-        current_time = time.time()
-
-        # Check if cached data is fresh (not older than 1 hour)
-        if current_time - last_fetched < CACHE_DURATION_SECONDS:
-            return JSONResponse(content=cached_data["data"])
-
-    # Fetch fresh data from GitHub API
     try:
-        response = requests.get(GITHUB_REPO_API)
-        if response.status_code != 200:
-            raise Exception(f"GitHub API failed with status {response.status_code}")
-
-        contributors = response.json()
-
-        # Save to cache
-        with open(CONTRIBUTORS_CACHE_PATH, "w") as f:
-            json.dump({
-                "fetched_at": time.time(),
-                "data": contributors
-            }, f, indent=2)
-
-        return JSONResponse(content=contributors)
-    
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=f"Failed to fetch contributors: {str(e)}")
+        return JSONResponse(content=contributors_cache.get())
+    except ContributorsUnavailable as e:
+        raise HTTPException(status_code=503, detail=f"Failed to fetch contributors: {str(e)}")
 
 
 @router.get("/")
@@ -77,7 +93,12 @@ async def start_game(request: GameStartRequest):
     """Start a new game session."""
     try:
         mode = request.mode
-        game_data = game_service.start_game(mode=mode)
+        game_data = game_service.start_game(
+            mode=mode,
+            difficulty=request.difficulty,
+            word_length=request.word_length,
+            username=request.username
+        )
         word_data = game_data["word_data"]
         
         length_options = game_service.generate_length_options(len(game_data["word"]))
@@ -91,6 +112,8 @@ async def start_game(request: GameStartRequest):
             hint3=word_data["hint3"],
             length_options=length_options
         )
+    except LookupError as e:
+        raise HTTPException(status_code=404, detail=str(e))
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Failed to start game: {str(e)}")
 
@@ -155,7 +178,8 @@ async def submit_spelling(request: SpellingGuessRequest):
             })
         else:
             response_data["message"] = f"Keep trying! Attempt #{session['attempts']}"
-        
+
+        game_service.save_session(request.word_id, session)
         return SpellingGuessResponse(**response_data)
     except HTTPException:
         raise
@@ -175,6 +199,7 @@ async def reveal_answer(request: RevealAnswerRequest):
         word_data = game_service.word_service.get_word_data(correct_word)
         
         session["completed"] = True
+        game_service.save_session(request.word_id, session)
         
         return RevealAnswerResponse(
             correct_word=correct_word,
@@ -187,6 +212,12 @@ async def reveal_answer(request: RevealAnswerRequest):
         raise HTTPException(status_code=500, detail=f"Failed to reveal answer: {str(e)}")
 
 
+@router.get("/game/sessions/stats")
+async def get_session_stats():
+    """Get live and evicted game session counters."""
+    return game_service.game_sessions.stats()
+
+
 @router.get("/game/stats/{word_id}")
 async def get_game_stats(word_id: str):
     """Get game statistics."""
@@ -205,17 +236,18 @@ async def get_game_stats(word_id: str):
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Failed to get game stats: {str(e)}")
 
-configure(api_key=os.getenv("GEMINI_API_KEY"))
-
 class ChatRequest(BaseModel):
     message: str
 
 @router.post("/chat")
 async def chat_with_gemini(request: ChatRequest):
     try:
-        model = GenerativeModel("gemini-2.0-flash")
-        result = model.generate_content(request.message)
-        return {"reply": result.text}
+        reply = await chat_gateway.chat(request.message)
+        return {"reply": reply}
+    except ChatOverloaded as e:
+        raise HTTPException(status_code=503, detail=str(e), headers={"Retry-After": "5"})
+    except ChatTimeout as e:
+        raise HTTPException(status_code=504, detail=str(e))
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Failed to generate response: {str(e)}")
 
@@ -233,6 +265,7 @@ async def use_hint(request: dict):
 
         # Increment hints used
         session["hints_used"] = session.get("hints_used", 0) + 1
+        game_service.save_session(word_id, session)
 
         return {"success": True, "hints_used": session["hints_used"]}
 
@@ -244,8 +277,12 @@ async def use_hint(request: dict):
 
 # Leaderboard endpoints
 @router.post("/leaderboard/submit", response_model=SubmitScoreResponse)
-async def submit_score(request: SubmitScoreRequest):
-    """Submit a score to the leaderboard."""
+def submit_score(request: SubmitScoreRequest):
+    """Submit a score to the leaderboard.
+
+    A plain ``def``, so it runs in the thread pool: the write may wait for
+    another worker's hold of the leaderboard lock.
+    """
     try:
         # Get game session data
         session = game_service.get_session(request.word_id)
@@ -298,58 +335,108 @@ async def submit_score(request: SubmitScoreRequest):
 
 @router.get("/leaderboard", response_model=LeaderboardResponse)
 async def get_leaderboard(
+    request: Request,
     limit: int = Query(50, ge=1, le=100),
     offset: int = Query(0, ge=0),
+    cursor: Optional[str] = Query(None),
     username: Optional[str] = Query(None),
     time_filter: Optional[str] = Query("all", regex="^(daily|weekly|monthly|all)$"),
     sort_by: Optional[str] = Query("score", regex="^(score|attempts|completion_time|timestamp)$"),
     sort_order: Optional[str] = Query("desc", regex="^(asc|desc)$")
 ):
-    """Get leaderboard entries with optional user information."""
+    """Get leaderboard entries with optional user information.
+
+    Pages can be followed with ``cursor`` (the previous page's
+    ``next_cursor``) instead of ``offset``; the page then starts right
+    after the last entry seen, however deep, and does not shift when new
+    scores arrive.
+    """
     try:
-        entries = leaderboard_service.get_leaderboard(
-            limit=limit,
-            offset=offset,
-            time_filter=time_filter,
-            sort_by=sort_by,
-            sort_order=sort_order
+        after = decode_cursor(cursor, sort_by, sort_order, time_filter) if cursor else None
+    except InvalidCursor as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    try:
+        key = ResponseCache.key(
+            "leaderboard", limit=limit, offset=offset, username=username.lower() if username else None,
+            time_filter=time_filter, sort_by=sort_by, sort_order=sort_order, cursor=cursor
         )
-        total_entries = leaderboard_service.get_total_entries(time_filter=time_filter)
-
-        # Convert to LeaderboardEntry objects
-        leaderboard_entries = []
-        for entry in entries:
-            leaderboard_entries.append(LeaderboardEntry(**entry))
-
-        # Get user-specific data if username provided
-        user_rank = None
-        user_best_score = None
-        if username:
-            user_stats = leaderboard_service.get_user_stats(username)
-            if user_stats.get("total_games", 0) > 0:
-                user_best_score = user_stats["best_score"]
-                user_rank = leaderboard_service.get_user_rank(username, user_best_score)
-
-        return LeaderboardResponse(
-            entries=leaderboard_entries,
-            total_entries=total_entries,
-            user_rank=user_rank,
-            user_best_score=user_best_score
+        # Rolling windows change as time passes, not only when scores arrive
+        max_age = None if time_filter == "all" else config.RESPONSE_CACHE_MAX_AGE
+        return response_cache.respond(
+            request, key, leaderboard_service.version,
+            lambda: _build_leaderboard(limit, offset, username, time_filter, sort_by, sort_order, after),
+            max_age=max_age
         )
 
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Failed to get leaderboard: {str(e)}")
 
 
+def _build_leaderboard(limit: int, offset: int, username: Optional[str], time_filter: str,
+                       sort_by: str, sort_order: str, after: Optional[tuple] = None) -> bytes:
+    # Stored rows were validated on submission, so they are encoded as-is
+    entries, last_key = leaderboard_service.get_leaderboard_page(
+        limit=limit,
+        offset=offset,
+        time_filter=time_filter,
+        sort_by=sort_by,
+        sort_order=sort_order,
+        after=after
+    )
+    next_cursor = None if last_key is None else encode_cursor(sort_by, sort_order, time_filter, last_key)
+    total_entries = leaderboard_service.get_total_entries(time_filter=time_filter)
+
+    # Get user-specific data if username provided
+    user_rank = None
+    user_best_score = None
+    if username:
+        user_stats = leaderboard_service.get_user_stats(username)
+        if user_stats.get("total_games", 0) > 0:
+            user_best_score = user_stats["best_score"]
+            user_rank = leaderboard_service.get_user_rank(username, user_best_score)
+
+    with time_operation("leaderboard_encode"):
+        return encode_leaderboard_response(entries, total_entries, user_rank, user_best_score, next_cursor)
+
+
+@router.get("/leaderboard/export")
+def export_leaderboard(
+    since: Optional[datetime] = Query(None),
+    until: Optional[datetime] = Query(None),
+    username: Optional[str] = Query(None)
+):
+    """Stream recorded games as NDJSON, optionally filtered by time and player."""
+    try:
+        entries = leaderboard_service.iter_entries(
+            since=since.timestamp() if since else None,
+            until=until.timestamp() if until else None,
+            username=username
+        )
+        return StreamingResponse(ndjson_chunks(entries), media_type="application/x-ndjson")
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Failed to export leaderboard: {str(e)}")
+
+
+@router.websocket("/leaderboard/stream")
+async def leaderboard_stream(websocket: WebSocket, limit: int = 10):
+    """Push the top entries on connect, then every score that enters them."""
+    await websocket.accept()
+    await leaderboard_hub.serve(websocket, limit=limit)
+
+
 @router.get("/leaderboard/user/{username}", response_model=UserStatsResponse)
-async def get_user_stats(username: str):
+async def get_user_stats(username: str, request: Request):
     """Get statistics for a specific user."""
     try:
-        stats = leaderboard_service.get_user_stats(username)
-        if not stats:
-            raise HTTPException(status_code=404, detail="User not found")
+        def build() -> bytes:
+            stats = leaderboard_service.get_user_stats(username)
+            if not stats:
+                raise HTTPException(status_code=404, detail="User not found")
+            return UserStatsResponse(**stats).model_dump_json().encode()
 
-        return UserStatsResponse(**stats)
+        key = ResponseCache.key("user_stats", username=username)
+        return response_cache.respond(request, key, leaderboard_service.version, build)
 
     except HTTPException:
         raise
@@ -357,33 +444,115 @@ async def get_user_stats(username: str):
         raise HTTPException(status_code=500, detail=f"Failed to get user stats: {str(e)}")
 
 
+@router.get("/leaderboard/user/{username}/rank", response_model=UserRankResponse)
+async def get_user_rank(username: str, request: Request):
+    """Ranks and percentile of a user's best entry on the leaderboard."""
+    try:
+        def build() -> bytes:
+            details = leaderboard_service.get_user_rank_details(username)
+            if details is None:
+                raise HTTPException(status_code=404, detail="User not found")
+            return UserRankResponse(**details).model_dump_json().encode()
 
-@router.get("/app/stats")
-async def get_app_stats():
-    """Get application-wide statistics."""
+        key = ResponseCache.key("user_rank", username=username.lower())
+        return response_cache.respond(request, key, leaderboard_service.version, build)
+
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Failed to get user rank: {str(e)}")
+
+
+@router.get("/leaderboard/user/{username}/history", response_model=UserHistoryResponse)
+def get_user_history(
+    username: str,
+    request: Request,
+    limit: int = Query(50, ge=1, le=100),
+    offset: int = Query(0, ge=0)
+):
+    """A user's recorded games, newest first.
+
+    Runs in the thread pool, since opening the archive files takes the
+    leaderboard lock.
+    """
     try:
-        # Get total unique users from leaderboard
-        total_entries = leaderboard_service.get_total_entries()
-        unique_users = leaderboard_service.get_unique_users_count()
+        def build() -> bytes:
+            entries = leaderboard_service.get_user_history(username, limit=limit, offset=offset)
+            return UserHistoryResponse(username=username.lower(), entries=entries).model_dump_json().encode()
 
-        # Get total words available
-        word_service = GameService().word_service
-        total_words = len(word_service.words)
+        key = ResponseCache.key("user_history", username=username.lower(), limit=limit, offset=offset)
+        return response_cache.respond(request, key, leaderboard_service.version, build)
 
-        # Get total games played
-        total_games = leaderboard_service.get_total_games()
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Failed to get user history: {str(e)}")
 
-        # Calculate community satisfaction (based on completion rate)
-        completion_stats = leaderboard_service.get_completion_stats()
-        community_love = completion_stats.get("satisfaction_rate", 95)
 
-        return {
-            "active_learners": unique_users,
-            "words_available": total_words,
-            "total_games_played": total_games,
-            "community_love": community_love,
-            "open_source": 100  # Always 100% as it's open source
-        }
+@router.get("/leaderboard/around", response_model=RankNeighborhoodResponse)
+async def get_rank_neighborhood(
+    request: Request,
+    rank: Optional[int] = Query(None, ge=1),
+    username: Optional[str] = Query(None),
+    radius: int = Query(5, ge=0, le=50)
+):
+    """Entries ranked just above and below a rank, or a user's best entry."""
+    try:
+        if rank is None and not username:
+            raise HTTPException(status_code=400, detail="Either rank or username is required")
+
+        def build() -> bytes:
+            center = rank
+            if center is None:
+                details = leaderboard_service.get_user_rank_details(username)
+                if details is None:
+                    raise HTTPException(status_code=404, detail="User not found")
+                center = details["rank"]
+            entries = leaderboard_service.get_rank_neighborhood(center, radius)
+            if not entries:
+                raise HTTPException(status_code=404, detail="Rank is beyond the end of the leaderboard")
+            return RankNeighborhoodResponse(
+                rank=center, total_entries=leaderboard_service.get_total_entries(), entries=entries
+            ).model_dump_json().encode()
+
+        key = ResponseCache.key(
+            "rank_neighborhood", rank=rank, username=username.lower() if username else None, radius=radius
+        )
+        return response_cache.respond(request, key, leaderboard_service.version, build)
+
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Failed to get rank neighborhood: {str(e)}")
+
+
+@router.get("/app/stats")
+async def get_app_stats(request: Request):
+    """Get application-wide statistics."""
+    try:
+        def build() -> bytes:
+            return json.dumps(app_stats.get()).encode()
+
+        return response_cache.respond(
+            request, ResponseCache.key("app_stats"), leaderboard_service.version, build,
+            max_age=config.RESPONSE_CACHE_MAX_AGE
+        )
 
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Failed to get app stats: {str(e)}")
+
+
+@router.get("/app/cache/stats")
+async def get_response_cache_stats():
+    """Hit, miss and eviction counters of the read response cache."""
+    return response_cache.stats()
+
+
+@router.get("/app/startup")
+async def get_startup_report():
+    """How long each phase of this process's startup took."""
+    return startup_report.to_dict()
+
+
+@router.get("/metrics", include_in_schema=False)
+async def get_metrics():
+    """Request, storage and service metrics in the Prometheus text format."""
+    return PlainTextResponse(REGISTRY.render(), media_type="text/plain; version=0.0.4; charset=utf-8")
@@ -4,25 +4,44 @@ import json
 import os
 import random
 import time
-from typing import Dict, List
+from typing import Dict, Iterable, List, Mapping, Optional, Tuple
 from datetime import datetime
 
+from app.feedback import batch_feedback, feedback_codes, render_feedback
+from app.session_store import GameSession, SessionStore, create_session_store
+from app import config
+from app.metrics import time_operation
+from app.word_index import WordIndex
+from app.word_store import WordStore, open_word_store
+
 
 class WordService:
     """Service for managing word data."""
     
-    def __init__(self):
-        self.words = self._load_words()
+    def __init__(self, words_file: Optional[str] = None, word_store: Optional[str] = None):
+        self.words_file = words_file or os.path.join(os.path.dirname(__file__), "..", "data", "words_with_hint.json")
+        self.word_store = word_store or config.WORD_STORE
+        with time_operation("word_dataset_load"):
+            self.words = self._load_words()
+            if isinstance(self.words, WordStore):
+                self.index = WordIndex(self.words.words, buckets=self.words.buckets)
+            else:
+                self.index = WordIndex(self.words.keys())
     
-    def _load_words(self) -> Dict:
-        """Load words from JSON file."""
-        words_file = os.path.join(os.path.dirname(__file__), "..", "data", "words_with_hint.json")
-        with open(words_file, 'r') as f:
+    def _load_words(self) -> Mapping:
+        """Load words from the compiled store, or from the JSON file."""
+        if self.word_store == "mmap":
+            try:
+                return open_word_store(self.words_file)
+            except Exception as e:
+                print(f"Error opening word store, loading JSON instead: {e}")
+        with open(self.words_file, 'r') as f:
             return json.load(f)
     
-    def get_random_word(self) -> str:
-        """Get a random word from the database."""
-        return random.choice(list(self.words.keys()))
+    def get_random_word(self, difficulty: Optional[str] = None, length: Optional[int] = None,
+                        username: Optional[str] = None) -> str:
+        """Get a random word, optionally filtered and without repeats for a user."""
+        return self.index.choice(difficulty=difficulty, length=length, username=username)
     
     def get_word_data(self, word: str) -> Dict:
         """Get word data including description and sentence."""
@@ -32,23 +51,22 @@ class WordService:
 class GameService:
     """Service for game logic."""
 
-    def __init__(self):
-        self.word_service = WordService()
-        self.game_sessions = {}
+    def __init__(self, session_store: Optional[SessionStore] = None, word_service: Optional[WordService] = None):
+        self.word_service = word_service if word_service is not None else WordService()
+        self.game_sessions = session_store if session_store is not None else create_session_store()
 
-    def start_game(self, mode="playing") -> Dict:
+    def start_game(self, mode="playing", difficulty: Optional[str] = None, word_length: Optional[int] = None,
+                   username: Optional[str] = None) -> Dict:
         """Start a new game session."""
-        word = self.word_service.get_random_word()
-        session_id = f"game_{random.randint(1000, 9999)}"
+        word = self.word_service.get_random_word(
+            difficulty=difficulty,
+            length=word_length,
+            username=username.lower() if username else None
+        )
+        session_id = self.game_sessions.new_id()
 
         if mode == "playing":
-            self.game_sessions[session_id] = {
-                "word": word,
-                "attempts": 0,
-                "completed": False,
-                "hints_used": 0,
-                "start_time": time.time()
-            }
+            self.game_sessions.create(session_id, GameSession(word=word, mode=mode))
 
         return {
             "session_id": session_id,
@@ -56,14 +74,20 @@ class GameService:
             "word_data": self.word_service.get_word_data(word)
         }
     
-    def get_session(self, session_id: str) -> Dict:
+    def get_session(self, session_id: str) -> Optional[GameSession]:
         """Get game session data."""
         return self.game_sessions.get(session_id)
     
     def update_session(self, session_id: str, data: Dict):
         """Update game session data."""
-        if session_id in self.game_sessions:
-            self.game_sessions[session_id].update(data)
+        session = self.game_sessions.get(session_id)
+        if session is not None:
+            session.update(data)
+            self.game_sessions.save(session_id, session)
+
+    def save_session(self, session_id: str, session: GameSession):
+        """Persist changes made to a session returned by ``get_session``."""
+        self.game_sessions.save(session_id, session)
     
     def generate_length_options(self, correct_length: int) -> List[int]:
         """Generate multiple choice options for word length."""
@@ -78,31 +102,11 @@ class GameService:
     
     def get_feedback(self, guess: str, correct_word: str) -> List[str]:
         """Generate Wordle-style feedback."""
-        guess = guess.lower().strip()
-        correct_word = correct_word.lower()
-        
-        if len(guess) != len(correct_word):
-            return ["⬛"] * len(correct_word)
-        
-        feedback = []
-        correct_letters = list(correct_word)
-        
-        # First pass: mark correct positions
-        for i, letter in enumerate(guess):
-            if letter == correct_word[i]:
-                feedback.append("🟩")
-                correct_letters[i] = None
-            else:
-                feedback.append("⬛")
-        
-        # Second pass: mark wrong positions
-        for i, letter in enumerate(guess):
-            if feedback[i] == "⬛":
-                if letter in correct_letters:
-                    feedback[i] = "🟨"
-                    correct_letters[correct_letters.index(letter)] = None
-        
-        return feedback
+        return render_feedback(feedback_codes(guess, correct_word))
+
+    def get_feedback_batch(self, pairs: Iterable[Tuple[str, str]]) -> List[List[str]]:
+        """Generate Wordle-style feedback for many (guess, correct_word) pairs."""
+        return [render_feedback(codes) for codes in batch_feedback(pairs)]
 
     def calculate_score(self, attempts: int, hints_used: int, completion_time: float, word_length: int) -> int:
         """Calculate score based on game performance."""
@@ -0,0 +1,172 @@
+"""Game session store shared between worker processes through SQLite."""
+
+import os
+import sqlite3
+import threading
+import time
+from typing import Dict, Optional
+
+from app import config
+from app.session_store import GameSession, SessionStore, session_expiry_reason
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS sessions (
+    id TEXT PRIMARY KEY,
+    word TEXT NOT NULL,
+    mode TEXT NOT NULL,
+    attempts INTEGER NOT NULL,
+    completed INTEGER NOT NULL,
+    hints_used INTEGER NOT NULL,
+    start_time REAL NOT NULL,
+    last_access REAL NOT NULL
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS idx_sessions_last_access ON sessions (last_access);
+CREATE TABLE IF NOT EXISTS session_counters (
+    name TEXT PRIMARY KEY,
+    value INTEGER NOT NULL
+);
+"""
+
+FIELDS = GameSession.__slots__
+
+# Reads only refresh last_access when it is older than this, so following
+# a game does not turn every lookup into a write.
+TOUCH_INTERVAL = 30
+
+
+def default_db_path() -> str:
+    return config.SESSION_DB_PATH or os.path.join(os.path.dirname(__file__), "..", "data", "sessions.db")
+
+
+class SqliteSessionStore(SessionStore):
+    """Session store in a WAL-mode SQLite file that every worker opens.
+
+    Expiry follows ``MemorySessionStore``. The capacity bound is enforced by
+    ``sweep`` (least recently used first) rather than on every insert, and
+    counters live in the database so they cover all workers.
+    """
+
+    def __init__(self, db_path: Optional[str] = None, idle_ttl: Optional[float] = None,
+                 completed_ttl: Optional[float] = None, absolute_ttl: Optional[float] = None,
+                 max_sessions: Optional[int] = None):
+        super().__init__()
+        self.db_path = db_path or default_db_path()
+        self.idle_ttl = idle_ttl if idle_ttl is not None else config.SESSION_IDLE_TTL
+        self.completed_ttl = completed_ttl if completed_ttl is not None else config.SESSION_COMPLETED_TTL
+        self.absolute_ttl = absolute_ttl if absolute_ttl is not None else config.SESSION_ABSOLUTE_TTL
+        self.max_sessions = max_sessions if max_sessions is not None else config.SESSION_MAX
+        self._local = threading.local()
+        self._conn().executescript(SCHEMA)
+
+    def _conn(self) -> sqlite3.Connection:
+        """Per-thread connection; sqlite3 connections must not be shared."""
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.db_path, timeout=30, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    def close(self):
+        super().close()
+        conn = getattr(self._local, "conn", None)
+        if conn is not None:
+            conn.close()
+            self._local.conn = None
+
+    def __len__(self) -> int:
+        return self._conn().execute("SELECT COUNT(*) FROM sessions").fetchone()[0]
+
+    @staticmethod
+    def _bump(conn: sqlite3.Connection, name: str, amount: int = 1):
+        conn.execute(
+            "INSERT INTO session_counters (name, value) VALUES (?, ?) "
+            "ON CONFLICT(name) DO UPDATE SET value = value + excluded.value",
+            (name, amount)
+        )
+
+    def _write(self, conn: sqlite3.Connection, session_id: str, session: GameSession):
+        conn.execute(
+            f"INSERT OR REPLACE INTO sessions (id, {', '.join(FIELDS)}) VALUES (?, {', '.join('?' * len(FIELDS))})",
+            [session_id] + [getattr(session, name) for name in FIELDS]
+        )
+
+    def create(self, session_id: str, session: GameSession):
+        conn = self._conn()
+        with conn:
+            conn.execute("BEGIN IMMEDIATE")
+            self._write(conn, session_id, session)
+            self._bump(conn, "created")
+
+    def get(self, session_id: str) -> Optional[GameSession]:
+        conn = self._conn()
+        row = conn.execute(
+            f"SELECT {', '.join(FIELDS)} FROM sessions WHERE id = ?", (session_id,)
+        ).fetchone()
+        if row is None:
+            return None
+
+        session = GameSession(**dict(zip(FIELDS, row)))
+        session.completed = bool(session.completed)
+        now = time.time()
+        reason = session_expiry_reason(session, now, self.idle_ttl, self.completed_ttl, self.absolute_ttl)
+        if reason:
+            with conn:
+                conn.execute("BEGIN IMMEDIATE")
+                if conn.execute("DELETE FROM sessions WHERE id = ?", (session_id,)).rowcount:
+                    self._bump(conn, reason)
+            return None
+
+        if now - session.last_access > TOUCH_INTERVAL:
+            session.last_access = now
+            with conn:
+                conn.execute("UPDATE sessions SET last_access = ? WHERE id = ?", (now, session_id))
+        return session
+
+    def save(self, session_id: str, session: GameSession):
+        session.last_access = time.time()
+        conn = self._conn()
+        with conn:
+            conn.execute("BEGIN IMMEDIATE")
+            if conn.execute("SELECT 1 FROM sessions WHERE id = ?", (session_id,)).fetchone():
+                self._write(conn, session_id, session)
+
+    def delete(self, session_id: str):
+        conn = self._conn()
+        with conn:
+            conn.execute("DELETE FROM sessions WHERE id = ?", (session_id,))
+
+    def sweep(self) -> int:
+        """Drop expired sessions and trim to capacity; returns how many were removed."""
+        now = time.time()
+        conn = self._conn()
+        with conn:
+            conn.execute("BEGIN IMMEDIATE")
+            expired = conn.execute(
+                "DELETE FROM sessions WHERE start_time < ?", (now - self.absolute_ttl,)
+            ).rowcount
+            idle = conn.execute(
+                "DELETE FROM sessions WHERE (completed = 0 AND last_access < ?) "
+                "OR (completed = 1 AND last_access < ?)",
+                (now - self.idle_ttl, now - self.completed_ttl)
+            ).rowcount
+            capacity = conn.execute(
+                "DELETE FROM sessions WHERE id IN ("
+                "SELECT id FROM sessions ORDER BY last_access DESC LIMIT -1 OFFSET ?)",
+                (self.max_sessions,)
+            ).rowcount
+            for name, amount in (("evicted_expired", expired), ("evicted_idle", idle),
+                                 ("evicted_capacity", capacity)):
+                if amount:
+                    self._bump(conn, name, amount)
+        return expired + idle + capacity
+
+    def stats(self) -> Dict:
+        conn = self._conn()
+        stats = {"created": 0, "evicted_idle": 0, "evicted_expired": 0, "evicted_capacity": 0}
+        stats.update(conn.execute("SELECT name, value FROM session_counters").fetchall())
+        stats["live"] = len(self)
+        stats["max_sessions"] = self.max_sessions
+        stats["evicted"] = stats["evicted_idle"] + stats["evicted_expired"] + stats["evicted_capacity"]
+        return stats
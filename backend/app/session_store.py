@@ -0,0 +1,239 @@
+"""Bounded, expiring storage for game sessions."""
+
+import threading
+import time
+import uuid
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from typing import Dict, Optional
+
+from app import config
+
+
+class GameSession:
+    """State of one game, kept compact with ``__slots__``.
+
+    Supports the mapping-style access (``session["attempts"]``,
+    ``session.get(...)``, ``session.update(...)``) the routes use.
+    """
+
+    __slots__ = ("word", "mode", "attempts", "completed", "hints_used", "start_time", "last_access")
+
+    def __init__(self, word: str, mode: str = "playing", attempts: int = 0, completed: bool = False,
+                 hints_used: int = 0, start_time: Optional[float] = None, last_access: Optional[float] = None):
+        self.word = word
+        self.mode = mode
+        self.attempts = attempts
+        self.completed = completed
+        self.hints_used = hints_used
+        self.start_time = start_time if start_time is not None else time.time()
+        self.last_access = last_access if last_access is not None else self.start_time
+
+    def __getitem__(self, key: str):
+        try:
+            return getattr(self, key)
+        except AttributeError:
+            raise KeyError(key) from None
+
+    def __setitem__(self, key: str, value):
+        try:
+            setattr(self, key, value)
+        except AttributeError:
+            raise KeyError(key) from None
+
+    def get(self, key: str, default=None):
+        return getattr(self, key, default)
+
+    def update(self, data: Dict):
+        for key, value in data.items():
+            self[key] = value
+
+    def to_dict(self) -> Dict:
+        return {name: getattr(self, name) for name in self.__slots__}
+
+
+def session_expiry_reason(session: GameSession, now: float, idle_ttl: float, completed_ttl: float,
+                          absolute_ttl: float) -> Optional[str]:
+    """Counter name for why a session has expired, or None if it is live."""
+    if now - session.start_time > absolute_ttl:
+        return "evicted_expired"
+    ttl = completed_ttl if session.completed else idle_ttl
+    if now - session.last_access > ttl:
+        return "evicted_idle"
+    return None
+
+
+def new_session_id() -> str:
+    """Random 128-bit session id; collisions are not a practical concern."""
+    return f"game_{uuid.uuid4().hex}"
+
+
+class SessionStore(ABC):
+    """Interface for game session backends.
+
+    ``get`` returns a live session (or None once it has expired) and
+    ``save`` must be called after mutating one so that backends shared
+    between worker processes see the change. Subclasses implement storage;
+    the periodic sweeper thread is shared.
+    """
+
+    def __init__(self):
+        self._stop = threading.Event()
+        self._sweeper = None
+
+    @abstractmethod
+    def __len__(self) -> int:
+        ...
+
+    def new_id(self) -> str:
+        return new_session_id()
+
+    @abstractmethod
+    def create(self, session_id: str, session: GameSession):
+        ...
+
+    @abstractmethod
+    def get(self, session_id: str) -> Optional[GameSession]:
+        ...
+
+    @abstractmethod
+    def save(self, session_id: str, session: GameSession):
+        ...
+
+    @abstractmethod
+    def delete(self, session_id: str):
+        ...
+
+    @abstractmethod
+    def sweep(self) -> int:
+        ...
+
+    @abstractmethod
+    def stats(self) -> Dict:
+        ...
+
+    def close(self):
+        self.stop_sweeper()
+
+    def start_sweeper(self, interval: Optional[float] = None):
+        """Run ``sweep`` periodically on a daemon thread."""
+        if self._sweeper is not None:
+            return
+        interval = interval if interval is not None else config.SESSION_SWEEP_INTERVAL
+        self._stop.clear()
+
+        def run():
+            while not self._stop.wait(interval):
+                try:
+                    self.sweep()
+                except Exception as e:
+                    print(f"Error sweeping game sessions: {e}")
+
+        self._sweeper = threading.Thread(target=run, name="session-sweeper", daemon=True)
+        self._sweeper.start()
+
+    def stop_sweeper(self):
+        if self._sweeper is None:
+            return
+        self._stop.set()
+        self._sweeper.join()
+        self._sweeper = None
+
+
+class MemorySessionStore(SessionStore):
+    """In-process session store with TTL expiry and an LRU capacity bound.
+
+    Open sessions expire after ``idle_ttl`` seconds without access, finished
+    ones after ``completed_ttl``, and every session after ``absolute_ttl``
+    since it started. Expired sessions are dropped lazily on access and by a
+    background sweeper thread.
+    """
+
+    def __init__(self, idle_ttl: Optional[float] = None, completed_ttl: Optional[float] = None,
+                 absolute_ttl: Optional[float] = None, max_sessions: Optional[int] = None):
+        super().__init__()
+        self.idle_ttl = idle_ttl if idle_ttl is not None else config.SESSION_IDLE_TTL
+        self.completed_ttl = completed_ttl if completed_ttl is not None else config.SESSION_COMPLETED_TTL
+        self.absolute_ttl = absolute_ttl if absolute_ttl is not None else config.SESSION_ABSOLUTE_TTL
+        self.max_sessions = max_sessions if max_sessions is not None else config.SESSION_MAX
+        self._sessions: "OrderedDict[str, GameSession]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._counters = {"created": 0, "evicted_idle": 0, "evicted_expired": 0, "evicted_capacity": 0}
+
+    def __len__(self) -> int:
+        return len(self._sessions)
+
+    def __contains__(self, session_id: str) -> bool:
+        return session_id in self._sessions
+
+    def _expiry_reason(self, session: GameSession, now: float) -> Optional[str]:
+        return session_expiry_reason(session, now, self.idle_ttl, self.completed_ttl, self.absolute_ttl)
+
+    def create(self, session_id: str, session: GameSession):
+        """Store a new session, evicting the least recently used beyond capacity."""
+        with self._lock:
+            self._sessions[session_id] = session
+            self._sessions.move_to_end(session_id)
+            self._counters["created"] += 1
+            while len(self._sessions) > self.max_sessions:
+                self._sessions.popitem(last=False)
+                self._counters["evicted_capacity"] += 1
+
+    def get(self, session_id: str) -> Optional[GameSession]:
+        """Return a live session and mark it as recently used."""
+        with self._lock:
+            session = self._sessions.get(session_id)
+            if session is None:
+                return None
+            now = time.time()
+            reason = self._expiry_reason(session, now)
+            if reason:
+                del self._sessions[session_id]
+                self._counters[reason] += 1
+                return None
+            session.last_access = now
+            self._sessions.move_to_end(session_id)
+            return session
+
+    def save(self, session_id: str, session: GameSession):
+        """Persist changes to a session (already live in memory here)."""
+        with self._lock:
+            if session_id in self._sessions:
+                session.last_access = time.time()
+                self._sessions[session_id] = session
+                self._sessions.move_to_end(session_id)
+
+    def delete(self, session_id: str):
+        with self._lock:
+            self._sessions.pop(session_id, None)
+
+    def sweep(self) -> int:
+        """Drop every expired session; returns how many were removed."""
+        now = time.time()
+        with self._lock:
+            expired = []
+            for session_id, session in self._sessions.items():
+                reason = self._expiry_reason(session, now)
+                if reason:
+                    expired.append((session_id, reason))
+            for session_id, reason in expired:
+                del self._sessions[session_id]
+                self._counters[reason] += 1
+        return len(expired)
+
+    def stats(self) -> Dict:
+        """Live and eviction counters for capacity planning."""
+        with self._lock:
+            stats = dict(self._counters)
+            stats["live"] = len(self._sessions)
+            stats["max_sessions"] = self.max_sessions
+        stats["evicted"] = stats["evicted_idle"] + stats["evicted_expired"] + stats["evicted_capacity"]
+        return stats
+
+
+def create_session_store() -> SessionStore:
+    """Build the session store selected by ``ORTHOPLAY_SESSION_BACKEND``."""
+    if config.SESSION_BACKEND == "sqlite":
+        from app.session_sqlite import SqliteSessionStore
+        return SqliteSessionStore()
+    return MemorySessionStore()
@@ -0,0 +1,38 @@
+"""Per-phase timing of API process startup."""
+
+import time
+from contextlib import contextmanager
+from typing import Dict, List, Tuple
+
+
+class StartupReport:
+    """Durations of the named phases of a cold start, in order."""
+
+    def __init__(self):
+        self.phases: List[Tuple[str, float]] = []
+
+    def record(self, name: str, seconds: float):
+        self.phases.append((name, seconds))
+
+    @contextmanager
+    def phase(self, name: str):
+        """Time the enclosed block as one phase."""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record(name, time.perf_counter() - start)
+
+    @property
+    def total(self) -> float:
+        return sum(seconds for _, seconds in self.phases)
+
+    def to_dict(self) -> Dict:
+        return {
+            "phases_ms": {name: round(seconds * 1000, 1) for name, seconds in self.phases},
+            "total_ms": round(self.total * 1000, 1),
+        }
+
+    def summary(self) -> str:
+        phases = ", ".join(f"{name} {seconds * 1000:.0f}ms" for name, seconds in self.phases)
+        return f"Startup took {self.total * 1000:.0f}ms ({phases})"
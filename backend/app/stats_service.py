@@ -0,0 +1,53 @@
+"""Materialized application statistics for the landing page."""
+
+import time
+from typing import Dict, Optional
+
+from app import config
+
+
+class AppStatsSnapshot:
+    """``/app/stats`` payload computed once and reused.
+
+    The snapshot is marked stale by leaderboard writes (register
+    ``invalidate`` as a leaderboard listener) and expires after ``max_age``
+    seconds so writes made by other worker processes show up too.
+    """
+
+    def __init__(self, leaderboard_service, word_service, max_age: Optional[float] = None):
+        self.leaderboard_service = leaderboard_service
+        self.word_service = word_service
+        self.max_age = max_age if max_age is not None else config.APP_STATS_MAX_AGE
+        self._stats: Optional[Dict] = None
+        self._computed_at = 0.0
+        self.recomputes = 0
+        self.hits = 0
+
+    def invalidate(self, entry: Optional[Dict] = None):
+        """Drop the snapshot; the next ``get`` recomputes it."""
+        self._stats = None
+
+    def _compute(self) -> Dict:
+        # Calculate community satisfaction (based on completion rate)
+        completion_stats = self.leaderboard_service.get_completion_stats()
+        return {
+            "active_learners": self.leaderboard_service.get_unique_users_count(),
+            "words_available": len(self.word_service.words),
+            "total_games_played": self.leaderboard_service.get_total_games(),
+            "community_love": completion_stats.get("satisfaction_rate", 95),
+            "open_source": 100  # Always 100% as it's open source
+        }
+
+    def get(self) -> Dict:
+        """Current statistics, recomputed only when stale."""
+        now = time.monotonic()
+        if self._stats is None or now - self._computed_at > self.max_age:
+            self._stats = self._compute()
+            self._computed_at = now
+            self.recomputes += 1
+        else:
+            self.hits += 1
+        return self._stats
+
+    def counters(self) -> Dict:
+        return {"recomputes": self.recomputes, "hits": self.hits}
@@ -0,0 +1,137 @@
+"""Precomputed word index for constant-time random word selection."""
+
+import math
+import random
+import threading
+from array import array
+from collections import OrderedDict
+from typing import Dict, Iterable, Mapping, Optional, Sequence, Tuple
+
+DIFFICULTIES = ("easy", "medium", "hard")
+
+BucketKey = Tuple[Optional[str], Optional[int]]
+
+# Extra weight for letters that are uncommon in English spelling
+RARE_LETTER_WEIGHTS = {
+    "j": 3, "q": 3, "x": 3, "z": 3,
+    "k": 2, "v": 2, "w": 1, "y": 1,
+    "b": 1, "f": 1, "g": 1, "h": 1, "m": 1, "p": 1,
+}
+
+
+def word_difficulty(word: str) -> int:
+    """Heuristic difficulty: length, rare letters and doubled letters."""
+    score = len(word) * 2
+    score += sum(RARE_LETTER_WEIGHTS.get(letter, 0) for letter in word)
+    score += sum(2 for a, b in zip(word, word[1:]) if a == b)
+    return score
+
+
+class _Cursor:
+    """Position in a pseudo-random permutation of ``range(n)``.
+
+    Walks ``(a * i + b) % n`` for a multiplier coprime with ``n``, which
+    visits every index once per cycle with O(1) state.
+    """
+
+    __slots__ = ("n", "a", "b", "i")
+
+    def __init__(self, n: int):
+        self.n = n
+        self.i = 0
+        self._reshuffle()
+
+    def _reshuffle(self):
+        self.a = 1
+        if self.n > 2:
+            while True:
+                self.a = random.randrange(1, self.n)
+                if math.gcd(self.a, self.n) == 1:
+                    break
+        self.b = random.randrange(self.n)
+        self.i = 0
+
+    def next(self) -> int:
+        if self.i >= self.n:
+            self._reshuffle()
+        position = (self.a * self.i + self.b) % self.n
+        self.i += 1
+        return position
+
+
+class WordIndex:
+    """Flat word table with buckets by length and difficulty.
+
+    Built once when the dictionary is loaded. Buckets hold integer positions
+    into the word table, so selection is a single ``random`` call and does
+    not allocate. Per-user cursors walk a bucket without repeats until it
+    is exhausted.
+    """
+
+    def __init__(self, words: Iterable[str], max_cursors: int = 100_000,
+                 buckets: Optional[Mapping[BucketKey, Sequence[int]]] = None):
+        # Sequences (such as a memory-mapped word table) are used in place
+        self.words: Sequence[str] = words if isinstance(words, Sequence) else tuple(words)
+        self.max_cursors = max_cursors
+        # Buckets precomputed for this exact word table may be passed in
+        self._buckets: Dict[BucketKey, Sequence[int]] = (
+            dict(buckets) if buckets is not None else self._build_buckets()
+        )
+
+        self._cursors: "OrderedDict[Tuple[str, Optional[str], Optional[int]], _Cursor]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self.words)
+
+    def _build_buckets(self) -> Dict[BucketKey, array]:
+        buckets: Dict[BucketKey, array] = {}
+        difficulty_of = self._assign_difficulties()
+        for position, word in enumerate(self.words):
+            difficulty = difficulty_of[position]
+            for key in ((None, None), (difficulty, None), (None, len(word)), (difficulty, len(word))):
+                buckets.setdefault(key, array("I")).append(position)
+        return buckets
+
+    def buckets(self) -> Dict[BucketKey, Sequence[int]]:
+        """Every bucket by ``(difficulty, length)``, ``None`` meaning any."""
+        return dict(self._buckets)
+
+    def _assign_difficulties(self) -> Sequence[str]:
+        """Split words into easy/medium/hard thirds by difficulty score."""
+        scores = [word_difficulty(word) for word in self.words]
+        if not scores:
+            return ()
+        ranked = sorted(scores)
+        low = ranked[len(ranked) // 3]
+        high = ranked[2 * len(ranked) // 3]
+        return tuple(
+            "easy" if score < low else "hard" if score >= high else "medium"
+            for score in scores
+        )
+
+    def bucket(self, difficulty: Optional[str] = None, length: Optional[int] = None) -> Sequence[int]:
+        """Word positions matching the filters (unknown difficulty means any)."""
+        if difficulty not in DIFFICULTIES:
+            difficulty = None
+        return self._buckets.get((difficulty, length), ())
+
+    def choice(self, difficulty: Optional[str] = None, length: Optional[int] = None,
+               username: Optional[str] = None) -> str:
+        """Pick a random word, without repeats per user until a bucket is exhausted."""
+        positions = self.bucket(difficulty, length)
+        if not positions:
+            raise LookupError("No words match the requested difficulty and length")
+        if not username:
+            return self.words[positions[random.randrange(len(positions))]]
+
+        key = (username, difficulty if difficulty in DIFFICULTIES else None, length)
+        with self._lock:
+            cursor = self._cursors.get(key)
+            if cursor is None or cursor.n != len(positions):
+                cursor = self._cursors[key] = _Cursor(len(positions))
+                while len(self._cursors) > self.max_cursors:
+                    self._cursors.popitem(last=False)
+            else:
+                self._cursors.move_to_end(key)
+            return self.words[positions[cursor.next()]]
@@ -0,0 +1,228 @@
+"""Compact, memory-mapped word dataset compiled from ``words_with_hint.json``.
+
+File layout (little-endian)::
+
+    header       magic "OPWD", version, word count, field-names length,
+                 bucket count
+    field names  UTF-8, NUL separated, padded to 4 bytes
+    word index   (count + 1) uint32 offsets into the word heap
+    text index   (count * fields + 1) uint32 offsets into the text heap
+    bucket table per bucket: uint32 difficulty (0 = any, else 1 + index into
+                 DIFFICULTIES), length (0 = any) and size
+    buckets      uint32 word positions of every bucket, in table order
+    word heap    UTF-8 words, sorted by their encoded bytes
+    text heap    UTF-8 field values, record by record, in field order
+
+The file is opened with ``mmap`` so every worker process shares the same
+pages, and a lookup decodes only the one record it needs. The word index
+buckets are computed at build time, so startup does not touch every word. The JSON file
+stays the source of truth; ``python -m app.word_store build`` compiles it.
+"""
+
+import argparse
+import json
+import mmap
+import os
+import struct
+import sys
+from array import array
+from collections.abc import Mapping, Sequence
+from typing import Dict, Iterator, List, Optional
+
+from app.word_index import DIFFICULTIES, WordIndex
+
+MAGIC = b"OPWD"
+FORMAT_VERSION = 1
+HEADER = struct.Struct("<4sIIII")
+BUCKET = struct.Struct("<III")
+DEFAULT_FIELDS = ("description", "sentence", "hint1", "hint2", "hint3")
+
+
+def _pad(size: int) -> int:
+    return -size % 4
+
+
+def build_word_store(json_file: str, out_file: str, fields: Optional[List[str]] = None) -> int:
+    """Compile a words JSON file into the binary format; returns the word count."""
+    with open(json_file, "r", encoding="utf-8") as f:
+        words = json.load(f)
+    if fields is None:
+        fields = list(DEFAULT_FIELDS)
+        for record in words.values():
+            fields.extend(field for field in record if field not in fields)
+
+    encoded = sorted((word.encode("utf-8"), word) for word in words)
+    word_offsets = array("I", [0])
+    text_offsets = array("I", [0])
+    word_heap = bytearray()
+    text_heap = bytearray()
+    for key, word in encoded:
+        word_heap += key
+        word_offsets.append(len(word_heap))
+        record = words[word]
+        for field in fields:
+            text_heap += str(record.get(field, "")).encode("utf-8")
+            text_offsets.append(len(text_heap))
+    buckets = WordIndex([word for _, word in encoded]).buckets()
+    bucket_table = b"".join(
+        BUCKET.pack(0 if difficulty is None else DIFFICULTIES.index(difficulty) + 1, length or 0, len(positions))
+        for (difficulty, length), positions in buckets.items()
+    )
+    bucket_positions = array("I")
+    for positions in buckets.values():
+        bucket_positions.extend(positions)
+    if sys.byteorder != "little":
+        word_offsets.byteswap()
+        text_offsets.byteswap()
+        bucket_positions.byteswap()
+
+    names = "\0".join(fields).encode("utf-8")
+    # Per-process name, since several workers may rebuild at once
+    temp_file = f"{out_file}.{os.getpid()}.tmp"
+    with open(temp_file, "wb") as f:
+        f.write(HEADER.pack(MAGIC, FORMAT_VERSION, len(encoded), len(names), len(buckets)))
+        f.write(names + b"\0" * _pad(len(names)))
+        f.write(word_offsets.tobytes())
+        f.write(text_offsets.tobytes())
+        f.write(bucket_table)
+        f.write(bucket_positions.tobytes())
+        f.write(word_heap)
+        f.write(text_heap)
+    os.replace(temp_file, out_file)
+    return len(encoded)
+
+
+class _WordTable(Sequence):
+    """The sorted words of a store, by position."""
+
+    def __init__(self, store: "WordStore"):
+        self._store = store
+
+    def __len__(self) -> int:
+        return len(self._store)
+
+    def __getitem__(self, position):
+        if isinstance(position, slice):
+            return [self._store.word_at(i) for i in range(*position.indices(len(self)))]
+        return self._store.word_at(position)
+
+
+class WordStore(Mapping):
+    """Read-only ``word -> {field: value}`` mapping over a compiled file."""
+
+    def __init__(self, path: str):
+        self.path = path
+        with open(path, "rb") as f:
+            self._mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+        magic, version, count, names_size, bucket_count = HEADER.unpack_from(self._mm, 0)
+        if magic != MAGIC or version != FORMAT_VERSION:
+            raise ValueError(f"{path} is not a version {FORMAT_VERSION} word store")
+        if sys.byteorder != "little":
+            raise ValueError("Word stores can only be memory-mapped on little-endian hosts")
+
+        position = HEADER.size
+        self.fields = tuple(bytes(self._mm[position:position + names_size]).decode("utf-8").split("\0"))
+        position += names_size + _pad(names_size)
+
+        self._count = count
+        self._view = view = memoryview(self._mm)
+        self._word_offsets = view[position:position + (count + 1) * 4].cast("I")
+        position += (count + 1) * 4
+        text_index_size = (count * len(self.fields) + 1) * 4
+        self._text_offsets = view[position:position + text_index_size].cast("I")
+        position += text_index_size
+
+        table = [BUCKET.unpack_from(self._mm, position + i * BUCKET.size) for i in range(bucket_count)]
+        position += bucket_count * BUCKET.size
+        self.buckets: Dict = {}
+        for difficulty, length, size in table:
+            key = (DIFFICULTIES[difficulty - 1] if difficulty else None, length or None)
+            self.buckets[key] = view[position:position + size * 4].cast("I")
+            position += size * 4
+        self._word_heap = position
+        self._text_heap = position + self._word_offsets[count]
+        self.words = _WordTable(self)
+
+    def __len__(self) -> int:
+        return self._count
+
+    def __iter__(self) -> Iterator[str]:
+        for position in range(self._count):
+            yield self.word_at(position)
+
+    def __getitem__(self, word: str) -> Dict[str, str]:
+        position = self._find(word)
+        if position < 0:
+            raise KeyError(word)
+        return self.record_at(position)
+
+    def __contains__(self, word) -> bool:
+        return isinstance(word, str) and self._find(word) >= 0
+
+    def _word_bytes(self, position: int) -> bytes:
+        start = self._word_heap + self._word_offsets[position]
+        end = self._word_heap + self._word_offsets[position + 1]
+        return self._mm[start:end]
+
+    def _find(self, word: str) -> int:
+        """Position of ``word`` by binary search, or -1."""
+        key = word.encode("utf-8")
+        lo, hi = 0, self._count
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if self._word_bytes(mid) < key:
+                lo = mid + 1
+            else:
+                hi = mid
+        if lo < self._count and self._word_bytes(lo) == key:
+            return lo
+        return -1
+
+    def word_at(self, position: int) -> str:
+        if not 0 <= position < self._count:
+            raise IndexError(position)
+        return self._word_bytes(position).decode("utf-8")
+
+    def record_at(self, position: int) -> Dict[str, str]:
+        """Decode the fields of one word."""
+        first = position * len(self.fields)
+        offsets = self._text_offsets[first:first + len(self.fields) + 1]
+        heap = self._text_heap
+        return {
+            field: self._mm[heap + offsets[i]:heap + offsets[i + 1]].decode("utf-8")
+            for i, field in enumerate(self.fields)
+        }
+
+    def close(self):
+        self._word_offsets.release()
+        self._text_offsets.release()
+        for positions in self.buckets.values():
+            positions.release()
+        self._view.release()
+        self._mm.close()
+
+
+def open_word_store(json_file: str, store_file: Optional[str] = None) -> WordStore:
+    """Open the compiled store for ``json_file``, rebuilding it if it is older."""
+    store_file = store_file or os.path.splitext(json_file)[0] + ".bin"
+    if not os.path.exists(store_file) or os.path.getmtime(store_file) < os.path.getmtime(json_file):
+        build_word_store(json_file, store_file)
+    return WordStore(store_file)
+
+
+def main():
+    data_dir = os.path.join(os.path.dirname(__file__), "..", "data")
+    parser = argparse.ArgumentParser(description="Compile the words JSON into a memory-mappable store.")
+    parser.add_argument("command", choices=["build"])
+    parser.add_argument("--json", default=os.path.join(data_dir, "words_with_hint.json"))
+    parser.add_argument("--out", default=None, help="defaults to the JSON path with a .bin extension")
+    args = parser.parse_args()
+
+    out_file = args.out or os.path.splitext(args.json)[0] + ".bin"
+    count = build_word_store(args.json, out_file)
+    print(f"Wrote {count} words to {out_file}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,64 @@
+"""Minimal in-process ASGI HTTP driver for benchmarks.
+
+Calls the application directly, without sockets or an HTTP client
+library, so timings measure the app and not the transport.
+"""
+
+import json
+from typing import Dict, Optional, Tuple
+from urllib.parse import urlencode
+
+
+async def request(app, method: str, path: str, body=None, params: Optional[Dict] = None,
+                  headers: Optional[Dict[str, str]] = None) -> Tuple[int, Dict[str, str], bytes]:
+    """Send one request and return ``(status, headers, body)``."""
+    payload = b""
+    raw_headers = [(k.lower().encode(), v.encode()) for k, v in (headers or {}).items()]
+    if body is not None:
+        payload = json.dumps(body).encode()
+        raw_headers.append((b"content-type", b"application/json"))
+    raw_headers.append((b"content-length", str(len(payload)).encode()))
+
+    scope = {
+        "type": "http",
+        "asgi": {"version": "3.0"},
+        "http_version": "1.1",
+        "method": method,
+        "scheme": "http",
+        "path": path,
+        "raw_path": path.encode(),
+        "query_string": urlencode(params or {}).encode(),
+        "headers": raw_headers,
+        "client": ("127.0.0.1", 50000),
+        "server": ("testserver", 80),
+        "root_path": "",
+    }
+    sent = False
+    response = {"status": 0, "headers": {}, "body": bytearray()}
+
+    async def receive():
+        nonlocal sent
+        if not sent:
+            sent = True
+            return {"type": "http.request", "body": payload, "more_body": False}
+        return {"type": "http.disconnect"}
+
+    async def send(message):
+        if message["type"] == "http.response.start":
+            response["status"] = message["status"]
+            response["headers"] = {k.decode(): v.decode() for k, v in message.get("headers", [])}
+        elif message["type"] == "http.response.body":
+            response["body"] += message.get("body", b"")
+
+    await app(scope, receive, send)
+    return response["status"], response["headers"], bytes(response["body"])
+
+
+async def get_json(app, path: str, **kwargs):
+    status, _, body = await request(app, "GET", path, **kwargs)
+    return status, json.loads(body) if body else None
+
+
+async def post_json(app, path: str, body, **kwargs):
+    status, _, payload = await request(app, "POST", path, body=body, **kwargs)
+    return status, json.loads(payload) if payload else None
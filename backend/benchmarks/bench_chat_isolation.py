@@ -0,0 +1,106 @@
+"""Check that a saturated /chat does not slow down the game routes.
+
+Replaces the chat provider with a fake that blocks for ``--delay`` seconds,
+floods /chat with concurrent requests and meanwhile times POST /game/start.
+The same flood is then sent to a handler that calls the provider directly
+on the event loop, the way /chat used to, for comparison.
+
+Usage (from the backend directory):
+    python -m benchmarks.bench_chat_isolation [--delay 0.5] [--chat-requests 64] [--game-requests 200]
+"""
+
+import argparse
+import asyncio
+import statistics
+import time
+from collections import Counter
+
+from app.chat_gateway import ChatProvider
+from app import routes
+from app.main import app
+from app.routes import ChatRequest
+from benchmarks.asgi import post_json
+
+
+class SlowProvider(ChatProvider):
+    """Blocks like a synchronous SDK call would."""
+
+    def __init__(self, delay: float):
+        self.delay = delay
+
+    def generate(self, message: str) -> str:
+        time.sleep(self.delay)
+        return f"echo: {message}"
+
+
+def percentile(samples, fraction: float) -> float:
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * fraction))]
+
+
+async def time_game_route(count: int, interval: float = 0.01):
+    """Latency of POST /game/start issued on a fixed schedule.
+
+    Measured from the scheduled send time, so time spent waiting for a
+    blocked event loop counts against the request.
+    """
+    latencies = []
+    first = time.perf_counter()
+    for i in range(count):
+        scheduled = first + i * interval
+        await asyncio.sleep(max(0.0, scheduled - time.perf_counter()))
+        status, _ = await post_json(app, "/game/start", {"difficulty": "medium"})
+        latencies.append((time.perf_counter() - scheduled) * 1000)
+        assert status == 200, status
+    return latencies
+
+
+async def send_chat(path: str, i: int, spacing: float):
+    await asyncio.sleep(i * spacing)
+    return await post_json(app, path, {"message": f"hi {i}"})
+
+
+async def run_phase(label: str, chat_path, chat_requests: int, game_requests: int, spacing: float = 0.0):
+    flood = [asyncio.create_task(send_chat(chat_path, i, spacing))
+             for i in range(chat_requests)] if chat_path else []
+    await asyncio.sleep(0.05)
+    latencies = await time_game_route(game_requests)
+    statuses = Counter(status for status, _ in await asyncio.gather(*flood))
+    print(f"{label:<26} p50 {statistics.median(latencies):>8.2f} ms  p95 {percentile(latencies, 0.95):>8.2f} ms"
+          f"  max {max(latencies):>8.2f} ms  chat statuses {dict(statuses) or '-'}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--delay", type=float, default=0.5, help="seconds each fake provider call blocks")
+    parser.add_argument("--chat-requests", type=int, default=64)
+    parser.add_argument("--game-requests", type=int, default=200)
+    args = parser.parse_args()
+
+    routes.init_services()
+    chat_gateway = routes.chat_gateway
+    provider = SlowProvider(args.delay)
+    chat_gateway.provider = provider
+
+    async def blocking_chat(request: ChatRequest):
+        return {"reply": provider.generate(request.message)}
+
+    app.add_api_route("/bench/blocking-chat", blocking_chat, methods=["POST"])
+
+    print(f"gateway: {chat_gateway.max_concurrency} concurrent, {chat_gateway.max_queue} queued, "
+          f"{chat_gateway.timeout:g}s timeout; provider delay {args.delay:g}s")
+
+    async def run():
+        await run_phase("idle", None, 0, args.game_requests)
+        await run_phase("/chat saturated", "/chat", args.chat_requests, args.game_requests)
+        # Spaced out so the blocked calls overlap the timed game requests
+        await run_phase("blocking handler flooded", "/bench/blocking-chat",
+                        min(args.chat_requests, 8), args.game_requests, spacing=args.delay)
+        print(f"gateway counters: {chat_gateway.stats()}")
+
+    asyncio.run(run())
+    routes.close_services()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,83 @@
+"""Micro-benchmark spelling feedback against the original list-based loop.
+
+Also checks that both implementations agree on every generated pair.
+
+Usage (from the backend directory):
+    python -m benchmarks.bench_feedback [--pairs 200000] [--distinct 5000]
+"""
+
+import argparse
+import random
+import string
+import time
+
+from app.feedback import batch_feedback, feedback_codes, render_feedback
+
+
+def legacy_feedback(guess: str, correct_word: str):
+    """The feedback loop GameService.get_feedback used before the count table."""
+    guess = guess.lower().strip()
+    correct_word = correct_word.lower()
+
+    if len(guess) != len(correct_word):
+        return ["⬛"] * len(correct_word)
+
+    feedback = []
+    correct_letters = list(correct_word)
+
+    for i, letter in enumerate(guess):
+        if letter == correct_word[i]:
+            feedback.append("🟩")
+            correct_letters[i] = None
+        else:
+            feedback.append("⬛")
+
+    for i, letter in enumerate(guess):
+        if feedback[i] == "⬛":
+            if letter in correct_letters:
+                feedback[i] = "🟨"
+                correct_letters[correct_letters.index(letter)] = None
+
+    return feedback
+
+
+def misspell(word: str) -> str:
+    """A plausible player guess: swap, replace or keep letters."""
+    letters = list(word)
+    for _ in range(random.randint(0, 3)):
+        i = random.randrange(len(letters))
+        if random.random() < 0.5 and len(letters) > 1:
+            j = random.randrange(len(letters))
+            letters[i], letters[j] = letters[j], letters[i]
+        else:
+            letters[i] = random.choice("aeioulnrst")
+    return "".join(letters)
+
+
+def timed(label: str, fn, count: int):
+    start = time.perf_counter()
+    fn()
+    elapsed = time.perf_counter() - start
+    print(f"{label:<28} {elapsed * 1000:>9.1f} ms  {count / elapsed / 1e6:>6.2f} M pairs/s")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--pairs", type=int, default=200_000)
+    parser.add_argument("--distinct", type=int, default=5_000, help="distinct (guess, answer) pairs in the log")
+    args = parser.parse_args()
+
+    answers = ["".join(random.choices(string.ascii_lowercase, k=random.randint(3, 13))) for _ in range(500)]
+    distinct = [(misspell(answer), answer) for answer in random.choices(answers, k=args.distinct)]
+    pairs = random.choices(distinct, k=args.pairs)
+
+    mismatches = sum(legacy_feedback(*pair) != render_feedback(feedback_codes(*pair)) for pair in distinct)
+    print(f"parity check: {len(distinct)} distinct pairs, {mismatches} mismatches")
+
+    timed("legacy loop", lambda: [legacy_feedback(g, a) for g, a in pairs], len(pairs))
+    timed("count table, per pair", lambda: [feedback_codes(g, a) for g, a in pairs], len(pairs))
+    timed("count table, batched", lambda: batch_feedback(pairs), len(pairs))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,80 @@
+"""Compare bulk NDJSON import with submitting the same rows one by one.
+
+"per-row" calls ``add_entry`` for each row, as the API does; "bulk" runs
+``import_ndjson``, which validates every line and ingests them in batches
+with the indexes rebuilt once. Per-row inserts are timed on a sample and
+reported as rows per second.
+
+Usage (from the backend directory):
+    python -m benchmarks.bench_leaderboard_import [--rows 100000] [--per-row-rows 2000]
+"""
+
+import argparse
+import json
+import os
+import shutil
+import tempfile
+import time
+from datetime import datetime
+
+from app import config
+from app.leaderboard_service import LeaderboardDataService
+from app.leaderboard_sqlite import SqliteLeaderboardService
+from app.leaderboard_transfer import import_ndjson
+from app.models import LeaderboardEntry
+from benchmarks.bench_leaderboard_submit import synthetic_entry
+
+
+def open_service(backend: str, data_dir: str):
+    if backend == "sqlite":
+        return SqliteLeaderboardService(db_path=os.path.join(data_dir, "leaderboard.db"),
+                                        json_file=os.path.join(data_dir, "leaderboard.json"))
+    return LeaderboardDataService(data_dir=data_dir, durability=backend)
+
+
+def per_row(backend: str, rows: list) -> float:
+    data_dir = tempfile.mkdtemp(prefix="orthoplay-bench-")
+    service = open_service(backend, data_dir)
+    entries = [LeaderboardEntry(**{**row, "timestamp": datetime.fromisoformat(row["timestamp"])}) for row in rows]
+    start = time.perf_counter()
+    for entry in entries:
+        service.add_entry(entry)
+    elapsed = time.perf_counter() - start
+    service.close()
+    shutil.rmtree(data_dir)
+    return len(rows) / elapsed
+
+
+def bulk(backend: str, lines: list) -> float:
+    data_dir = tempfile.mkdtemp(prefix="orthoplay-bench-")
+    service = open_service(backend, data_dir)
+    start = time.perf_counter()
+    report = import_ndjson(service, lines)
+    elapsed = time.perf_counter() - start
+    assert report.imported == len(lines) and service.get_total_games() == len(lines)
+    service.close()
+    shutil.rmtree(data_dir)
+    return len(lines) / elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=100000)
+    parser.add_argument("--per-row-rows", type=int, default=2000)
+    args = parser.parse_args()
+
+    # Keep compaction out of the measured window
+    config.LEADERBOARD_COMPACT_INTERVAL = 3600
+    config.LEADERBOARD_COMPACT_THRESHOLD = 10 ** 9
+
+    rows = [synthetic_entry(i) for i in range(args.rows)]
+    lines = [json.dumps(row) + "\n" for row in rows]
+    print(f"{'backend':<10} {'per-row/s':>10} {'bulk/s':>10} {'speedup':>8}")
+    for backend in ("snapshot", "journal", "sqlite"):
+        slow = per_row(backend, rows[:args.per_row_rows])
+        fast = bulk(backend, lines)
+        print(f"{backend:<10} {slow:>10.0f} {fast:>10.0f} {fast / slow:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
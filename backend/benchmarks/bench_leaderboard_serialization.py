@@ -0,0 +1,94 @@
+"""Compare per-row model validation with direct encoding for leaderboard pages.
+
+"models" is the previous /leaderboard path: build ``LeaderboardEntry`` for
+every row and let FastAPI validate and serialize ``LeaderboardResponse``.
+"encoded" is the current path: stored rows encoded straight to JSON bytes.
+Both are timed for the serialization step alone and end to end through the
+ASGI app, with the response cache disabled. Every compared body is also
+checked for equality.
+
+Usage (from the backend directory):
+    python -m benchmarks.bench_leaderboard_serialization [--entries 1000] [--limit 100] [--rounds 2000]
+"""
+
+import argparse
+import asyncio
+import json
+import shutil
+import time
+from typing import Optional
+
+from fastapi import Query
+
+from app import routes
+from app.leaderboard_encoding import encode_leaderboard_response
+from app.leaderboard_service import LeaderboardDataService
+from app.main import app
+from app.models import LeaderboardEntry, LeaderboardResponse
+from benchmarks.asgi import request
+from benchmarks.bench_leaderboard_submit import seed_data_dir
+
+
+def timed(label: str, fn, rounds: int) -> float:
+    fn()
+    start = time.perf_counter()
+    for _ in range(rounds):
+        fn()
+    per_call = (time.perf_counter() - start) / rounds * 1e6
+    print(f"{label:<34} {per_call:>9.1f} µs/page")
+    return per_call
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--entries", type=int, default=1000)
+    parser.add_argument("--limit", type=int, default=100)
+    parser.add_argument("--rounds", type=int, default=2000)
+    args = parser.parse_args()
+
+    data_dir = seed_data_dir(args.entries)
+    service = LeaderboardDataService(data_dir=data_dir, max_entries=args.entries)
+    routes.init_services(leaderboard=service)
+    routes.response_cache.max_bytes = 0
+    total = service.get_total_entries()
+
+    def models_body() -> bytes:
+        entries = [LeaderboardEntry(**entry) for entry in service.get_leaderboard(limit=args.limit)]
+        response = LeaderboardResponse(entries=entries, total_entries=total)
+        # What response_model adds on top: validate again, then serialize
+        return LeaderboardResponse.model_validate(response.model_dump()).model_dump_json().encode()
+
+    def encoded_body() -> bytes:
+        return encode_leaderboard_response(service.get_leaderboard_encoded(limit=args.limit), total)
+
+    assert json.loads(models_body()) == json.loads(encoded_body()), "bodies differ"
+
+    async def legacy_leaderboard(limit: int = Query(50, ge=1, le=100), username: Optional[str] = Query(None)):
+        entries = [LeaderboardEntry(**entry) for entry in service.get_leaderboard(limit=limit)]
+        return LeaderboardResponse(entries=entries, total_entries=service.get_total_entries())
+
+    app.add_api_route("/bench/legacy-leaderboard", legacy_leaderboard, methods=["GET"],
+                      response_model=LeaderboardResponse)
+
+    def http(path: str):
+        return lambda: asyncio.run(request(app, "GET", path, params={"limit": args.limit}))
+
+    _, _, legacy = http("/bench/legacy-leaderboard")()
+    _, _, current = http("/leaderboard")()
+    # The legacy route predates cursors
+    assert json.loads(legacy) == {**json.loads(current), "next_cursor": None}, "HTTP bodies differ"
+
+    print(f"{args.entries} stored entries, {args.limit}-row pages, {args.rounds} rounds")
+    before = timed("serialize: models", models_body, args.rounds)
+    after = timed("serialize: encoded", encoded_body, args.rounds)
+    print(f"{'':<34} {before / after:>9.1f}x")
+    before = timed("GET /leaderboard: models", http("/bench/legacy-leaderboard"), args.rounds // 4)
+    after = timed("GET /leaderboard: encoded", http("/leaderboard"), args.rounds // 4)
+    print(f"{'':<34} {before / after:>9.1f}x")
+
+    service.close()
+    shutil.rmtree(data_dir)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,86 @@
+"""Benchmark leaderboard score submission throughput.
+
+Compares the snapshot path (full rewrite of leaderboard.json per submission)
+with the append-only journal path at several leaderboard sizes.
+
+Usage (from the backend directory):
+    python -m benchmarks.bench_leaderboard_submit [--sizes 1000 10000 100000] [--seconds 3]
+"""
+
+import argparse
+import json
+import os
+import random
+import shutil
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+from app import config
+from app.leaderboard_service import LeaderboardDataService
+from app.models import LeaderboardEntry
+
+
+def synthetic_entry(i: int) -> dict:
+    """A plausible stored leaderboard row."""
+    return {
+        "username": f"player_{i % 5000}",
+        "word": "benchmark",
+        "score": random.randint(100, 1900),
+        "attempts": random.randint(1, 8),
+        "hints_used": random.randint(0, 3),
+        "completion_time": round(random.uniform(5, 300), 3),
+        "timestamp": (datetime.now() - timedelta(seconds=random.randint(0, 90 * 86400))).isoformat(),
+        "word_length": 9,
+    }
+
+
+def seed_data_dir(size: int) -> str:
+    """Create a data directory holding a leaderboard of ``size`` entries."""
+    data_dir = tempfile.mkdtemp(prefix="orthoplay-bench-")
+    entries = sorted((synthetic_entry(i) for i in range(size)),
+                     key=lambda x: (-x["score"], x["completion_time"]))
+    now = datetime.now().isoformat()
+    with open(os.path.join(data_dir, "leaderboard.json"), "w", encoding="utf-8") as f:
+        json.dump({"entries": entries, "metadata": {"created_at": now, "last_updated": now, "version": "1.0"}}, f)
+    return data_dir
+
+
+def run(size: int, durability: str, seconds: float) -> float:
+    """Submit entries for ``seconds`` and return submissions per second."""
+    data_dir = seed_data_dir(size)
+    service = LeaderboardDataService(data_dir=data_dir, max_entries=size, durability=durability)
+    entries = [LeaderboardEntry(**{**synthetic_entry(i), "timestamp": datetime.now()}) for i in range(2000)]
+
+    count = 0
+    start = time.perf_counter()
+    deadline = start + seconds
+    while time.perf_counter() < deadline:
+        service.add_entry(entries[count % len(entries)])
+        count += 1
+    elapsed = time.perf_counter() - start
+
+    service.close()
+    shutil.rmtree(data_dir)
+    return count / elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 10000, 100000])
+    parser.add_argument("--seconds", type=float, default=3.0)
+    args = parser.parse_args()
+
+    # Keep compaction out of the measured window
+    config.LEADERBOARD_COMPACT_INTERVAL = 3600
+    config.LEADERBOARD_COMPACT_THRESHOLD = 10 ** 9
+
+    print(f"{'entries':>10} {'snapshot/s':>12} {'journal/s':>12} {'speedup':>9}")
+    for size in args.sizes:
+        snapshot = run(size, "snapshot", args.seconds)
+        journal = run(size, "journal", args.seconds)
+        print(f"{size:>10} {snapshot:>12.1f} {journal:>12.1f} {journal / snapshot:>8.1f}x")
+
+
+if __name__ == "__main__":
+    main()
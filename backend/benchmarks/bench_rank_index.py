@@ -0,0 +1,76 @@
+"""Compare rank queries against the score rank index with full scans.
+
+"scan" is how ranks used to be found: count every entry with a higher
+score (and, for the ordinal position, every tie ahead of the entry).
+"index" asks the Fenwick-tree backed ``ScoreRankIndex`` kept by
+``LeaderboardIndex``. Every answer is checked against the scan.
+
+Usage (from the backend directory):
+    python -m benchmarks.bench_rank_index [--sizes 1000 10000 100000] [--queries 2000]
+"""
+
+import argparse
+import random
+import time
+
+from app.leaderboard_index import LeaderboardIndex, sort_key
+from benchmarks.bench_leaderboard_submit import synthetic_entry
+
+
+def timed(fn, queries) -> float:
+    start = time.perf_counter()
+    for query in queries:
+        fn(query)
+    return (time.perf_counter() - start) / len(queries) * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 10000, 100000])
+    parser.add_argument("--queries", type=int, default=2000)
+    args = parser.parse_args()
+
+    print(f"{'entries':>8} {'query':<18} {'scan µs':>10} {'index µs':>10} {'speedup':>8}")
+    for size in args.sizes:
+        index = LeaderboardIndex(max_entries=size)
+        start = time.perf_counter()
+        for i in range(size):
+            index.add(synthetic_entry(i))
+        build_us = (time.perf_counter() - start) / size * 1e6
+        rows = {seq: index._rows[seq] for seq in index._rows}
+        seqs = random.choices(list(rows), k=min(args.queries, size))
+
+        def scan_competition(seq):
+            score = rows[seq]["score"]
+            return sum(1 for row in rows.values() if row["score"] > score) + 1
+
+        def scan_dense(seq):
+            score = rows[seq]["score"]
+            return len({row["score"] for row in rows.values() if row["score"] > score}) + 1
+
+        def scan_position(seq):
+            key = sort_key(rows[seq], "score", seq)
+            return sum(1 for other, row in rows.items() if sort_key(row, "score", other) > key) + 1
+
+        checks = [
+            ("competition rank", scan_competition, lambda seq: index.count_above(rows[seq]["score"]) + 1),
+            ("dense rank", scan_dense, lambda seq: index.dense_rank(rows[seq]["score"])),
+            ("position", scan_position, index.position),
+        ]
+        # Scans are slow at large sizes; a subset is enough to time them
+        scan_seqs = seqs[:max(20, 200000 // size)]
+        for name, scan, indexed in checks:
+            for seq in scan_seqs:
+                assert scan(seq) == indexed(seq), f"{name} differs for row {seq}"
+            scan_us = timed(scan, scan_seqs)
+            index_us = timed(indexed, seqs)
+            print(f"{size:>8} {name:<18} {scan_us:>10.1f} {index_us:>10.2f} {scan_us / index_us:>7.0f}x")
+
+        positions = [index.position(seq) for seq in seqs]
+        assert all(index.seq_at(position) == seq for position, seq in zip(positions, seqs))
+        print(f"{size:>8} {'entry at rank':<18} {'':>10} {timed(index.seq_at, positions):>10.2f}")
+        print(f"{size:>8} {'insert':<18} {'':>10} {build_us:>10.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,114 @@
+"""Startup time and memory of the JSON and memory-mapped word datasets.
+
+For each size a synthetic ``words_with_hint.json`` is generated and compiled
+once; each measurement then runs in a fresh interpreter that constructs a
+``WordService`` (dataset load plus word index) and looks up random words.
+"private" is the process's private memory (Linux ``smaps_rollup``), i.e.
+what each additional forked worker would cost; mapped pages of the store
+are shared and show up in RSS only.
+
+Usage (from the backend directory):
+    python -m benchmarks.bench_word_store [--sizes 1000 100000 1000000]
+"""
+
+import argparse
+import json
+import os
+import random
+import shutil
+import string
+import subprocess
+import sys
+import tempfile
+import time
+
+from app.word_store import build_word_store
+
+PROBE = r"""
+import json, random, sys, time
+
+def memory():
+    values = {}
+    try:
+        with open("/proc/self/smaps_rollup") as f:
+            for line in f:
+                name, _, rest = line.partition(":")
+                if name in ("Rss", "Private_Clean", "Private_Dirty"):
+                    values[name] = int(rest.split()[0])
+    except OSError:
+        import resource
+        values["Rss"] = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return values.get("Rss", 0), values.get("Private_Clean", 0) + values.get("Private_Dirty", 0)
+
+from app.services import WordService
+rss0, private0 = memory()
+start = time.perf_counter()
+service = WordService(words_file=sys.argv[1], word_store=sys.argv[2])
+startup = time.perf_counter() - start
+rss1, private1 = memory()
+
+words = [service.get_random_word() for _ in range(2000)]
+start = time.perf_counter()
+for word in words:
+    service.get_word_data(word)
+lookup = (time.perf_counter() - start) / len(words)
+print(json.dumps({"startup": startup, "rss_kb": rss1 - rss0, "private_kb": private1 - private0, "lookup": lookup,
+                  "loaded": type(service.words).__name__}))
+"""
+
+
+def synthetic_words(count: int) -> dict:
+    def sentence(words: int) -> str:
+        return " ".join("".join(random.choices(string.ascii_lowercase, k=random.randint(2, 9)))
+                        for _ in range(words))
+
+    words = {}
+    while len(words) < count:
+        word = "".join(random.choices(string.ascii_lowercase, k=random.randint(4, 12)))
+        words[word] = {
+            "description": sentence(6),
+            "sentence": sentence(14),
+            "hint1": sentence(9),
+            "hint2": sentence(11),
+            "hint3": sentence(10),
+        }
+    return words
+
+
+def probe(words_file: str, mode: str) -> dict:
+    output = subprocess.run(
+        [sys.executable, "-c", PROBE, words_file, mode],
+        cwd=os.path.join(os.path.dirname(__file__), ".."), capture_output=True, text=True, check=True,
+    ).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 100_000, 1_000_000])
+    args = parser.parse_args()
+
+    print(f"{'words':>9} {'format':<6} {'startup':>10} {'RSS':>10} {'private':>10} {'lookup':>9}")
+    for size in args.sizes:
+        data_dir = tempfile.mkdtemp(prefix="orthoplay-words-")
+        words_file = os.path.join(data_dir, "words_with_hint.json")
+        with open(words_file, "w", encoding="utf-8") as f:
+            json.dump(synthetic_words(size), f)
+
+        start = time.perf_counter()
+        build_word_store(words_file, os.path.splitext(words_file)[0] + ".bin")
+        build = time.perf_counter() - start
+
+        for mode in ("json", "mmap"):
+            result = probe(words_file, mode)
+            assert result["loaded"] == ("WordStore" if mode == "mmap" else "dict"), result
+            print(f"{size:>9} {mode:<6} {result['startup'] * 1000:>8.1f}ms {result['rss_kb'] / 1024:>8.1f}MB "
+                  f"{result['private_kb'] / 1024:>8.1f}MB {result['lookup'] * 1e6:>7.1f}µs")
+        print(f"{'':>9} build step {build * 1000:.0f}ms, "
+              f"{os.path.getsize(words_file) / 2**20:.1f}MB JSON -> "
+              f"{os.path.getsize(os.path.splitext(words_file)[0] + '.bin') / 2**20:.1f}MB store")
+        shutil.rmtree(data_dir)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,78 @@
+"""Guard the cold-start import cost of the API process.
+
+Runs ``python -X importtime -c "import app.main"`` in a fresh interpreter,
+prints the slowest modules and fails (exit status 1) when the module's
+cumulative import time exceeds the budget or when a module that should
+only load on first use (the Gemini SDK, requests, sqlite3) is imported
+eagerly.
+
+Usage (from the backend directory):
+    python -m benchmarks.check_import_time [--budget-ms 1500] [--runs 3] [--top 15]
+"""
+
+import argparse
+import os
+import subprocess
+import sys
+from typing import Dict, List, Tuple
+
+# Modules that must stay out of the import-time path
+LAZY_MODULES = ("google.generativeai", "requests", "sqlite3")
+
+
+def import_times(module: str) -> List[Tuple[str, int, int]]:
+    """``(module, self_us, cumulative_us)`` for every module imported."""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=os.path.join(os.path.dirname(__file__), ".."), capture_output=True, text=True, check=True,
+    )
+    rows = []
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|")
+        rows.append((name.strip(), int(self_us), int(cumulative_us)))
+    return rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--module", default="app.main")
+    parser.add_argument("--budget-ms", type=float, default=1500.0)
+    parser.add_argument("--runs", type=int, default=3, help="the fastest run is compared with the budget")
+    parser.add_argument("--top", type=int, default=15)
+    args = parser.parse_args()
+
+    best_total = None
+    best_rows: List[Tuple[str, int, int]] = []
+    for _ in range(args.runs):
+        rows = import_times(args.module)
+        # Cumulative time of the module itself, excluding interpreter startup
+        total = next(cumulative_us for name, _, cumulative_us in rows if name == args.module) / 1000
+        if best_total is None or total < best_total:
+            best_total, best_rows = total, rows
+
+    print(f"Slowest imports of {args.module} (cumulative):")
+    top_level: Dict[str, int] = {}
+    for name, _, cumulative_us in best_rows:
+        if "." not in name or name.startswith("app."):
+            top_level[name] = max(top_level.get(name, 0), cumulative_us)
+    for name, cumulative_us in sorted(top_level.items(), key=lambda item: -item[1])[:args.top]:
+        print(f"  {cumulative_us / 1000:>8.1f} ms  {name}")
+
+    failures = []
+    imported = {name for name, _, _ in best_rows}
+    for module in LAZY_MODULES:
+        if module in imported:
+            failures.append(f"{module} is imported eagerly")
+    if best_total > args.budget_ms:
+        failures.append(f"import time {best_total:.0f} ms exceeds the {args.budget_ms:.0f} ms budget")
+
+    print(f"Total import time: {best_total:.0f} ms (budget {args.budget_ms:.0f} ms)")
+    for failure in failures:
+        print(f"FAIL: {failure}")
+    sys.exit(1 if failures else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,370 @@
+"""End-to-end load test of the game API.
+
+Drives the FastAPI app in-process through its ASGI interface (or a running
+server with ``--url``) with closed-loop workers and reports throughput and
+p50/p95/p99 latency per operation. Scenarios:
+
+- ``game``: start, guess-length, two wrong spellings and the right one,
+  use-hint and leaderboard submit
+- ``leaderboard``: GET /leaderboard over every time_filter/sort_by/sort_order
+  combination at varying offsets
+- ``pages``: GET /leaderboard following ``next_cursor`` through each view,
+  timed separately for the first page, pages 2-9 and pages 10 and deeper
+- ``stats``: GET /app/stats
+
+In-process runs are repeated for each synthetic leaderboard size and each
+concurrency level. Results are written as JSON so runs from different
+commits can be compared with ``--compare``.
+
+Usage (from the backend directory):
+    python -m benchmarks.loadtest [--sizes 1000 100000 1000000] [--concurrency 1 16 64]
+                                  [--duration 5] [--backend json|sqlite] [--no-response-cache]
+                                  [--output results.json]
+    python -m benchmarks.loadtest --url http://127.0.0.1:8000 --concurrency 16
+    python -m benchmarks.loadtest --compare before.json after.json [--threshold 0.1]
+"""
+
+import argparse
+import asyncio
+import http.client
+import itertools
+import json
+import os
+import platform
+import random
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+from collections import defaultdict
+from datetime import datetime
+from typing import Dict, List, Optional, Tuple
+from urllib.parse import urlencode, urlsplit
+
+from benchmarks.bench_feedback import misspell
+
+TIME_FILTERS = ("all", "daily", "weekly", "monthly")
+SORT_FIELDS = ("score", "attempts", "completion_time", "timestamp")
+SORT_ORDERS = ("desc", "asc")
+SCENARIOS = ("game", "leaderboard", "pages", "stats")
+
+
+class InProcessClient:
+    """Calls the ASGI app directly."""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def call(self, method: str, path: str, body=None, params: Optional[Dict] = None) -> Tuple[int, bytes]:
+        from benchmarks.asgi import request
+
+        status, _, payload = await request(self.app, method, path, body=body, params=params)
+        return status, payload
+
+
+class HttpClient:
+    """Calls a running server over HTTP/1.1, one connection per worker thread."""
+
+    def __init__(self, url: str):
+        parts = urlsplit(url)
+        self.host, self.port = parts.hostname, parts.port or 80
+        self.prefix = parts.path.rstrip("/")
+
+    def _call(self, method: str, path: str, body, params) -> Tuple[int, bytes]:
+        conn = http.client.HTTPConnection(self.host, self.port, timeout=30)
+        try:
+            target = self.prefix + path + (f"?{urlencode(params)}" if params else "")
+            payload = json.dumps(body).encode() if body is not None else None
+            headers = {"Content-Type": "application/json"} if payload is not None else {}
+            conn.request(method, target, body=payload, headers=headers)
+            response = conn.getresponse()
+            return response.status, response.read()
+        finally:
+            conn.close()
+
+    async def call(self, method: str, path: str, body=None, params: Optional[Dict] = None) -> Tuple[int, bytes]:
+        return await asyncio.to_thread(self._call, method, path, body, params)
+
+
+class Recorder:
+    """Latency samples and error counts per operation."""
+
+    def __init__(self):
+        self.samples: Dict[str, List[float]] = defaultdict(list)
+        self.errors: Dict[str, int] = defaultdict(int)
+        self.enabled = True
+
+    async def timed(self, client, op: str, method: str, path: str, body=None, params=None, expect=200):
+        start = time.perf_counter()
+        status, payload = await client.call(method, path, body=body, params=params)
+        if self.enabled:
+            self.samples[op].append(time.perf_counter() - start)
+            if status != expect:
+                self.errors[op] += 1
+        if status != expect:
+            raise RuntimeError(f"{method} {path} -> {status}: {payload[:200]!r}")
+        return json.loads(payload) if payload else None
+
+
+def percentile(ordered: List[float], fraction: float) -> float:
+    """Nearest-rank percentile of an already sorted list."""
+    if not ordered:
+        return 0.0
+    return ordered[min(len(ordered) - 1, max(0, int(round(fraction * len(ordered) + 0.5)) - 1))]
+
+
+def summarize(recorder: Recorder, elapsed: float) -> Dict[str, Dict]:
+    ops = {}
+    for op, samples in sorted(recorder.samples.items()):
+        ordered = sorted(samples)
+        ops[op] = {
+            "count": len(ordered),
+            "errors": recorder.errors.get(op, 0),
+            "throughput": round(len(ordered) / elapsed, 1),
+            "mean_ms": round(sum(ordered) / len(ordered) * 1000, 3),
+            "p50_ms": round(percentile(ordered, 0.50) * 1000, 3),
+            "p95_ms": round(percentile(ordered, 0.95) * 1000, 3),
+            "p99_ms": round(percentile(ordered, 0.99) * 1000, 3),
+        }
+    return ops
+
+
+async def game_flow(client, recorder: Recorder, worker: int, i: int):
+    username = f"load_{worker}_{i % 1000}"
+    game = await recorder.timed(client, "POST /game/start", "POST", "/game/start",
+                                {"difficulty": random.choice(("easy", "medium", "hard")), "username": username})
+    word_id, word = game["word_id"], game["word"]
+    await recorder.timed(client, "POST /game/guess-length", "POST", "/game/guess-length",
+                         {"word_id": word_id, "guessed_length": len(word)})
+    for guess in (misspell(word), misspell(word), word):
+        await recorder.timed(client, "POST /game/submit-spelling", "POST", "/game/submit-spelling",
+                             {"word_id": word_id, "guess": guess})
+    await recorder.timed(client, "POST /game/use-hint", "POST", "/game/use-hint", {"word_id": word_id})
+    await recorder.timed(client, "POST /leaderboard/submit", "POST", "/leaderboard/submit",
+                         {"word_id": word_id, "username": username,
+                          "completion_time": round(random.uniform(5, 120), 3)})
+
+
+LEADERBOARD_VIEWS = list(itertools.product(TIME_FILTERS, SORT_FIELDS, SORT_ORDERS))
+
+
+async def leaderboard_read(client, recorder: Recorder, worker: int, i: int):
+    time_filter, sort_by, sort_order = LEADERBOARD_VIEWS[(worker + i) % len(LEADERBOARD_VIEWS)]
+    params = {"limit": 50, "offset": random.choice((0, 0, 50, 450)), "time_filter": time_filter,
+              "sort_by": sort_by, "sort_order": sort_order}
+    op = f"GET /leaderboard {time_filter}/{sort_by}/{sort_order}"
+    await recorder.timed(client, op, "GET", "/leaderboard", params=params)
+
+
+# Per worker: (view index, cursor, page number) of its walk through the pages
+_page_walks: Dict[int, Tuple[int, Optional[str], int]] = {}
+
+
+async def leaderboard_pages(client, recorder: Recorder, worker: int, i: int):
+    view, cursor, page = _page_walks.get(worker, (worker, None, 1))
+    time_filter, sort_by, sort_order = LEADERBOARD_VIEWS[view % len(LEADERBOARD_VIEWS)]
+    params = {"limit": 50, "time_filter": time_filter, "sort_by": sort_by, "sort_order": sort_order}
+    if cursor is not None:
+        params["cursor"] = cursor
+    depth = "first page" if page == 1 else "pages 2-9" if page < 10 else "pages 10+"
+    body = await recorder.timed(client, f"GET /leaderboard cursor {depth}", "GET", "/leaderboard", params=params)
+    if body["next_cursor"] is None:
+        _page_walks[worker] = (view + 1, None, 1)
+    else:
+        _page_walks[worker] = (view, body["next_cursor"], page + 1)
+
+
+async def app_stats(client, recorder: Recorder, worker: int, i: int):
+    await recorder.timed(client, "GET /app/stats", "GET", "/app/stats")
+
+
+SCENARIO_FUNCTIONS = {
+    "game": game_flow, "leaderboard": leaderboard_read, "pages": leaderboard_pages, "stats": app_stats,
+}
+
+
+async def run_scenario(client, scenario: str, concurrency: int, duration: float, warmup: float) -> Dict:
+    recorder = Recorder()
+    step = SCENARIO_FUNCTIONS[scenario]
+    failures = []
+    _page_walks.clear()
+
+    async def worker(n: int, until: float):
+        i = 0
+        while time.perf_counter() < until:
+            try:
+                await step(client, recorder, n, i)
+            except Exception as e:
+                if len(failures) < 5:
+                    failures.append(str(e))
+            i += 1
+
+    if warmup > 0:
+        recorder.enabled = False
+        until = time.perf_counter() + warmup
+        await asyncio.gather(*(worker(n, until) for n in range(concurrency)))
+        recorder.enabled = True
+
+    start = time.perf_counter()
+    await asyncio.gather(*(worker(n, start + duration) for n in range(concurrency)))
+    elapsed = time.perf_counter() - start
+
+    ops = summarize(recorder, elapsed)
+    if scenario == "leaderboard":
+        # One aggregate line for the console; per-view numbers stay in the JSON
+        combined = Recorder()
+        combined.samples["GET /leaderboard"] = [s for op, v in recorder.samples.items() for s in v]
+        combined.errors["GET /leaderboard"] = sum(recorder.errors.values())
+        ops = {**summarize(combined, elapsed), "views": ops}
+    return {"elapsed": round(elapsed, 3), "ops": ops, "failures": failures}
+
+
+def seed_leaderboard(size: int, backend: str, data_dir: str):
+    """A leaderboard service over ``size`` synthetic entries in ``data_dir``."""
+    from benchmarks.bench_leaderboard_submit import synthetic_entry
+
+    entries = sorted((synthetic_entry(i) for i in range(size)), key=lambda x: (-x["score"], x["completion_time"]))
+    now = datetime.now().isoformat()
+    with open(os.path.join(data_dir, "leaderboard.json"), "w", encoding="utf-8") as f:
+        json.dump({"entries": entries, "metadata": {"created_at": now, "last_updated": now, "version": "1.0"}}, f)
+
+    if backend == "sqlite":
+        from app.leaderboard_sqlite import SqliteLeaderboardService
+        return SqliteLeaderboardService(db_path=os.path.join(data_dir, "leaderboard.db"), max_entries=size)
+    from app.leaderboard_service import LeaderboardDataService
+    return LeaderboardDataService(data_dir=data_dir, max_entries=size)
+
+
+def print_run(run: Dict):
+    print(f"\n[{run['scenario']}] size={run['size']} concurrency={run['concurrency']} ({run['elapsed']}s)")
+    for op, stats in run["ops"].items():
+        if op == "views":
+            continue
+        print(f"  {op:<32} {stats['throughput']:>9.1f} req/s  p50 {stats['p50_ms']:>8.2f}  "
+              f"p95 {stats['p95_ms']:>8.2f}  p99 {stats['p99_ms']:>8.2f} ms  errors {stats['errors']}")
+    for failure in run["failures"]:
+        print(f"  ! {failure}")
+
+
+def git_commit() -> Optional[str]:
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True,
+                              check=True).stdout.strip()
+    except Exception:
+        return None
+
+
+def run_suite(args) -> Dict:
+    results = {
+        "meta": {
+            "commit": git_commit(),
+            "started_at": datetime.now().isoformat(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "target": args.url or "in-process",
+            "backend": None if args.url else args.backend,
+            "response_cache": not args.no_response_cache,
+            "duration": args.duration,
+        },
+        "runs": [],
+    }
+
+    if args.url:
+        client = HttpClient(args.url)
+        for concurrency in args.concurrency:
+            for scenario in args.scenarios:
+                run = asyncio.run(run_scenario(client, scenario, concurrency, args.duration, args.warmup))
+                run.update(scenario=scenario, size=None, concurrency=concurrency)
+                print_run(run)
+                results["runs"].append(run)
+        return results
+
+    from app import routes
+    from app.main import app
+
+    client = InProcessClient(app)
+    for size in args.sizes:
+        data_dir = tempfile.mkdtemp(prefix="orthoplay-load-")
+        start = time.perf_counter()
+        leaderboard = seed_leaderboard(size, args.backend, data_dir)
+        print(f"\nSeeded {size} entries ({args.backend}) in {time.perf_counter() - start:.1f}s")
+        routes.init_services(leaderboard=leaderboard)
+        if args.no_response_cache:
+            routes.response_cache.max_bytes = 0
+        try:
+            for concurrency in args.concurrency:
+                for scenario in args.scenarios:
+                    run = asyncio.run(run_scenario(client, scenario, concurrency, args.duration, args.warmup))
+                    run.update(scenario=scenario, size=size, concurrency=concurrency)
+                    print_run(run)
+                    results["runs"].append(run)
+        finally:
+            routes.close_services()
+            shutil.rmtree(data_dir, ignore_errors=True)
+    return results
+
+
+def compare(before_file: str, after_file: str, threshold: float) -> int:
+    """Print per-operation changes; returns the number of regressions."""
+    with open(before_file) as f:
+        before = json.load(f)
+    with open(after_file) as f:
+        after = json.load(f)
+
+    def index(results):
+        table = {}
+        for run in results["runs"]:
+            for op, stats in run["ops"].items():
+                if op != "views":
+                    table[(run["scenario"], run["size"], run["concurrency"], op)] = stats
+        return table
+
+    old, new = index(before), index(after)
+    print(f"{before['meta'].get('commit')} -> {after['meta'].get('commit')} (regression threshold {threshold:.0%})")
+    regressions = 0
+    for key in sorted(set(old) & set(new), key=str):
+        scenario, size, concurrency, op = key
+        p95_change = new[key]["p95_ms"] / old[key]["p95_ms"] - 1 if old[key]["p95_ms"] else 0.0
+        rate_change = new[key]["throughput"] / old[key]["throughput"] - 1 if old[key]["throughput"] else 0.0
+        # Sub-0.1 ms p95 differences are timer noise, not regressions
+        slower = p95_change > threshold and new[key]["p95_ms"] - old[key]["p95_ms"] > 0.1
+        regressed = slower or rate_change < -threshold
+        regressions += regressed
+        print(f"{'REGRESSION' if regressed else '':<11}{scenario:<12} size={size!s:<8} c={concurrency:<4} {op:<30} "
+              f"p95 {old[key]['p95_ms']:>8.2f} -> {new[key]['p95_ms']:>8.2f} ms ({p95_change:+.0%})  "
+              f"req/s {old[key]['throughput']:>8.1f} -> {new[key]['throughput']:>8.1f} ({rate_change:+.0%})")
+    for key in sorted(set(old) ^ set(new), key=str):
+        print(f"{'':<11}only in {'before' if key in old else 'after'}: {key}")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 100_000])
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 16])
+    parser.add_argument("--scenarios", nargs="+", choices=SCENARIOS, default=list(SCENARIOS))
+    parser.add_argument("--duration", type=float, default=5.0, help="measured seconds per scenario")
+    parser.add_argument("--warmup", type=float, default=1.0, help="unmeasured seconds before each scenario")
+    parser.add_argument("--backend", choices=["json", "sqlite"], default="json")
+    parser.add_argument("--no-response-cache", action="store_true", help="measure reads without the response cache")
+    parser.add_argument("--url", help="load a running server instead of the in-process app")
+    parser.add_argument("--output", help="write JSON results to this file")
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--compare", nargs=2, metavar=("BEFORE", "AFTER"), help="compare two result files")
+    parser.add_argument("--threshold", type=float, default=0.1, help="relative change reported as a regression")
+    args = parser.parse_args()
+
+    if args.compare:
+        sys.exit(1 if compare(*args.compare, args.threshold) else 0)
+
+    random.seed(args.seed)
+    results = run_suite(args)
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(results, f, indent=2)
+        print(f"\nResults written to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,140 @@
+"""Stress leaderboard writes from several processes sharing one data directory.
+
+Each worker process opens its own leaderboard service, as a
+``uvicorn --workers N`` worker would, and submits its share of uniquely
+named games while the others do the same. Compaction, archive seals and
+merges are made frequent so they race with the submissions. Afterwards
+every worker must see every game, and a fresh service must find each game
+exactly once: in the retained entries (kept large enough to hold them all),
+in the total game count and in the archive. Exits non-zero on a lost or
+duplicated game.
+
+A compaction in one worker makes the others reload the snapshot, so the
+throughput reported here, with compactions this frequent, is well below
+that of the default settings.
+
+Usage (from the backend directory):
+    python -m benchmarks.stress_leaderboard_writers [--processes 4] [--entries 500] [--backends snapshot journal sqlite]
+"""
+
+import argparse
+import multiprocessing
+import os
+import shutil
+import sys
+import tempfile
+import time
+from collections import Counter
+from datetime import datetime
+
+from app import config
+from app.models import LeaderboardEntry
+from benchmarks.bench_leaderboard_submit import synthetic_entry
+
+
+def open_service(backend: str, data_dir: str, max_entries: int):
+    if backend == "sqlite":
+        from app.leaderboard_sqlite import SqliteLeaderboardService
+        return SqliteLeaderboardService(db_path=os.path.join(data_dir, "leaderboard.db"), max_entries=max_entries)
+    from app.leaderboard_service import LeaderboardDataService
+    return LeaderboardDataService(data_dir=data_dir, max_entries=max_entries, durability=backend)
+
+
+def game_id(entry: dict) -> str:
+    return entry["word"]
+
+
+def worker(backend: str, data_dir: str, number: int, entries: int, total: int, barrier, results):
+    # Make every background race happen many times during the run
+    config.LEADERBOARD_COMPACT_THRESHOLD = 50
+    config.LEADERBOARD_COMPACT_INTERVAL = 0.5
+    config.LEADERBOARD_SYNC_INTERVAL = 0.05
+    config.ARCHIVE_SEGMENT_RECORDS = 40
+    config.ARCHIVE_MERGE_RECORDS = 400
+    config.ARCHIVE_MERGE_INTERVAL = 0.05
+
+    service = open_service(backend, data_dir, total)
+    games = [
+        LeaderboardEntry(**{**synthetic_entry(i), "word": f"w{number}-{i}", "timestamp": datetime.now()})
+        for i in range(entries)
+    ]
+    barrier.wait()
+    start = time.perf_counter()
+    accepted = sum(service.add_entry(game) for game in games)
+    elapsed = time.perf_counter() - start
+    barrier.wait()
+    if backend != "sqlite":
+        # Reads skip catching up while another worker holds the lock
+        service.refresh(blocking=True)
+
+    seen = service.get_total_games(), len(service.get_leaderboard(limit=total + 1))
+    service.close()
+    results.put((number, accepted, elapsed, seen))
+
+
+def check(backend: str, data_dir: str, total: int) -> list:
+    """Problems found by a fresh service in what the workers left behind."""
+    service = open_service(backend, data_dir, total)
+    problems = []
+    try:
+        if service.get_total_games() != total:
+            problems.append(f"total games {service.get_total_games()} != {total}")
+        sources = {"retained": service.get_leaderboard(limit=total + 1)}
+        if backend != "sqlite":
+            sources["archive"] = list(service.iter_entries())
+        for name, entries in sources.items():
+            counts = Counter(game_id(entry) for entry in entries)
+            lost = total - len(counts)
+            duplicated = sum(1 for count in counts.values() if count > 1)
+            if lost or duplicated or len(entries) != total:
+                problems.append(f"{name}: {len(entries)} games, {lost} lost, {duplicated} duplicated")
+    finally:
+        service.close()
+    return problems
+
+
+def run(backend: str, processes: int, entries: int) -> bool:
+    data_dir = tempfile.mkdtemp(prefix="orthoplay-stress-")
+    total = processes * entries
+    context = multiprocessing.get_context("spawn")
+    barrier = context.Barrier(processes)
+    results = context.Queue()
+    workers = [
+        context.Process(target=worker, args=(backend, data_dir, number, entries, total, barrier, results))
+        for number in range(processes)
+    ]
+    for process in workers:
+        process.start()
+    reports = [results.get() for _ in workers]
+    for process in workers:
+        process.join()
+
+    problems = check(backend, data_dir, total)
+    for number, accepted, _, seen in sorted(reports):
+        if accepted != entries:
+            problems.append(f"worker {number}: {accepted} of {entries} submissions accepted")
+        if seen != (total, total):
+            problems.append(f"worker {number} saw {seen[0]} games, {seen[1]} entries, not {total}")
+    slowest = max(elapsed for _, _, elapsed, _ in reports)
+    print(f"{backend:<10} {processes:>9} {total:>7} {total / slowest:>12.0f} {'ok' if not problems else 'FAILED':>8}")
+    for problem in problems:
+        print(f"  {problem}")
+    shutil.rmtree(data_dir)
+    return not problems
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--processes", type=int, default=4)
+    parser.add_argument("--entries", type=int, default=500, help="games submitted by each process")
+    parser.add_argument("--backends", nargs="+", default=["snapshot", "journal", "sqlite"],
+                        choices=["snapshot", "journal", "sqlite"])
+    args = parser.parse_args()
+
+    print(f"{'backend':<10} {'processes':>9} {'games':>7} {'submits/s':>12} {'result':>8}")
+    passed = [run(backend, args.processes, args.entries) for backend in args.backends]
+    sys.exit(0 if all(passed) else 1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,47 @@
+import os
+from datetime import datetime, timedelta
+
+import pytest
+
+from app.leaderboard_service import LeaderboardDataService
+from app.leaderboard_sqlite import SqliteLeaderboardService
+from app.models import LeaderboardEntry
+
+BASE_TIME = datetime(2026, 1, 1, 12, 0, 0)
+
+
+def make_entry(username: str = "player", word: str = "apple", score: int = 500,
+               completion_time: float = 10.0, timestamp: datetime = BASE_TIME) -> LeaderboardEntry:
+    return LeaderboardEntry(
+        username=username, word=word, score=score, attempts=2, hints_used=0,
+        completion_time=completion_time, timestamp=timestamp, word_length=len(word),
+    )
+
+
+def tied_entries(count: int):
+    """Entries sharing scores, completion times and timestamps in many combinations."""
+    return [
+        make_entry(
+            username=f"user{i % 7}", word=f"word{i}", score=(500, 700, 700, 900)[i % 4],
+            completion_time=(10.0, 20.0)[i % 3 % 2], timestamp=BASE_TIME + timedelta(minutes=i % 2),
+        )
+        for i in range(count)
+    ]
+
+
+def open_leaderboard(backend: str, directory: str, max_entries: int = 1000):
+    if backend == "sqlite":
+        return SqliteLeaderboardService(db_path=os.path.join(directory, "leaderboard.db"), max_entries=max_entries)
+    return LeaderboardDataService(data_dir=directory, max_entries=max_entries, durability=backend)
+
+
+@pytest.fixture(params=["snapshot", "journal", "sqlite"])
+def backend(request):
+    return request.param
+
+
+@pytest.fixture
+def leaderboard(backend, tmp_path):
+    service = open_leaderboard(backend, str(tmp_path))
+    yield service
+    service.close()
@@ -0,0 +1,40 @@
+import asyncio
+import json
+
+from fastapi import Request
+
+from app import routes
+from app.metrics import Registry, register_service_gauges
+from app.response_cache import ResponseCache
+from app.services import WordService
+from app.stats_service import AppStatsSnapshot
+
+from tests.conftest import make_entry
+
+
+def test_snapshot_is_reused_until_a_write(leaderboard):
+    stats = AppStatsSnapshot(leaderboard, WordService(), max_age=3600)
+    leaderboard.add_listener(stats.invalidate)
+    assert stats.get()["total_games_played"] == 0
+    assert stats.get() is stats.get()
+
+    leaderboard.add_entry(make_entry(username="alice"))
+    leaderboard.add_entry(make_entry(username="bob"))
+    assert stats.get()["total_games_played"] == 2 and stats.get()["active_learners"] == 2
+    assert stats.counters() == {"recomputes": 2, "hits": 3}
+
+
+def test_counters_are_served_as_metrics_not_in_the_payload(leaderboard, monkeypatch):
+    stats = AppStatsSnapshot(leaderboard, WordService(), max_age=3600)
+    monkeypatch.setattr(routes, "app_stats", stats, raising=False)
+    monkeypatch.setattr(routes, "leaderboard_service", leaderboard, raising=False)
+    monkeypatch.setattr(routes, "response_cache", ResponseCache(), raising=False)
+
+    request = Request({"type": "http", "method": "GET", "path": "/app/stats", "headers": []})
+    payload = json.loads(asyncio.run(routes.get_app_stats(request)).body)
+    assert set(payload) == {"active_learners", "words_available", "total_games_played",
+                            "community_love", "open_source"}
+
+    registry = Registry()
+    register_service_gauges(app_stats=stats, registry=registry)
+    assert "orthoplay_app_stats_recomputes 1" in registry.render().splitlines()
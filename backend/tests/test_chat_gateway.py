@@ -0,0 +1,92 @@
+import asyncio
+import threading
+import time
+
+import pytest
+
+from app.chat_gateway import ChatGateway, ChatOverloaded, ChatProvider, ChatTimeout
+
+
+class RecordingProvider(ChatProvider):
+    """Answers after ``delay`` seconds, or once ``release`` is set, recording overlap."""
+
+    def __init__(self, delay: float = 0.0, release: threading.Event = None):
+        self.delay = delay
+        self.release = release
+        self.running = 0
+        self.peak = 0
+        self._lock = threading.Lock()
+
+    def generate(self, message: str) -> str:
+        with self._lock:
+            self.running += 1
+            self.peak = max(self.peak, self.running)
+        try:
+            if self.release is not None:
+                self.release.wait(5)
+            time.sleep(self.delay)
+            return message.upper()
+        finally:
+            with self._lock:
+                self.running -= 1
+
+
+def test_providers_must_implement_generate():
+    with pytest.raises(TypeError):
+        ChatProvider()
+
+
+def test_calls_beyond_the_concurrency_limit_wait_for_a_slot():
+    provider = RecordingProvider(delay=0.05)
+
+    async def run():
+        gateway = ChatGateway(provider, max_concurrency=2, max_queue=10, timeout=5)
+        replies = await asyncio.gather(*(gateway.chat(f"hi {i}") for i in range(6)))
+        gateway.close()
+        return replies, gateway.stats()
+
+    replies, stats = asyncio.run(run())
+    assert replies == [f"HI {i}" for i in range(6)]
+    assert provider.peak == 2 and stats["completed"] == 6 and stats["waiting"] == 0
+
+
+def test_calls_beyond_the_queue_are_rejected_at_once():
+    release = threading.Event()
+    provider = RecordingProvider(release=release)
+
+    async def run():
+        gateway = ChatGateway(provider, max_concurrency=1, max_queue=1, timeout=5)
+        running = asyncio.create_task(gateway.chat("first"))
+        await asyncio.sleep(0.05)
+        queued = asyncio.create_task(gateway.chat("second"))
+        await asyncio.sleep(0.05)
+        with pytest.raises(ChatOverloaded):
+            await gateway.chat("third")
+        release.set()
+        replies = [await running, await queued]
+        gateway.close()
+        return replies, gateway.stats()
+
+    replies, stats = asyncio.run(run())
+    assert replies == ["FIRST", "SECOND"] and stats["rejected"] == 1 and provider.peak == 1
+
+
+def test_a_timed_out_call_keeps_its_slot_until_the_provider_returns():
+    release = threading.Event()
+    provider = RecordingProvider(release=release)
+
+    async def run():
+        gateway = ChatGateway(provider, max_concurrency=1, max_queue=1, timeout=0.1)
+        with pytest.raises(ChatTimeout):
+            await gateway.chat("slow")
+        # The provider thread is still busy, so the next call cannot get a slot
+        with pytest.raises(ChatTimeout):
+            await gateway.chat("blocked")
+        release.set()
+        await asyncio.sleep(0.05)
+        reply = await gateway.chat("fast")
+        gateway.close()
+        return reply, gateway.stats()
+
+    reply, stats = asyncio.run(run())
+    assert reply == "FAST" and stats["timed_out"] == 2 and provider.peak == 1
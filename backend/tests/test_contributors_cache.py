@@ -0,0 +1,78 @@
+import json
+import os
+import threading
+import time
+
+import pytest
+
+from app.contributors_service import ContributorsCache, ContributorsUnavailable
+
+
+class Upstream:
+    """Fetcher counting calls, optionally holding each until ``release`` is set."""
+
+    def __init__(self, data=None, error: Exception = None, hold: bool = False):
+        self.data = data if data is not None else [{"login": "alice"}]
+        self.error = error
+        self.release = threading.Event()
+        if not hold:
+            self.release.set()
+        self.calls = 0
+
+    def __call__(self):
+        self.calls += 1
+        self.release.wait(5)
+        if self.error is not None:
+            raise self.error
+        return self.data
+
+
+def open_cache(tmp_path, fetcher, **ttls) -> ContributorsCache:
+    return ContributorsCache(fetcher=fetcher, cache_path=str(tmp_path / "contributors.json"),
+                             **{"ttl": 60, "error_ttl": 30, "max_backoff": 300, **ttls})
+
+
+def test_cold_callers_share_one_fetch(tmp_path):
+    upstream = Upstream(hold=True)
+    cache = open_cache(tmp_path, upstream)
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(cache.get())) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    time.sleep(0.05)
+    upstream.release.set()
+    for thread in threads:
+        thread.join()
+
+    assert upstream.calls == 1 and results == [upstream.data] * 8
+    assert cache.get() == upstream.data and cache.stats()["hits"] == 1
+
+
+def test_stale_data_is_served_while_one_refresh_runs(tmp_path):
+    with open(tmp_path / "contributors.json", "w") as f:
+        json.dump({"fetched_at": time.time() - 120, "data": [{"login": "old"}]}, f)
+    upstream = Upstream(data=[{"login": "new"}], hold=True)
+    cache = open_cache(tmp_path, upstream)
+
+    assert [cache.get() for _ in range(5)] == [[{"login": "old"}]] * 5
+    upstream.release.set()
+    for _ in range(100):
+        if not cache.stats()["refreshing"]:
+            break
+        time.sleep(0.01)
+    assert upstream.calls == 1 and cache.get() == [{"login": "new"}]
+
+    with open(tmp_path / "contributors.json") as f:
+        assert json.load(f)["data"] == [{"login": "new"}]
+    assert sorted(os.listdir(tmp_path)) == ["contributors.json"]
+    assert os.stat(tmp_path / "contributors.json").st_mode & 0o777 == 0o644
+
+
+def test_failures_back_off_instead_of_calling_upstream_again(tmp_path):
+    upstream = Upstream(error=RuntimeError("rate limited"))
+    cache = open_cache(tmp_path, upstream)
+    for _ in range(3):
+        with pytest.raises(ContributorsUnavailable, match="rate limited"):
+            cache.get()
+    assert upstream.calls == 1 and cache.stats()["consecutive_failures"] == 1
+    assert not os.path.exists(tmp_path / "contributors.json")
@@ -0,0 +1,23 @@
+from itertools import product
+
+from app.feedback import CORRECT, PRESENT, batch_feedback, feedback_codes, render_feedback
+from benchmarks.bench_feedback import legacy_feedback
+
+
+def test_count_table_matches_the_original_loop_on_every_small_pair():
+    words = ["".join(letters) for letters in product("abc", repeat=4)]
+    for guess, answer in product(words, words):
+        assert render_feedback(feedback_codes(guess, answer)) == legacy_feedback(guess, answer)
+
+
+def test_batch_matches_single_guesses():
+    pairs = [("apple", "apple"), ("pleap", "apple"), ("lemon", "melon"), ("LEMON ", "melon"),
+             ("cat", "apple"), ("apple", "apple"), ("ppppp", "apple"), ("pleap", "apple")]
+    assert batch_feedback(pairs) == [feedback_codes(*pair) for pair in pairs]
+    assert [render_feedback(codes) for codes in batch_feedback(pairs)] == [legacy_feedback(*pair) for pair in pairs]
+
+
+def test_repeated_letters_are_only_marked_as_often_as_they_occur():
+    assert list(feedback_codes("ppppp", "apple")) == [0, CORRECT, CORRECT, 0, 0]
+    assert list(feedback_codes("eelpa", "apple")) == [PRESENT, 0, PRESENT, PRESENT, PRESENT]
+    assert feedback_codes("cat", "apple") == bytes(5)
@@ -0,0 +1,72 @@
+import os
+import random
+from datetime import timedelta
+
+from app import config
+from app.leaderboard_aggregates import LeaderboardAggregates
+
+from tests.conftest import BASE_TIME, make_entry, open_leaderboard
+
+
+def random_games(count: int):
+    rng = random.Random(11)
+    games = []
+    for i in range(count):
+        entry = make_entry(username=f"user{rng.randrange(12)}", word=f"word{i}", score=rng.randrange(0, 200),
+                           completion_time=rng.uniform(1, 90), timestamp=BASE_TIME + timedelta(seconds=i))
+        entry.attempts = rng.randrange(1, 9)
+        games.append(entry)
+    return games
+
+
+def assert_matches_recompute(service, games):
+    expected = LeaderboardAggregates.rebuild(game.model_dump() for game in games)
+    assert service.get_total_games() == expected.total_games
+    assert service.get_unique_users_count() == len(expected.users)
+    assert service.get_completion_stats() == expected.completion_stats()
+    for username in expected.users:
+        assert service.get_user_stats(username) == expected.user_stats(username)
+
+
+def test_incremental_aggregates_match_a_full_recompute(backend, tmp_path, monkeypatch):
+    monkeypatch.setattr(config, "LEADERBOARD_COMPACT_THRESHOLD", 25)
+    # Far fewer retained entries than games: the aggregates cover them all
+    service = open_leaderboard(backend, str(tmp_path), max_entries=20)
+    games = random_games(120)
+    for game in games[:70]:
+        service.add_entry(game)
+    assert_matches_recompute(service, games[:70])
+    service.close()
+
+    service = open_leaderboard(backend, str(tmp_path), max_entries=20)
+    assert_matches_recompute(service, games[:70])
+    for game in games[70:]:
+        service.add_entry(game)
+    assert_matches_recompute(service, games)
+    service.close()
+
+
+def test_snapshot_submissions_do_not_rewrite_the_aggregates(tmp_path, monkeypatch):
+    monkeypatch.setattr(config, "LEADERBOARD_COMPACT_THRESHOLD", 10)
+    service = open_leaderboard("snapshot", str(tmp_path))
+    path = os.path.join(str(tmp_path), "leaderboard_aggregates.json")
+    games = random_games(25)
+    for game in games[:10]:
+        service.add_entry(game)
+    saved = os.stat(path).st_mtime_ns, os.path.getsize(path)
+    for game in games[10:19]:
+        service.add_entry(game)
+    assert (os.stat(path).st_mtime_ns, os.path.getsize(path)) == saved
+
+    # Games since the last save are replayed from the snapshot after a crash
+    reopened = open_leaderboard("snapshot", str(tmp_path))
+    assert_matches_recompute(reopened, games[:19])
+    reopened.close()
+    service.close()
+
+
+def test_aggregates_survive_serialization():
+    aggregates = LeaderboardAggregates.rebuild(game.model_dump() for game in random_games(40))
+    restored = LeaderboardAggregates.from_dict(aggregates.to_dict())
+    assert restored.to_dict() == aggregates.to_dict()
+    assert restored.user_stats("user3") == aggregates.user_stats("user3")
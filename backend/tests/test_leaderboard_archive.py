@@ -0,0 +1,95 @@
+import os
+from datetime import timedelta
+
+from app import config
+from app.leaderboard_archive import USERS_SUFFIX, LeaderboardArchive
+
+from tests.conftest import BASE_TIME, make_entry, open_leaderboard
+
+
+def archived_game(i: int, username: str) -> dict:
+    timestamp = (BASE_TIME + timedelta(minutes=i)).isoformat()
+    return {"username": username, "word": f"word{i}", "score": 500, "timestamp": timestamp}
+
+
+def test_user_history_reads_only_segments_holding_the_page(tmp_path, monkeypatch):
+    archive = LeaderboardArchive(str(tmp_path), segment_records=10, merge_interval=3600)
+    games = [archived_game(i, "rare" if i in (3, 55, 97) else f"user{i % 4}") for i in range(100)]
+    archive.extend(games)
+
+    opened = []
+    real_open = open
+
+    def tracking_open(path, *args, **kwargs):
+        if str(path).endswith(".ndjson"):
+            opened.append(os.path.basename(path))
+        return real_open(path, *args, **kwargs)
+
+    monkeypatch.setattr("builtins.open", tracking_open)
+    history = archive.user_history("rare", limit=1, offset=1)
+    monkeypatch.undo()
+    archive.close()
+
+    assert [game["word"] for game in history] == ["word55"]
+    assert len(opened) == 1 and opened[0].startswith("seg-000006-")
+
+    rare = [game for game in games if game["username"] == "rare"][::-1]
+    archive = LeaderboardArchive(str(tmp_path), segment_records=10, merge_interval=3600)
+    assert archive.user_history("rare", limit=10) == rare
+    assert archive.user_history("user1", limit=5, offset=12) == \
+        [game for game in games if game["username"] == "user1"][::-1][12:17]
+    archive.close()
+
+
+def test_user_counts_survive_merges_and_are_rebuilt_when_missing(tmp_path):
+    archive = LeaderboardArchive(str(tmp_path), segment_records=10, merge_records=40, merge_interval=3600)
+    games = [archived_game(i, f"user{i % 3}") for i in range(60)]
+    archive.extend(games)
+    while archive.merge():
+        pass
+    archive.close()
+
+    names = os.listdir(tmp_path)
+    segments = [name for name in names if name.endswith(".ndjson")]
+    assert sorted(segments) == sorted(name[:-len(USERS_SUFFIX)] for name in names if name.endswith(USERS_SUFFIX))
+
+    os.remove(os.path.join(tmp_path, segments[0] + USERS_SUFFIX))
+    archive = LeaderboardArchive(str(tmp_path), segment_records=10, merge_interval=3600)
+    assert archive.user_history("user2", limit=100) == [game for game in games if game["username"] == "user2"][::-1]
+    assert os.path.exists(os.path.join(tmp_path, segments[0] + USERS_SUFFIX))
+    archive.close()
+
+
+def test_recent_tier_keeps_only_the_newest_games(tmp_path, monkeypatch):
+    monkeypatch.setattr(config, "LEADERBOARD_RECENT_ENTRIES", 5)
+    now = BASE_TIME.now()
+    service = open_leaderboard("journal", str(tmp_path))
+    for i in range(8):
+        service.add_entry(make_entry(username=f"user{i}", word=f"word{i}", timestamp=now - timedelta(minutes=8 - i)))
+    assert service.get_total_entries("monthly") == 5
+    service.close()
+
+    service = open_leaderboard("journal", str(tmp_path))
+    page = service.get_leaderboard(limit=10, time_filter="daily", sort_by="timestamp")
+    assert [row["word"] for row in page] == [f"word{i}" for i in range(7, 2, -1)]
+    assert service.get_total_entries() == 8
+    service.close()
+
+
+def test_user_history_is_newest_first_when_appends_are_not(leaderboard):
+    offsets = [-5, -1, -3, 0, -4]
+    for i, minutes in enumerate(offsets):
+        leaderboard.add_entry(make_entry(username="late", word=f"word{i}",
+                                         timestamp=BASE_TIME + timedelta(minutes=minutes)))
+    history = leaderboard.get_user_history("late", limit=10)
+    assert [game["word"] for game in history] == ["word3", "word1", "word2", "word4", "word0"]
+    assert [game["word"] for game in leaderboard.get_user_history("late", limit=2, offset=1)] == ["word1", "word2"]
+
+
+def test_user_history_sorts_within_each_segment(tmp_path):
+    archive = LeaderboardArchive(str(tmp_path), segment_records=4, merge_interval=3600)
+    games = [archived_game(i, "late") for i in (3, 0, 2, 1, 7, 5, 6, 4, 9, 8)]
+    archive.extend(games)
+    assert [game["word"] for game in archive.user_history("late", limit=10)] == \
+        [f"word{i}" for i in range(9, -1, -1)]
+    archive.close()
@@ -0,0 +1,58 @@
+import json
+from datetime import timedelta
+
+import pytest
+
+from app.leaderboard_cursor import decode_cursor, encode_cursor
+
+from tests.conftest import BASE_TIME, make_entry, open_leaderboard, tied_entries
+
+
+def follow(service, sort_by: str, sort_order: str, limit: int, after=None) -> list:
+    """Words of every page from ``after`` on, following cursors."""
+    words = []
+    while True:
+        cursor = None if after is None else encode_cursor(sort_by, sort_order, "all", after)
+        key = None if cursor is None else decode_cursor(cursor, sort_by, sort_order, "all")
+        encoded, after = service.get_leaderboard_page(
+            limit=limit, sort_by=sort_by, sort_order=sort_order, after=key
+        )
+        words.extend(json.loads(row)["word"] for row in encoded)
+        if after is None:
+            return words
+
+
+def add_ties(service):
+    # Fully tied rows: same score, completion time, timestamp and username
+    for i in range(20):
+        service.add_entry(make_entry(username="tie_user", word=f"tie{i}"))
+    for entry in tied_entries(40):
+        service.add_entry(entry)
+
+
+@pytest.mark.parametrize("sort_by", ["score", "attempts", "completion_time", "timestamp"])
+@pytest.mark.parametrize("sort_order", ["desc", "asc"])
+def test_cursor_pages_cover_ties_exactly_once(leaderboard, sort_by, sort_order):
+    add_ties(leaderboard)
+    full = [row["word"] for row in leaderboard.get_leaderboard(limit=1000, sort_by=sort_by, sort_order=sort_order)]
+    assert len(full) == 60
+    for limit in (1, 3, 7, 60):
+        assert follow(leaderboard, sort_by, sort_order, limit) == full
+
+
+def test_cursor_works_in_another_worker(backend, tmp_path):
+    first = open_leaderboard(backend, str(tmp_path))
+    add_ties(first)
+    # Entries added live and loaded from disk are numbered differently in memory
+    _, after = first.get_leaderboard_page(limit=13)
+    rest = follow(first, "score", "desc", 13, after)
+
+    second = open_leaderboard(backend, str(tmp_path))
+    assert follow(second, "score", "desc", 13, after) == rest
+    second.add_entry(make_entry(username="late", word="late", score=1, timestamp=BASE_TIME + timedelta(days=1)))
+    first.close()
+    second.close()
+
+    third = open_leaderboard(backend, str(tmp_path))
+    assert follow(third, "score", "desc", 13, after) == rest + ["late"]
+    third.close()
@@ -0,0 +1,62 @@
+import asyncio
+import json
+
+from app.leaderboard_hub import LeaderboardHub, _Subscriber
+
+from tests.conftest import make_entry, tied_entries
+
+
+def subscribe(hub: LeaderboardHub, limit: int) -> _Subscriber:
+    """A mailbox registered as ``serve`` registers one, without a socket."""
+    hub._loop = asyncio.get_running_loop()
+    subscriber = _Subscriber(limit, hub.max_pending)
+    subscriber.resync = False
+    hub._subscribers.add(subscriber)
+    return subscriber
+
+
+def test_score_messages_carry_the_place_in_the_score_page(leaderboard):
+    async def run():
+        hub = LeaderboardHub(leaderboard, max_pending=100)
+        leaderboard.add_listener(hub.publish)
+        subscriber = subscribe(hub, limit=100)
+        for entry in tied_entries(40):
+            leaderboard.add_entry(entry)
+            message = json.loads(subscriber.pending.popleft())
+            page = leaderboard.get_leaderboard(limit=100)
+            assert message["type"] == "score"
+            assert page[message["position"] - 1]["word"] == message["entry"]["word"]
+
+    asyncio.run(run())
+
+
+def test_only_scores_entering_the_top_are_sent(leaderboard):
+    async def run():
+        hub = LeaderboardHub(leaderboard)
+        leaderboard.add_listener(hub.publish)
+        for i in range(5):
+            leaderboard.add_entry(make_entry(word=f"high{i}", score=900))
+        subscriber = subscribe(hub, limit=5)
+        leaderboard.add_entry(make_entry(word="tied", score=900, completion_time=30.0))
+        leaderboard.add_entry(make_entry(word="faster", score=900, completion_time=1.0))
+        assert [json.loads(message)["entry"]["word"] for message in subscriber.pending] == ["faster"]
+
+    asyncio.run(run())
+
+
+def test_a_slow_subscriber_gets_a_snapshot_instead_of_a_backlog(leaderboard):
+    async def run():
+        hub = LeaderboardHub(leaderboard, max_pending=3)
+        leaderboard.add_listener(hub.publish)
+        subscriber = subscribe(hub, limit=10)
+        for i in range(3):
+            leaderboard.add_entry(make_entry(word=f"word{i}", score=500 + i))
+        assert len(subscriber.pending) == 3 and not subscriber.resync
+
+        leaderboard.add_entry(make_entry(word="overflow", score=900))
+        assert not subscriber.pending and subscriber.resync
+        snapshot = json.loads(hub._snapshot(subscriber.limit))
+        assert [entry["word"] for entry in snapshot["entries"]][:2] == ["overflow", "word2"]
+        assert snapshot["total_entries"] == 4
+
+    asyncio.run(run())
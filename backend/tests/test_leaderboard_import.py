@@ -0,0 +1,54 @@
+import random
+from datetime import datetime, timedelta
+
+from app.leaderboard_index import parse_timestamp
+
+from tests.conftest import make_entry, open_leaderboard
+
+
+def stored_row(i: int, timestamp: datetime) -> dict:
+    return {
+        "username": f"user{i % 3}", "word": f"old{i}", "score": 100 + i, "attempts": 2, "hints_used": 0,
+        "completion_time": 10.0, "timestamp": timestamp.isoformat(), "word_length": 5,
+    }
+
+
+def epochs(entries) -> list:
+    return [parse_timestamp(entry["timestamp"]) for entry in entries]
+
+
+def test_out_of_order_import_keeps_history_in_time_order(tmp_path, monkeypatch):
+    monkeypatch.setattr("app.config.ARCHIVE_SEGMENT_RECORDS", 20)
+    monkeypatch.setattr("app.config.ARCHIVE_MERGE_INTERVAL", 3600)
+    now = datetime.now()
+    service = open_leaderboard("journal", str(tmp_path))
+    for i in range(30):
+        service.add_entry(make_entry(username=f"user{i % 3}", word=f"live{i}", timestamp=now - timedelta(hours=30 - i)))
+
+    # Older than every live game, interleaved with them, and shuffled across batches
+    rows = [stored_row(i, now - timedelta(hours=60 - i, minutes=30)) for i in range(90)]
+    random.Random(7).shuffle(rows)
+    assert service.bulk_import(rows, batch_size=25) == 90
+
+    def check():
+        everything = list(service.iter_entries())
+        assert len(everything) == 120
+        assert epochs(everything) == sorted(epochs(everything))
+        history = service.get_user_history("user1", limit=100)
+        assert len(history) == 40
+        assert epochs(history) == sorted(epochs(history), reverse=True)
+        page = service.get_user_history("user1", limit=7, offset=11)
+        assert [row["word"] for row in page] == [row["word"] for row in history[11:18]]
+
+    check()
+    while service._archive.merge():
+        pass
+    check()
+    service.close()
+
+    service = open_leaderboard("journal", str(tmp_path))
+    check()
+    since = parse_timestamp((now - timedelta(hours=40)).isoformat())
+    window = list(service.iter_entries(since=since))
+    assert window and min(epochs(window)) >= since and epochs(window) == sorted(epochs(window))
+    service.close()
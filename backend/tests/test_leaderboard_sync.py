@@ -0,0 +1,101 @@
+import multiprocessing
+import os
+import threading
+import time
+from datetime import timedelta
+
+import pytest
+
+from app import config
+from app.file_lock import FileLock
+
+from tests.conftest import BASE_TIME, make_entry, open_leaderboard
+
+
+def submit_games(backend: str, directory: str, worker: int, games: int):
+    service = open_leaderboard(backend, directory)
+    for i in range(games):
+        service.add_entry(make_entry(username=f"worker{worker}", word=f"w{worker}x{i}",
+                                     timestamp=BASE_TIME + timedelta(seconds=i)))
+    service.close()
+
+
+def test_other_processes_writes_are_picked_up(backend, tmp_path):
+    service = open_leaderboard(backend, str(tmp_path))
+    service.add_entry(make_entry(username="local", word="local"))
+    version = service.version
+
+    context = multiprocessing.get_context("spawn")
+    workers = [context.Process(target=submit_games, args=(backend, str(tmp_path), n, 25)) for n in range(3)]
+    for process in workers:
+        process.start()
+    for process in workers:
+        process.join()
+        assert process.exitcode == 0
+
+    if backend != "sqlite":
+        # Reads skip catching up while the sync thread holds the lock
+        service.refresh(blocking=True)
+    assert service.version > version
+    assert service.get_total_games() == 76
+    words = {row["word"] for row in service.get_leaderboard(limit=100)}
+    assert words == {"local"} | {f"w{n}x{i}" for n in range(3) for i in range(25)}
+    service.close()
+
+
+def test_reads_do_not_wait_for_another_writer(tmp_path, monkeypatch):
+    monkeypatch.setattr(config, "LEADERBOARD_SYNC_INTERVAL", 0.05)
+    service = open_leaderboard("journal", str(tmp_path))
+    other = open_leaderboard("journal", str(tmp_path))
+    other.add_entry(make_entry(username="other", word="other"))
+
+    # Another process in the middle of a long write
+    writer = FileLock(os.path.join(str(tmp_path), "leaderboard.lock"))
+    writer.acquire()
+    try:
+        writer.bump()
+        # Let the sync thread start waiting for the lock
+        time.sleep(0.3)
+        done = threading.Event()
+
+        def read():
+            service.version
+            service.get_total_games()
+            service.get_leaderboard(limit=10)
+            service.get_leaderboard_page(limit=10)
+            service.get_total_entries()
+            done.set()
+
+        threading.Thread(target=read, daemon=True).start()
+        assert done.wait(2)
+        assert service.get_total_games() == 0
+    finally:
+        writer.release()
+        writer.close()
+
+    service.refresh(blocking=True)
+    assert service.get_total_games() == 1
+    other.close()
+    service.close()
+
+
+@pytest.mark.parametrize("backend", ["snapshot", "journal"])
+def test_bulk_import_releases_the_lock_between_batches(backend, tmp_path):
+    service = open_leaderboard(backend, str(tmp_path))
+    probe = FileLock(os.path.join(str(tmp_path), "leaderboard.lock"))
+    free_between_batches = []
+
+    def rows():
+        for i in range(30):
+            if i and i % 10 == 0:
+                free_between_batches.append(probe.acquire(blocking=False))
+                if free_between_batches[-1]:
+                    probe.release()
+            yield {**make_entry(username=f"user{i}", word=f"word{i}").model_dump(),
+                   "timestamp": (BASE_TIME + timedelta(minutes=i)).isoformat()}
+
+    assert service.bulk_import(rows(), batch_size=10) == 30
+    assert free_between_batches == [True, True]
+    assert service.get_total_games() == 30
+    probe.close()
+    service.close()
@@ -0,0 +1,73 @@
+from fastapi import FastAPI, HTTPException
+from fastapi.testclient import TestClient
+
+from app.metrics import Counter, Histogram, MetricsMiddleware, Registry, REGISTRY, time_operation
+
+
+def metrics_app() -> FastAPI:
+    app = FastAPI()
+
+    @app.get("/metrics-test/items/{item_id}")
+    def read_item(item_id: int):
+        if item_id == 0:
+            raise HTTPException(status_code=404)
+        return {"id": item_id}
+
+    @app.get("/metrics")
+    def metrics():
+        return REGISTRY.render()
+
+    app.add_middleware(MetricsMiddleware)
+    return app
+
+
+def sample(text: str, prefix: str) -> float:
+    values = [float(line.rsplit(" ", 1)[1]) for line in text.splitlines() if line.startswith(prefix)]
+    return sum(values)
+
+
+def test_requests_are_labelled_by_route_template():
+    with TestClient(metrics_app()) as client:
+        for item_id in (1, 2, 3, 0):
+            client.get(f"/metrics-test/items/{item_id}")
+        client.get("/metrics-test/nowhere")
+        client.get("/metrics")
+    text = REGISTRY.render()
+
+    route = 'route="/metrics-test/items/{item_id}"'
+    assert sample(text, f'orthoplay_http_requests_total{{method="GET",{route},status="200"}}') == 3
+    assert sample(text, f'orthoplay_http_requests_total{{method="GET",{route},status="404"}}') == 1
+    assert sample(text, f'orthoplay_http_request_duration_seconds_count{{method="GET",{route}}}') == 4
+    assert "/metrics-test/items/1" not in text
+    assert 'route="unmatched",status="404"' in text
+    assert 'route="/metrics"' not in text
+
+
+def test_histograms_render_cumulative_buckets():
+    histogram = Histogram("test_seconds", "Test.", ("operation",), buckets=(0.1, 1.0))
+    for value in (0.05, 0.5, 0.5, 5.0):
+        histogram.observe(value, "load")
+    lines = histogram.render()
+    assert 'test_seconds_bucket{operation="load",le="0.1"} 1' in lines
+    assert 'test_seconds_bucket{operation="load",le="1.0"} 3' in lines
+    assert 'test_seconds_bucket{operation="load",le="+Inf"} 4' in lines
+    assert 'test_seconds_count{operation="load"} 4' in lines
+    assert 'test_seconds_sum{operation="load"} 6.05' in lines
+
+
+def test_label_values_are_escaped_and_gauges_read_at_scrape_time():
+    registry = Registry()
+    counter = registry.register(Counter("test_total", "Test.", ("path",)))
+    counter.inc('a"b\\c\nd')
+    value = [1]
+    registry.gauge("test_gauge", "Test.", lambda: value[0])
+    value[0] = 7
+    text = registry.render()
+    assert 'test_total{path="a\\"b\\\\c\\nd"} 1' in text
+    assert "test_gauge 7" in text.splitlines()
+
+
+def test_operations_are_timed_under_their_name():
+    with time_operation("test_operation"):
+        pass
+    assert sample(REGISTRY.render(), 'orthoplay_operation_duration_seconds_count{operation="test_operation"}') >= 1
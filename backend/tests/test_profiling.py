@@ -0,0 +1,55 @@
+import os
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from app import config
+from app.profiling import PROFILE_FILE_HEADER, ProfileStore, ProfilingMiddleware, profiling_enabled
+
+
+def profiled_client(tmp_path, **options) -> TestClient:
+    app = FastAPI()
+
+    @app.get("/work")
+    def work():
+        return {"total": sum(range(1000))}
+
+    app.add_middleware(ProfilingMiddleware, store=ProfileStore(str(tmp_path), max_bytes=1 << 20), **options)
+    return TestClient(app)
+
+
+def test_profiling_is_off_unless_configured(monkeypatch):
+    monkeypatch.setattr(config, "PROFILE_TOKEN", "")
+    monkeypatch.setattr(config, "PROFILE_SAMPLE_RATE", 0.0)
+    assert not profiling_enabled()
+    monkeypatch.setattr(config, "PROFILE_TOKEN", "secret")
+    assert profiling_enabled()
+
+
+def test_only_requests_with_the_token_are_profiled(tmp_path):
+    header = PROFILE_FILE_HEADER.decode()
+    with profiled_client(tmp_path, token="secret", sample_rate=0) as client:
+        assert header not in client.get("/work").headers
+        assert header not in client.get("/work", headers={"X-Orthoplay-Profile": "wrong"}).headers
+        assert header not in client.get("/work?profile=wrong").headers
+        by_header = client.get("/work", headers={"X-Orthoplay-Profile": "secret"}).headers[header]
+        by_query = client.get("/work?profile=secret").headers[header]
+
+    assert sorted(os.listdir(tmp_path)) == sorted([by_header, by_query])
+    assert all(name.endswith("-get-work.prof") for name in (by_header, by_query))
+
+
+def test_sampled_requests_are_profiled_without_a_token(tmp_path):
+    with profiled_client(tmp_path, token="", sample_rate=1.0) as client:
+        name = client.get("/work").headers[PROFILE_FILE_HEADER.decode()]
+    assert os.listdir(tmp_path) == [name]
+
+
+def test_profiles_are_rotated_oldest_first(tmp_path):
+    for i, size in enumerate((400, 400, 400)):
+        path = tmp_path / f"{i}.prof"
+        path.write_bytes(b"x" * size)
+        os.utime(path, (i, i))
+    (tmp_path / "notes.txt").write_text("kept")
+    ProfileStore(str(tmp_path), max_bytes=900).rotate()
+    assert sorted(os.listdir(tmp_path)) == ["1.prof", "2.prof", "notes.txt"]
@@ -0,0 +1,43 @@
+from app.rank_index import DENSE_SCORE_LIMIT, ScoreRankIndex
+
+from tests.conftest import make_entry, tied_entries
+
+
+def test_huge_scores_keep_the_trees_bounded():
+    index = ScoreRankIndex()
+    for score, key in [(50_000_000, (1,)), (10 ** 18, (2,)), (700, (3,)), (50_000_000, (4,))]:
+        index.add(score, key)
+
+    assert index._counts.size <= DENSE_SCORE_LIMIT
+    assert list(index.ranked()) == [(10 ** 18, (2,)), (50_000_000, (4,)), (50_000_000, (1,)), (700, (3,))]
+    assert [index.at(position) for position in range(1, 5)] == list(index.ranked())
+    assert index.position(700, (3,)) == 4
+    assert index.competition_rank(700) == 4
+    assert index.dense_rank(700) == 3
+    assert index.dense_rank(50_000_000) == 2
+
+    index.remove(10 ** 18, (2,))
+    assert index.at(1) == (50_000_000, (4,))
+    assert index.dense_rank(700) == 2
+
+
+def test_huge_score_through_the_service(leaderboard):
+    leaderboard.add_entry(make_entry(username="alice", score=500))
+    leaderboard.add_entry(make_entry(username="mallory", score=50_000_000))
+
+    assert leaderboard.get_user_rank_details("mallory")["rank"] == 1
+    assert leaderboard.get_user_rank_details("alice")["rank"] == 2
+
+
+def test_ranks_match_the_score_page(leaderboard):
+    for entry in tied_entries(60):
+        leaderboard.add_entry(entry)
+
+    page = [row["word"] for row in leaderboard.get_leaderboard(limit=100)]
+    ranked = leaderboard.get_rank_neighborhood(1, radius=100)
+    assert [row["word"] for row in ranked] == page
+    assert [row["rank"] for row in ranked] == list(range(1, len(page) + 1))
+
+    usernames = [row["username"] for row in leaderboard.get_leaderboard(limit=100)]
+    for username in set(usernames):
+        assert leaderboard.get_user_rank_details(username)["rank"] == usernames.index(username) + 1
@@ -0,0 +1,54 @@
+import time
+
+from fastapi import Request
+
+from app.response_cache import ResponseCache
+
+
+def request(if_none_match: str = None) -> Request:
+    headers = [] if if_none_match is None else [(b"if-none-match", if_none_match.encode())]
+    return Request({"type": "http", "method": "GET", "path": "/", "headers": headers})
+
+
+def test_etag_depends_on_the_body_only():
+    first, second = ResponseCache(), ResponseCache()
+    key = ResponseCache.key("leaderboard", limit=10)
+    etag = first.respond(request(), key, 3, lambda: b'{"entries": []}').headers["etag"]
+    # Another worker, whose version counter is elsewhere
+    response = second.respond(request(etag), key, 41, lambda: b'{"entries": []}')
+    assert response.status_code == 304 and response.headers["etag"] == etag
+    assert second.stats()["not_modified"] == 1
+
+    changed = second.respond(request(etag), key, 42, lambda: b'{"entries": [1]}')
+    assert changed.status_code == 200 and changed.headers["etag"] != etag
+    assert first.respond(request("*"), key, 3, lambda: b"unused").status_code == 304
+
+
+def test_a_new_version_or_age_invalidates_the_body():
+    cache = ResponseCache()
+    builds = []
+
+    def build():
+        builds.append(1)
+        return b"%d" % len(builds)
+
+    key = ResponseCache.key("app_stats")
+    assert cache.respond(request(), key, 1, build).body == b"1"
+    assert cache.respond(request(), key, 1, build).body == b"1"
+    assert cache.respond(request(), key, 2, build).body == b"2"
+
+    cache.respond(request(), ResponseCache.key("windowed"), 2, build, max_age=0.01)
+    time.sleep(0.02)
+    assert cache.respond(request(), ResponseCache.key("windowed"), 2, build, max_age=0.01).body == b"4"
+    assert cache.stats()["hits"] == 1 and cache.stats()["misses"] == 4
+
+
+def test_cached_bytes_stay_within_the_bound():
+    cache = ResponseCache(max_bytes=10)
+    for i in range(5):
+        cache.respond(request(), ResponseCache.key("page", offset=i), 1, lambda: b"abcd")
+    cache.respond(request(), ResponseCache.key("huge"), 1, lambda: b"x" * 11)
+    stats = cache.stats()
+    assert stats["bytes"] <= 10 and stats["entries"] == 2 and stats["evictions"] == 3
+    assert cache.get(ResponseCache.key("page", offset=4), 1) is not None
+    assert cache.get(ResponseCache.key("page", offset=0), 1) is None
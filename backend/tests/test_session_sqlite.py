@@ -0,0 +1,67 @@
+import multiprocessing
+import os
+import time
+
+from app.session_sqlite import TOUCH_INTERVAL, SqliteSessionStore
+from app.session_store import GameSession
+
+
+def open_store(directory: str, **limits) -> SqliteSessionStore:
+    return SqliteSessionStore(db_path=os.path.join(directory, "sessions.db"),
+                              **{"idle_ttl": 60, "completed_ttl": 10, "absolute_ttl": 600,
+                                 "max_sessions": 100, **limits})
+
+
+def play(directory: str, session_id: str):
+    store = open_store(directory)
+    session = store.get(session_id)
+    session["attempts"] += 1
+    session["completed"] = True
+    store.save(session_id, session)
+    store.close()
+
+
+def test_sessions_are_shared_between_processes(tmp_path):
+    store = open_store(str(tmp_path))
+    session_id = store.new_id()
+    store.create(session_id, GameSession("apple", mode="practice"))
+
+    process = multiprocessing.get_context("spawn").Process(target=play, args=(str(tmp_path), session_id))
+    process.start()
+    process.join()
+    assert process.exitcode == 0
+
+    session = store.get(session_id)
+    assert (session.word, session.mode, session.attempts, session.completed) == ("apple", "practice", 1, True)
+    store.close()
+
+
+def test_expiry_and_counters_match_the_memory_store(tmp_path):
+    store = open_store(str(tmp_path))
+    now = time.time()
+    store.create("idle", GameSession("apple", last_access=now - 61))
+    store.create("done", GameSession("apple", completed=True, last_access=now - 11))
+    store.create("old", GameSession("apple", start_time=now - 601, last_access=now))
+    store.create("live", GameSession("apple", last_access=now - TOUCH_INTERVAL - 1))
+
+    assert store.get("idle") is None and store.get("done") is None and store.get("old") is None
+    # A read of a session untouched for a while refreshes its last access
+    assert store.get("live").last_access > now - 1
+    other = open_store(str(tmp_path))
+    stats = other.stats()
+    assert (stats["created"], stats["evicted_idle"], stats["evicted_expired"], stats["live"]) == (4, 2, 1, 1)
+    other.close()
+    store.close()
+
+
+def test_sweep_trims_to_capacity_least_recently_used_first(tmp_path):
+    store = open_store(str(tmp_path), max_sessions=3)
+    now = time.time()
+    store.create("stale", GameSession("apple", last_access=now - 120))
+    for i in range(5):
+        store.create(f"s{i}", GameSession("apple", last_access=now - 10 + i))
+
+    assert store.sweep() == 3
+    assert len(store) == 3 and all(store.get(f"s{i}") is not None for i in (2, 3, 4))
+    assert store.stats()["evicted_capacity"] == 2 and store.stats()["evicted_idle"] == 1
+    store.close()
@@ -0,0 +1,57 @@
+import time
+
+import pytest
+
+from app.session_store import GameSession, MemorySessionStore
+
+
+def open_store(**limits) -> MemorySessionStore:
+    return MemorySessionStore(**{"idle_ttl": 60, "completed_ttl": 10, "absolute_ttl": 600,
+                                 "max_sessions": 100, **limits})
+
+
+def test_sessions_expire_by_idle_completed_and_absolute_age():
+    store = open_store()
+    now = time.time()
+    store.create("idle", GameSession("apple", last_access=now - 61))
+    store.create("done", GameSession("apple", completed=True, last_access=now - 11))
+    store.create("old", GameSession("apple", start_time=now - 601, last_access=now))
+    store.create("live", GameSession("apple", completed=True, last_access=now - 5))
+
+    assert store.get("idle") is None and store.get("done") is None and store.get("old") is None
+    assert store.get("live")["word"] == "apple"
+    stats = store.stats()
+    assert (stats["evicted_idle"], stats["evicted_expired"], stats["live"]) == (2, 1, 1)
+
+
+def test_least_recently_used_session_is_evicted_beyond_capacity():
+    store = open_store(max_sessions=3)
+    for name in "abc":
+        store.create(name, GameSession("apple"))
+    store.get("a")
+    store.create("d", GameSession("apple"))
+
+    assert "b" not in store and all(name in store for name in "acd")
+    assert store.stats()["evicted_capacity"] == 1 and store.stats()["evicted"] == 1
+
+
+def test_sweep_drops_expired_sessions_and_access_keeps_them_alive():
+    store = open_store()
+    now = time.time()
+    for i in range(5):
+        store.create(f"stale{i}", GameSession("apple", last_access=now - 120))
+    store.create("fresh", GameSession("apple", last_access=now - 50))
+    store.get("fresh")
+
+    assert store.sweep() == 5
+    assert len(store) == 1 and store.get("fresh") is not None
+
+
+def test_session_supports_mapping_access():
+    session = GameSession("apple")
+    session["attempts"] += 1
+    session.update({"hints_used": 2, "completed": True})
+    assert session.get("attempts") == 1 and session.get("missing", "x") == "x"
+    assert session.to_dict()["hints_used"] == 2
+    with pytest.raises(KeyError):
+        session["missing"] = 1
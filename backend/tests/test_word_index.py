@@ -0,0 +1,60 @@
+import random
+from collections import Counter
+
+import pytest
+
+from app.models import GameStartRequest
+from app.word_index import DIFFICULTIES, WordIndex, word_difficulty
+
+WORDS = [f"{stem}{suffix}" for stem in ("cat", "jazz", "apple", "quick", "bookkeeper", "rhythm")
+         for suffix in ("", "s", "ed", "ing")]
+
+
+def test_difficulty_buckets_split_the_words_into_thirds():
+    index = WordIndex(WORDS)
+    sizes = {difficulty: len(index.bucket(difficulty)) for difficulty in DIFFICULTIES}
+    assert sum(sizes.values()) == len(WORDS) and all(sizes.values())
+
+    easiest = max(word_difficulty(index.words[p]) for p in index.bucket("easy"))
+    hardest = min(word_difficulty(index.words[p]) for p in index.bucket("hard"))
+    assert easiest < hardest
+
+
+def test_buckets_filter_by_difficulty_and_length():
+    index = WordIndex(WORDS)
+    for (difficulty, length), positions in index.buckets().items():
+        assert all(length is None or len(index.words[p]) == length for p in positions)
+        if difficulty is not None and length is not None:
+            assert set(positions) == set(index.bucket(difficulty)) & set(index.bucket(length=length))
+    assert sorted(index.bucket()) == list(range(len(WORDS)))
+    # An unknown difficulty means any
+    assert index.bucket("impossible") == index.bucket()
+
+
+def test_choice_draws_only_from_the_requested_bucket():
+    random.seed(7)
+    index = WordIndex(WORDS)
+    hard = {index.words[p] for p in index.bucket("hard")}
+    assert all(index.choice("hard") in hard for _ in range(50))
+    assert all(len(index.choice(length=5)) == 5 for _ in range(50))
+    with pytest.raises(LookupError):
+        index.choice(length=40)
+
+
+def test_a_user_sees_every_word_of_a_bucket_before_a_repeat():
+    index = WordIndex(WORDS)
+    first_cycle = [index.choice(username="alice") for _ in WORDS]
+    assert Counter(first_cycle) == Counter(WORDS)
+    second_cycle = [index.choice(username="alice") for _ in WORDS]
+    assert Counter(second_cycle) == Counter(WORDS)
+
+
+def test_cursors_are_bounded():
+    index = WordIndex(WORDS, max_cursors=3)
+    for i in range(10):
+        index.choice(username=f"user{i}")
+    assert len(index._cursors) == 3
+
+
+def test_games_draw_from_every_difficulty_by_default():
+    assert GameStartRequest().difficulty is None
@@ -0,0 +1,73 @@
+import json
+import os
+
+import pytest
+
+from app.services import WordService
+from app.word_index import WordIndex
+from app.word_store import WordStore, build_word_store, open_word_store
+
+WORDS = {
+    "apple": {"description": "A fruit", "sentence": "An apple a day.", "hint1": "red", "hint2": "", "hint3": "tree"},
+    "café": {"description": "Où l'on boit", "sentence": "Le café ☕", "hint1": "é", "hint2": "x", "hint3": "y"},
+    "rhythm": {"description": "Beat", "sentence": "", "hint1": "music", "hint2": "no vowels", "hint3": "drum"},
+    "zebra": {"description": "Striped", "sentence": "A zebra ran.", "hint1": "b/w", "hint2": "horse", "hint3": "",
+              "origin": "Portuguese"},
+}
+
+
+@pytest.fixture
+def words_file(tmp_path):
+    path = tmp_path / "words.json"
+    path.write_text(json.dumps(WORDS, ensure_ascii=False), encoding="utf-8")
+    return str(path)
+
+
+def test_store_round_trips_the_json(words_file, tmp_path):
+    assert build_word_store(words_file, str(tmp_path / "words.bin")) == len(WORDS)
+    store = WordStore(str(tmp_path / "words.bin"))
+    assert len(store) == len(WORDS) and set(store) == set(WORDS)
+    for word, record in WORDS.items():
+        assert word in store
+        assert store[word] == {field: record.get(field, "") for field in store.fields}
+    assert "origin" in store.fields
+    assert "pear" not in store and 42 not in store
+    with pytest.raises(KeyError):
+        store["pear"]
+    store.close()
+
+
+def test_precomputed_buckets_match_the_word_index(words_file, tmp_path):
+    store = open_word_store(words_file, str(tmp_path / "words.bin"))
+    expected = WordIndex(list(store.words)).buckets()
+    assert {key: list(positions) for key, positions in store.buckets.items()} == \
+        {key: list(positions) for key, positions in expected.items()}
+    store.close()
+
+
+def test_a_stale_or_foreign_file_is_rebuilt_or_rejected(words_file, tmp_path):
+    store_file = str(tmp_path / "words.bin")
+    open_word_store(words_file, store_file).close()
+    with open(words_file, "w", encoding="utf-8") as f:
+        json.dump({**WORDS, "pear": {"description": "Another fruit"}}, f)
+    os.utime(store_file, (0, 0))
+    store = open_word_store(words_file, store_file)
+    assert store["pear"]["description"] == "Another fruit"
+    store.close()
+
+    with open(store_file, "r+b") as f:
+        f.write(b"NOPE")
+    with pytest.raises(ValueError):
+        WordStore(store_file)
+
+
+def test_word_service_serves_the_same_words_from_either_source(words_file, tmp_path):
+    from_json = WordService(words_file=words_file, word_store="json")
+    mapped = WordService(words_file=words_file, word_store="mmap")
+    assert isinstance(mapped.words, WordStore)
+    for word in WORDS:
+        record = mapped.get_word_data(word)
+        # Fields other words have are empty in the store
+        assert {field: record[field] for field in WORDS[word]} == from_json.get_word_data(word)
+        assert not any(value for field, value in record.items() if field not in WORDS[word])
+    assert {mapped.get_random_word(length=5) for _ in range(20)} <= {"apple", "zebra"}
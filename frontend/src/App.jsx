@@ -75,7 +75,7 @@ const App = () => {
     setErrorMessage("");
 
     try {
-      const data = await apiService.startGame("medium", mode);
+      const data = await apiService.startGame(null, mode);
 
       setCurrentGame({
         wordId: data.word_id,
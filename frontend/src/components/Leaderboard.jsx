@@ -18,6 +18,23 @@ const Leaderboard = () => {
         fetchLeaderboard();
     }, [timeFilter, sortBy, sortOrder]);
 
+    // Live updates for the default all-time view instead of re-fetching
+    useEffect(() => {
+        if (timeFilter !== 'all' || sortBy !== 'score' || sortOrder !== 'desc') return;
+
+        return apiService.subscribeLeaderboard(50, (message) => {
+            if (message.type === 'snapshot') {
+                setLeaderboardData(message.entries);
+            } else if (message.type === 'score') {
+                setLeaderboardData((entries) => {
+                    const updated = [...entries];
+                    updated.splice(message.position - 1, 0, message.entry);
+                    return updated.slice(0, 50);
+                });
+            }
+        });
+    }, [timeFilter, sortBy, sortOrder]);
+
     const fetchLeaderboard = async () => {
         try {
             setLoading(true);
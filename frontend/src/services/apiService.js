@@ -50,11 +50,13 @@ class ApiService {
         }
     }
 
-    async startGame(difficulty = 'medium') {
+    async startGame(difficulty = null, mode = 'playing') {
         try {
+            // Lets the server avoid repeating words for returning players
+            const username = localStorage.getItem('orthoplay_username') || null;
             const response = await this.makeRequest('/game/start', {
                 method: 'POST',
-                body: JSON.stringify({ difficulty }),
+                body: JSON.stringify({ difficulty, mode, username }),
             });
             return response;
         } catch (error) {
@@ -156,6 +158,15 @@ class ApiService {
         }
     }
 
+    subscribeLeaderboard(limit, onMessage) {
+        // Pushes a snapshot of the top entries, then each score that enters them
+        const wsURL = this.baseURL.replace(/^http/, 'ws');
+        const socket = new WebSocket(`${wsURL}/leaderboard/stream?limit=${limit}`);
+        socket.onmessage = (event) => onMessage(JSON.parse(event.data));
+        socket.onerror = (error) => console.error('Leaderboard stream failed:', error);
+        return () => socket.close();
+    }
+
     async getUserStats(username) {
         try {
             const response = await this.makeRequest(`/leaderboard/user/${encodeURIComponent(username)}`, {